@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 
+from .database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -191,13 +193,35 @@ WSGI_APPLICATION = 'diegojhoao_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DATABASE_URL (PostgreSQL o SQLite) y ajustes de conexión por variables de entorno;
+# sin DATABASE_URL, SQLite en BASE_DIR / 'db.sqlite3'; en producción SQLITE_PROFILE=wal (ver database.py)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(BASE_DIR),
 }
 
+# Cache (respuestas de la API, bootstrap de la tienda)
+# Por defecto en memoria del proceso; con REDIS_URL se comparte entre workers.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',  # Requiere el paquete 'redis'
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'diegojhoao-cache',
+        }
+    }
+
+# Sellos de versión (invalidan el índice de filtros, la Configuracion y las respuestas en cache
+# en todos los workers y comandos): en Redis si hay REDIS_URL; si no, en la base de datos,
+# porque el LocMemCache de arriba no se comparte entre procesos (ver ecommerce_app/cache.py)
+VERSION_STORE = 'cache' if REDIS_URL else 'database'
+
 # Configuración de Django REST Framework (opcional por ahora, pero útil más adelante)
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
@@ -206,7 +230,12 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_FILTER_BACKENDS': [ 
         'django_filters.rest_framework.DjangoFilterBackend'
-    ]
+    ],
+    # Límites por cliente (IP o usuario) de las vistas con `throttle_scope`. El contador vive
+    # en el cache por defecto: sin REDIS_URL cada worker cuenta por separado
+    'DEFAULT_THROTTLE_RATES': {
+        'pedidos': os.environ.get('PEDIDOS_THROTTLE_RATE', '10/min'),  # POST /api/pedidos/ (reservan stock)
+    },
 }
 
 # Configuración de CORS
@@ -216,6 +245,13 @@ CORS_ALLOWED_ORIGINS = [
     "https://diegojhoao.onrender.com",  # ¡AÑADE ESTA LÍNEA CON LA URL EXACTA DE TU FRONTEND!
 
 ]
+
+# Feeds del catálogo (/api/feeds/): enlaces a las fichas de producto del frontend y moneda de los precios
+FRONTEND_URL = os.environ.get('FRONTEND_URL', 'https://diegojhoao.onrender.com')
+FEED_CURRENCY = 'PEN'
+
+# Pedidos: minutos que el stock queda reservado antes de que expire_reservations lo libere
+RESERVA_STOCK_MINUTOS = int(os.environ.get('RESERVA_STOCK_MINUTOS', 15))
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -5,12 +5,24 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.contrib.admin import SimpleListFilter
-from django.db.models import Count, Q
+from django.db.models import Count, Q, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce
 from .models import (
     Categoria, Imagen, Articulo, ArticuloImagen, Filtro, FiltroValor, 
     ArticuloFiltroValor, Configuracion, Carousel, CarouselSlide, 
-    NavigationLink, ContentBlock
+    NavigationLink, ContentBlock, TrabajoImagen, Pedido, PedidoItem
 )
+from .images import formatear_bytes
+from .catalog import CatalogoImporter, exportar, formato_de, leer_filas
+from .pedidos import liberar
+from .renditions import ruta_rendition, rendition_lista
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django import forms
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect, render
+from django.urls import path
+import io
 
 # ==============================================
 # CONFIGURACIÓN GLOBAL DEL ADMIN
@@ -21,6 +33,27 @@ admin.site.site_header = "🛍️ Mi E-commerce Admin"
 admin.site.site_title = "E-commerce Admin"
 admin.site.index_title = "Panel de Administración"
 
+# ==============================================
+# UTILIDADES
+# ==============================================
+
+def subquery_count(model, fk_field):
+    """
+    Conteo correlacionado (SELECT COUNT(*) ... WHERE fk = fila.id) para usar en
+    annotate(). A diferencia de Count() no necesita GROUP BY sobre toda la tabla.
+    """
+    conteo = (
+        model.objects.filter(**{fk_field: OuterRef('pk')})
+        .order_by().values(fk_field).annotate(total=Count('pk')).values('total')
+    )
+    return Coalesce(Subquery(conteo, output_field=IntegerField()), 0)
+
+def miniatura_url(instance, campo):
+    """URL de la miniatura WebP (150px) si el worker ya la generó; si no, la imagen original."""
+    if rendition_lista(instance, campo):
+        return default_storage.url(ruta_rendition(getattr(instance, f'{campo}_sha256'), 'thumb', 'webp'))
+    return getattr(instance, campo).url
+
 # ==============================================
 # FILTROS PERSONALIZADOS
 # ==============================================
@@ -80,7 +113,7 @@ class ArticuloImagenInline(admin.TabularInline):
         if obj.imagen and obj.imagen.imagen:
             return format_html(
                 '<img src="{}" style="width: 60px; height: 60px; object-fit: cover; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);" />',
-                obj.imagen.imagen.url
+                miniatura_url(obj.imagen, 'imagen')
             )
         return "Sin imagen"
     imagen_preview.short_description = '🖼️ Preview'
@@ -101,7 +134,7 @@ class CarouselSlideInline(admin.TabularInline):
         if obj.imagen:
             return format_html(
                 '<img src="{}" style="width: 80px; height: 45px; object-fit: cover; border-radius: 4px;" />',
-                obj.imagen.url
+                miniatura_url(obj, 'imagen')
             )
         return "Sin imagen"
     imagen_preview.short_description = '🖼️ Preview'
@@ -176,13 +209,18 @@ class CategoriaAdmin(admin.ModelAdmin):
         return format_html('<div style="color: #999;">Sin imagen</div>')
     imagen_preview.short_description = '🖼️ Imagen'
     
+    def get_queryset(self, request):
+        # Un solo COUNT agrupado en lugar de una consulta por fila
+        return super().get_queryset(request).annotate(_articulos_count=Count('articulos'))
+
     def articulos_count(self, obj):
-        count = obj.articulos.count()
+        count = obj._articulos_count
         return format_html(
             '<span style="background: #3498db; color: white; padding: 4px 8px; border-radius: 12px; font-size: 12px;">{} artículos</span>',
             count
         )
     articulos_count.short_description = '📦 Artículos'
+    articulos_count.admin_order_field = '_articulos_count'
     
     def fecha_creacion(self, obj):
         return obj.created_at.strftime("%d/%m/%Y")
@@ -190,7 +228,8 @@ class CategoriaAdmin(admin.ModelAdmin):
 
 @admin.register(Imagen)
 class ImagenAdmin(admin.ModelAdmin):
-    list_display = ('imagen_preview', 'nombre_archivo', 'alt_text', 'tamaño_archivo', 'fecha_subida')
+    list_display = ('imagen_preview', 'nombre_archivo', 'alt_text', 'tamaño_archivo', 'estado_procesamiento', 'fecha_subida')
+    list_filter = ('estado_procesamiento',)
     search_fields = ('nombre_archivo', 'alt_text')
     readonly_fields = ('imagen_preview_grande', 'info_archivo')
     list_per_page = 20
@@ -208,7 +247,7 @@ class ImagenAdmin(admin.ModelAdmin):
         if obj.imagen:
             return format_html(
                 '<img src="{}" style="width: 60px; height: 60px; object-fit: cover; border-radius: 8px; cursor: pointer;" onclick="window.open(\'{}\', \'_blank\')" title="Click para ver en tamaño completo" />',
-                obj.imagen.url, obj.imagen.url
+                miniatura_url(obj, 'imagen'), obj.imagen.url
             )
         return "Sin imagen"
     imagen_preview.short_description = '🖼️ Preview'
@@ -223,16 +262,17 @@ class ImagenAdmin(admin.ModelAdmin):
     imagen_preview_grande.short_description = '🖼️ Vista Previa'
     
     def tamaño_archivo(self, obj):
+        # Tamaño guardado al subir la imagen: no consulta el almacenamiento
         if obj.imagen:
-            size = obj.imagen.size
-            if size < 1024:
-                return f"{size} B"
-            elif size < 1024*1024:
-                return f"{size/1024:.1f} KB"
-            else:
-                return f"{size/(1024*1024):.1f} MB"
+            return formatear_bytes(obj.imagen_bytes)
         return "N/A"
     tamaño_archivo.short_description = '📊 Tamaño'
+    tamaño_archivo.admin_order_field = 'imagen_bytes'
+    
+    def dimensiones(self, obj):
+        if obj.imagen_ancho and obj.imagen_alto:
+            return f"{obj.imagen_ancho} × {obj.imagen_alto} px"
+        return "Información no disponible"
     
     def fecha_subida(self, obj):
         return obj.created_at.strftime("%d/%m/%Y %H:%M")
@@ -244,17 +284,24 @@ class ImagenAdmin(admin.ModelAdmin):
                 '<div style="background: #f8f9fa; padding: 10px; border-radius: 8px; border-left: 4px solid #3498db;">'
                 '<strong>📄 Archivo:</strong> {}<br>'
                 '<strong>📊 Tamaño:</strong> {}<br>'
-                '<strong>📐 Dimensiones:</strong> Información no disponible<br>'
+                '<strong>📐 Dimensiones:</strong> {}<br>'
+                '<strong>🔐 SHA-256:</strong> <code>{}</code><br>'
                 '<strong>🔗 URL:</strong> <a href="{}" target="_blank">{}</a>'
                 '</div>',
                 obj.nombre_archivo,
                 self.tamaño_archivo(obj),
+                self.dimensiones(obj),
+                obj.imagen_sha256 or "N/A",
                 obj.imagen.url,
                 obj.imagen.url
             )
         return "Sin información"
     info_archivo.short_description = 'ℹ️ Información del Archivo'
 
+class ImportarCatalogoForm(forms.Form):
+    archivo = forms.FileField(help_text="CSV o JSONL con las columnas de export_catalog. Para archivos muy grandes use: python manage.py import_catalog")
+    crear_valores = forms.BooleanField(required=False, label="Crear filtros y valores que no existan")
+
 @admin.register(Articulo)
 class ArticuloAdmin(admin.ModelAdmin):
     list_display = (
@@ -267,6 +314,7 @@ class ArticuloAdmin(admin.ModelAdmin):
     autocomplete_fields = ['categoria']
     inlines = [ArticuloImagenInline, ArticuloFiltroValorInline]
     readonly_fields = ('imagen_principal_preview', 'estadisticas_articulo')
+    list_select_related = ('categoria',) # categoria_con_color sin una consulta por fila
     list_per_page = 20
     
     fieldsets = (
@@ -299,13 +347,15 @@ class ArticuloAdmin(admin.ModelAdmin):
                 '<img src="{}" style="width: 40px; height: 40px; object-fit: cover; border-radius: 6px;" />'
                 '<strong>{}</strong>'
                 '</div>',
-                obj.imagen_principal.url,
+                miniatura_url(obj, 'imagen_principal'),
                 obj.nombre
             )
         return format_html('<strong>📦 {}</strong>', obj.nombre)
     nombre_con_imagen.short_description = 'Artículo'
     
     def categoria_con_color(self, obj):
+        if obj.categoria is None:  # categoria es SET_NULL (y opcional en import_catalog)
+            return "Sin categoría"
         return format_html(
             '<span style="background: linear-gradient(135deg, #3498db, #2980b9); color: white; padding: 4px 8px; border-radius: 12px; font-size: 12px; font-weight: bold;">📁 {}</span>',
             obj.categoria.nombre
@@ -369,9 +419,16 @@ class ArticuloAdmin(admin.ModelAdmin):
         return "Sin imagen principal"
     imagen_principal_preview.short_description = '🖼️ Vista Previa'
     
+    def get_queryset(self, request):
+        # Subconsultas correlacionadas: solo se evalúan para las filas mostradas
+        return super().get_queryset(request).annotate(
+            _total_imagenes=subquery_count(ArticuloImagen, 'articulo'),
+            _total_filtros=subquery_count(ArticuloFiltroValor, 'articulo'),
+        )
+
     def estadisticas_articulo(self, obj):
-        total_imagenes = obj.imagenes_galeria.count()
-        total_filtros = obj.filtros_aplicados.count()
+        total_imagenes = obj._total_imagenes
+        total_filtros = obj._total_filtros
         
         return format_html(
             '<div style="background: #f8f9fa; padding: 15px; border-radius: 8px; border-left: 4px solid #3498db;">'
@@ -388,6 +445,57 @@ class ArticuloAdmin(admin.ModelAdmin):
         )
     estadisticas_articulo.short_description = 'ℹ️ Estadísticas'
 
+    # --- Importación / exportación del catálogo (ver catalog.py) ---
+
+    actions = ['exportar_csv', 'exportar_jsonl']
+    change_list_template = 'admin/ecommerce_app/articulo/change_list.html'
+
+    def _exportar(self, queryset, formato):
+        response = StreamingHttpResponse(
+            exportar(formato, queryset),
+            content_type='text/csv; charset=utf-8' if formato == 'csv' else 'application/x-ndjson',
+        )
+        response['Content-Disposition'] = f'attachment; filename="catalogo.{formato}"'
+        return response
+
+    def exportar_csv(self, request, queryset):
+        return self._exportar(queryset, 'csv')
+    exportar_csv.short_description = "📤 Exportar seleccionados a CSV"
+
+    def exportar_jsonl(self, request, queryset):
+        return self._exportar(queryset, 'jsonl')
+    exportar_jsonl.short_description = "📤 Exportar seleccionados a JSONL"
+
+    def get_urls(self):
+        urls = [
+            path('importar/', self.admin_site.admin_view(self.importar_catalogo), name='ecommerce_app_articulo_importar'),
+        ]
+        return urls + super().get_urls()
+
+    def importar_catalogo(self, request):
+        if not self.has_change_permission(request) or not self.has_add_permission(request):
+            return redirect('admin:ecommerce_app_articulo_changelist')
+        form = ImportarCatalogoForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            archivo = form.cleaned_data['archivo']
+            importer = CatalogoImporter(crear_valores=form.cleaned_data['crear_valores'])
+            texto = io.TextIOWrapper(archivo.file, encoding='utf-8-sig', newline='')
+            totales = importer.importar(leer_filas(texto, formato_de(archivo.name)))
+            self.message_user(
+                request,
+                f"{totales['creados']} artículos creados, {totales['actualizados']} actualizados, "
+                f"{totales['errores']} filas con error.",
+            )
+            for error in importer.errores[:10]:
+                self.message_user(request, error, level='warning')
+            return redirect('admin:ecommerce_app_articulo_changelist')
+        return render(request, 'admin/ecommerce_app/articulo/importar_catalogo.html', {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Importar catálogo',
+            'form': form,
+        })
+
 @admin.register(Filtro)
 class FiltroAdmin(admin.ModelAdmin):
     list_display = ('nombre_con_icono', 'activo', 'estado_visual', 'valores_count', 'fecha_creacion') # Añadido 'activo'
@@ -417,21 +525,28 @@ class FiltroAdmin(admin.ModelAdmin):
         return format_html('<span style="color: #e74c3c; font-weight: bold;">❌ Inactivo</span>')
     estado_visual.short_description = 'Estado'
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _valores_count=Count('valores'),
+            _valores_activos=Count('valores', filter=Q(valores__activo=True)),
+        )
+
     def valores_count(self, obj):
-        count = obj.valores.count()
+        count = obj._valores_count
         return format_html(
             '<span style="background: #3498db; color: white; padding: 4px 8px; border-radius: 12px; font-size: 12px;">{} valores</span>',
             count
         )
     valores_count.short_description = '📊 Valores'
+    valores_count.admin_order_field = '_valores_count'
     
     def fecha_creacion(self, obj):
         return obj.created_at.strftime("%d/%m/%Y")
     fecha_creacion.short_description = '📅 Creado'
     
     def estadisticas_filtro(self, obj):
-        valores_activos = obj.valores.filter(activo=True).count()
-        valores_inactivos = obj.valores.filter(activo=False).count()
+        valores_activos = obj._valores_activos
+        valores_inactivos = obj._valores_count - obj._valores_activos
         
         return format_html(
             '<div style="background: #f8f9fa; padding: 10px; border-radius: 8px;">'
@@ -451,6 +566,10 @@ class FiltroValorAdmin(admin.ModelAdmin):
     list_editable = ('activo',) 
     autocomplete_fields = ['filtro']
     readonly_fields = ('articulos_count',)
+    list_select_related = ('filtro',) # filtro_nombre sin una consulta por fila
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_articulos_count=Count('articulos'))
     
     def valor_con_color(self, obj):
         if obj.color_hex:
@@ -478,12 +597,13 @@ class FiltroValorAdmin(admin.ModelAdmin):
     estado_visual.short_description = 'Estado'
     
     def articulos_count(self, obj):
-        count = obj.articulos_con_filtro.count()
+        count = obj._articulos_count
         return format_html(
             '<span style="background: #9b59b6; color: white; padding: 4px 8px; border-radius: 12px; font-size: 12px;">{} artículos</span>',
             count
         )
     articulos_count.short_description = '📦 Artículos'
+    articulos_count.admin_order_field = '_articulos_count'
 
 @admin.register(Configuracion)
 class ConfiguracionAdmin(admin.ModelAdmin):
@@ -531,7 +651,7 @@ class CarouselSlideInline(admin.TabularInline): # O StackedInline para más espa
         if obj.imagen:
             return format_html(
                 '<img src="{}" style="max-width: 150px; max-height: 75px; object-fit: cover; border-radius: 4px;" />', 
-                obj.imagen.url
+                miniatura_url(obj, 'imagen')
             )
         return "Sin imagen"
     imagen_preview_inline.short_description = '🖼️ Preview'
@@ -543,9 +663,13 @@ class CarouselAdmin(admin.ModelAdmin):
     search_fields = ('nombre',)
     inlines = [CarouselSlideInline] # Permite añadir/editar slides directamente desde el carrusel
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_slides_count=Count('slides'))
+
     def slides_count(self, obj):
-        return obj.slides.count()
+        return obj._slides_count
     slides_count.short_description = 'Nº Slides'
+    slides_count.admin_order_field = '_slides_count'
 
 @admin.register(CarouselSlide) # Opcional: si quieres una vista separada para todos los slides
 class CarouselSlideAdmin(admin.ModelAdmin):
@@ -560,7 +684,7 @@ class CarouselSlideAdmin(admin.ModelAdmin):
         if obj.imagen:
             return format_html(
                 '<img src="{}" style="width: 80px; height: 45px; object-fit: cover; border-radius: 4px;" />', 
-                obj.imagen.url
+                miniatura_url(obj, 'imagen')
             )
         return "Sin imagen"
     imagen_preview_list.short_description = '🖼️ Imagen'
@@ -610,3 +734,60 @@ class ContentBlockAdmin(admin.ModelAdmin):
         return obj.titulo if obj.titulo else "---"
     titulo_corto.short_description = 'Título'
 
+
+@admin.register(TrabajoImagen)
+class TrabajoImagenAdmin(admin.ModelAdmin):
+    list_display = ('modelo', 'objeto_id', 'campo', 'estado', 'intentos', 'disponible_desde', 'updated_at')
+    list_filter = ('estado', 'modelo')
+    search_fields = ('objeto_id', 'ultimo_error')
+    readonly_fields = ('modelo', 'objeto_id', 'campo', 'intentos', 'created_at', 'updated_at', 'ultimo_error')
+    actions = ['reintentar']
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False  # Los trabajos los crean las señales al subir imágenes
+
+    def reintentar(self, request, queryset):
+        actualizados = queryset.exclude(estado='procesando').update(
+            estado='pendiente', intentos=0, disponible_desde=timezone.now()
+        )
+        self.message_user(request, f"{actualizados} trabajos devueltos a la cola.")
+    reintentar.short_description = "🔁 Reintentar trabajos seleccionados"
+
+
+# ==============================================
+# PEDIDOS
+# ==============================================
+
+class PedidoItemInline(admin.TabularInline):
+    model = PedidoItem
+    extra = 0
+    fields = ('articulo', 'nombre', 'sku', 'precio_unitario', 'cantidad')
+    readonly_fields = fields
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Pedido)
+class PedidoAdmin(admin.ModelAdmin):
+    list_display = ('codigo', 'estado', 'nombre_cliente', 'email', 'total', 'reservado_hasta', 'created_at')
+    list_filter = ('estado', 'created_at')
+    search_fields = ('codigo', 'nombre_cliente', 'email', 'telefono')
+    # Estado y stock solo cambian con las acciones (UPDATE condicionales de pedidos.py)
+    readonly_fields = ('codigo', 'usuario', 'estado', 'total', 'reservado_hasta', 'created_at', 'updated_at')
+    inlines = [PedidoItemInline]
+    actions = ['cancelar_reservas']
+    date_hierarchy = 'created_at'
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False  # Los pedidos se crean desde la tienda (POST /api/pedidos/)
+
+    # Borrar un pedido 'reservado' devuelve antes su stock (receptor pre_delete en signals.py)
+
+    def cancelar_reservas(self, request, queryset):
+        cancelados = sum(liberar(pedido, 'cancelado') for pedido in queryset.filter(estado='reservado'))
+        self.message_user(request, f"{cancelados} pedidos cancelados; su stock volvió a estar disponible.")
+    cancelar_reservas.short_description = "↩️ Cancelar reservas seleccionadas (devuelve el stock)"
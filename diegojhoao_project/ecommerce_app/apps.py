@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EcommerceAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ecommerce_app'
+
+    def ready(self):
+        # Registra los receivers de señales (índice de búsqueda, etc.)
+        from . import signals  # noqa: F401
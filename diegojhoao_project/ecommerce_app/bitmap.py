@@ -0,0 +1,124 @@
+# ecommerce_app/bitmap.py
+"""
+Índice de bitmaps en memoria para filtrar artículos por valores de filtro.
+
+Por cada FiltroValor se guarda un bitset (un `int` de Python) donde el bit N
+está encendido si el artículo con id N tiene ese valor. Las consultas
+AND / OR / NOT se resuelven con operaciones de bits (&, |, ~) sin tocar la
+tabla ArticuloFiltroValor.
+
+El índice se construye de forma perezosa con una sola consulta, se actualiza
+de forma incremental desde las señales de ArticuloFiltroValor (ver
+signals.py) y usa un sello de versión compartido (cache.py) para que todos
+los workers vean los cambios, incluidos los de los comandos de importación.
+"""
+
+import threading
+
+from .cache import get_version, bump_version
+from .models import ArticuloFiltroValor
+
+# Por encima de este número de ids el filtro se hace en SQL (evita IN gigantes)
+MAX_IDS_IN_QUERY = 2000
+
+
+def bits_to_ids(bits):
+    """Devuelve los ids (posiciones de los bits encendidos) de un bitset."""
+    return [i for i, bit in enumerate(bin(bits)[:1:-1]) if bit == '1']
+
+
+def ids_to_bits(ids):
+    """Construye un bitset a partir de una lista de ids en tiempo lineal."""
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class FiltroBitmapIndex:
+    version_name = 'filtro_bitmap'
+
+    def __init__(self):
+        self._bitmaps = {}
+        self._version = None  # Versión compartida con la que se construyó el índice
+        self._lock = threading.Lock()
+
+    def _ensure_current(self):
+        version = get_version(self.version_name)
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._rebuild(version)
+
+    def _rebuild(self, version):
+        ids_por_valor = {}
+        rows = ArticuloFiltroValor.objects.values_list('filtro_valor_id', 'articulo_id').order_by()
+        for filtro_valor_id, articulo_id in rows.iterator(chunk_size=5000):
+            ids_por_valor.setdefault(filtro_valor_id, []).append(articulo_id)
+        self._bitmaps = {fv: ids_to_bits(ids) for fv, ids in ids_por_valor.items()}
+        self._version = version
+
+    def _apply(self, change):
+        with self._lock:
+            version = bump_version(self.version_name)
+            if self._version is not None and version == self._version + 1:
+                change()
+                self._version = version
+            # Si otro proceso también cambió datos, la próxima consulta reconstruye
+
+    def add(self, filtro_valor_id, articulo_id):
+        def change():
+            self._bitmaps[filtro_valor_id] = self._bitmaps.get(filtro_valor_id, 0) | (1 << articulo_id)
+        self._apply(change)
+
+    def remove(self, filtro_valor_id, articulo_id):
+        def change():
+            if filtro_valor_id in self._bitmaps:
+                self._bitmaps[filtro_valor_id] &= ~(1 << articulo_id)
+        self._apply(change)
+
+    def invalidate(self):
+        """Fuerza una reconstrucción en todos los procesos (ej: tras un bulk_create)."""
+        bump_version(self.version_name)
+        with self._lock:
+            self._version = None
+
+    def evaluate(self, groups):
+        """
+        Evalúa una expresión ya parseada: lista de (negado, [ids de FiltroValor]).
+        Los ids de un grupo se combinan con OR y los grupos con AND; los grupos
+        negados se restan. Devuelve (incluidos, excluidos); `incluidos` es None
+        si la expresión solo tiene grupos negados.
+        """
+        self._ensure_current()
+        include = None
+        exclude = 0
+        for negated, ids in groups:
+            bits = 0
+            for filtro_valor_id in ids:
+                bits |= self._bitmaps.get(filtro_valor_id, 0)
+            if negated:
+                exclude |= bits
+            else:
+                include = bits if include is None else include & bits
+        return include, exclude
+
+    def filter_queryset(self, queryset, groups):
+        """
+        Aplica la expresión a `queryset` con un `id__in` precalculado. Devuelve
+        None si el resultado es demasiado grande y conviene filtrar en SQL.
+        """
+        include, exclude = self.evaluate(groups)
+        if include is not None:
+            bits = include & ~exclude
+            if bits.bit_count() > MAX_IDS_IN_QUERY:
+                return None
+            return queryset.filter(id__in=bits_to_ids(bits))
+        if exclude.bit_count() > MAX_IDS_IN_QUERY:
+            return None
+        return queryset.exclude(id__in=bits_to_ids(exclude))
+
+
+filtro_index = FiltroBitmapIndex()
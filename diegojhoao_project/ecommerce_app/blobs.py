@@ -0,0 +1,245 @@
+# ecommerce_app/blobs.py
+"""
+Referencias y recolección de los blobs de imagen (ver storage.py).
+
+Cada `BlobImagen` cuenta cuántos campos de imagen apuntan a su archivo. Las
+señales de guardado/borrado mantienen el contador dentro de la misma
+transacción; los cambios hechos con `queryset.update()` no pasan por las
+señales, para eso `recontar_referencias()` recalcula todo desde la base de
+datos.
+
+Los blobs sin referencias no se borran al momento (una subida en curso
+podría volver a usarlos): `python manage.py collect_image_blobs` los elimina,
+junto con sus renditions, pasado un periodo de gracia.
+"""
+
+import os
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.files.storage import default_storage
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .cache import bump_version
+from .images import CAMPOS_IMAGEN
+from .listing import actualizar_listings
+from .models import Imagen, Articulo, ArticuloImagen, Categoria, CarouselSlide, ContentBlock, BlobImagen
+from .renditions import RENDITIONS, ruta_rendition
+from .storage import PREFIJO_BLOBS, blob_storage, sha_de_blob
+
+# Modelo -> campos de imagen guardados en el almacén de blobs
+CAMPOS_BLOB = {
+    Imagen: ('imagen',),
+    Articulo: ('imagen_principal',),
+    Categoria: ('imagen_categoria',),
+    CarouselSlide: ('imagen',),
+    ContentBlock: ('imagen_asociada',),
+}
+
+FORMATOS_RENDITION = ('webp', 'avif')
+
+
+# --- Contadores (señales) ---
+
+def nombres_guardados(instance, update_fields=None):
+    """Para pre_save: nombres de archivo actuales en la base de datos (una consulta)."""
+    campos = [c for c in CAMPOS_BLOB.get(type(instance), ()) if update_fields is None or c in update_fields]
+    if instance._state.adding or instance.pk is None or not campos:
+        return {}
+    return type(instance).objects.filter(pk=instance.pk).values(*campos).first() or {}
+
+
+def _sumar(nombres, delta):
+    veces = Counter(n for n in nombres if sha_de_blob(n))
+    if not veces:
+        return
+    if delta > 0:
+        BlobImagen.objects.bulk_create(
+            [BlobImagen(nombre=n, sha256=sha_de_blob(n)) for n in veces], ignore_conflicts=True
+        )
+    # Un UPDATE por cada número distinto de repeticiones (normalmente uno solo)
+    por_repeticiones = {}
+    for nombre, n in veces.items():
+        por_repeticiones.setdefault(n, []).append(nombre)
+    for n, grupo in por_repeticiones.items():
+        blobs = BlobImagen.objects.filter(nombre__in=grupo)
+        if delta < 0:
+            blobs = blobs.filter(referencias__gte=n)
+        blobs.update(referencias=F('referencias') + delta * n, updated_at=timezone.now())
+
+
+def sumar_referencias(nombres):
+    """Para escrituras masivas sin señales (ej: bulk_create en import_images)."""
+    _sumar(nombres, +1)
+
+
+def actualizar_referencias(anteriores, actuales):
+    """Suma una referencia a los blobs nuevos y resta una a los reemplazados."""
+    cambiados = [campo for campo, nombre in actuales.items() if anteriores.get(campo, '') != nombre]
+    _sumar([actuales[campo] for campo in cambiados], +1)
+    _sumar([anteriores[campo] for campo in cambiados if anteriores.get(campo)], -1)
+
+
+def nombres_actuales(instance, campos=None):
+    return {
+        campo: getattr(instance, campo).name or ''
+        for campo in CAMPOS_BLOB.get(type(instance), ())
+        if campos is None or campo in campos
+    }
+
+
+def liberar_referencias(instance):
+    """Para post_delete."""
+    _sumar(list(nombres_actuales(instance).values()), -1)
+
+
+# --- Mantenimiento (collect_image_blobs) ---
+
+def recontar_referencias():
+    """Recalcula todos los contadores con un GROUP BY por campo de imagen."""
+    conteo = {}
+    for model, campos in CAMPOS_BLOB.items():
+        for campo in campos:
+            filas = (
+                model.objects.filter(**{f'{campo}__startswith': f'{PREFIJO_BLOBS}/'})
+                .values_list(campo).annotate(n=Count('pk')).order_by()
+            )
+            for nombre, n in filas:
+                conteo[nombre] = conteo.get(nombre, 0) + n
+    BlobImagen.objects.bulk_create(
+        [BlobImagen(nombre=n, sha256=sha_de_blob(n)) for n in conteo if sha_de_blob(n)], ignore_conflicts=True
+    )
+    cambiados = []
+    for blob in BlobImagen.objects.only('pk', 'nombre', 'referencias').iterator(chunk_size=1000):
+        referencias = conteo.get(blob.nombre, 0)
+        if blob.referencias != referencias:
+            blob.referencias = referencias
+            blob.updated_at = timezone.now()
+            cambiados.append(blob)
+    BlobImagen.objects.bulk_update(cambiados, ['referencias', 'updated_at'], batch_size=500)
+    return len(cambiados)
+
+
+def importar_archivos_antiguos(dry_run=False):
+    """
+    Mueve al almacén de blobs los archivos subidos antes de la deduplicación
+    (ej: banco_imagenes/foto_x8k2.jpg). Las copias idénticas quedan en un solo blob.
+    Las filas se reescriben con update() (sin señales), así que después se
+    refrescan a mano los listados y las caches que guardaban las URLs antiguas.
+    Devuelve (filas actualizadas, archivos antiguos eliminados).
+    """
+    storage = blob_storage()
+    importados = {}  # nombre antiguo -> blob
+    actualizados = {}  # modelo -> pks reescritos
+    filas = 0
+    for model, campos in CAMPOS_BLOB.items():
+        for campo in campos:
+            pendientes = (
+                model.objects.exclude(**{f'{campo}__startswith': f'{PREFIJO_BLOBS}/'})
+                .exclude(**{f'{campo}__isnull': True}).exclude(**{campo: ''})
+                .values_list('pk', campo)
+            )
+            for pk, nombre in pendientes.iterator(chunk_size=500):
+                if nombre not in importados:
+                    if not storage.exists(nombre):
+                        continue
+                    if dry_run:
+                        importados[nombre] = None
+                    else:
+                        with storage.open(nombre, 'rb') as archivo:
+                            importados[nombre] = storage.save(nombre, archivo)
+                if not dry_run:
+                    # update(): sin señales; los contadores se recalculan después
+                    cambios = {campo: importados[nombre]}
+                    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+                        cambios['updated_at'] = timezone.now()  # Cambia el ETag / Last-Modified de la API
+                    model.objects.filter(pk=pk).update(**cambios)
+                    actualizados.setdefault(model, set()).add(pk)
+                filas += 1
+    if not dry_run:
+        _refrescar_urls(actualizados)
+        for nombre in importados:
+            storage.delete(nombre)
+    return filas, len(importados)
+
+
+def _refrescar_urls(actualizados):
+    """Vuelve a generar lo que guardaba las URLs de los archivos antiguos antes de borrarlos."""
+    if not actualizados:
+        return
+    articulos = set(actualizados.get(Articulo, ()))
+    if Imagen in actualizados:
+        articulos.update(
+            ArticuloImagen.objects.filter(imagen__in=actualizados[Imagen]).values_list('articulo_id', flat=True)
+        )
+    actualizar_listings(articulos)
+    if CarouselSlide in actualizados:
+        bump_version('carousel')
+    if ContentBlock in actualizados:
+        bump_version('contentblock')
+    bump_version('bootstrap')  # Categorías, carruseles, bloques y destacados
+
+
+def _sha_en_uso(sha256):
+    """True si algún campo de imagen (blob o antiguo) sigue teniendo este hash (renditions compartidas)."""
+    return any(
+        model.objects.filter(**{f'{campo}_sha256': sha256}).exists()
+        for model, campos in CAMPOS_IMAGEN.items() for campo in campos
+    )
+
+
+def _archivos_blob(storage, directorio=PREFIJO_BLOBS):
+    if not storage.exists(directorio):
+        return
+    subdirectorios, archivos = storage.listdir(directorio)
+    for archivo in archivos:
+        yield f'{directorio}/{archivo}'
+    for subdirectorio in subdirectorios:
+        yield from _archivos_blob(storage, f'{directorio}/{subdirectorio}')
+
+
+def _modificado(storage, nombre):
+    return datetime.fromtimestamp(os.path.getmtime(storage.path(nombre)), tz=dt_timezone.utc)
+
+
+def recolectar_huerfanos(gracia=timedelta(hours=1), dry_run=False):
+    """
+    Borra los blobs sin referencias (y sus renditions) y los archivos del
+    almacén que no tienen fila (subidas de transacciones revertidas,
+    temporales abandonados), siempre que sean más antiguos que `gracia`.
+    Devuelve (archivos eliminados, bytes liberados).
+    """
+    storage = blob_storage()
+    limite = timezone.now() - gracia
+    eliminados = liberados = 0
+
+    huerfanos = BlobImagen.objects.filter(referencias=0, updated_at__lt=limite)
+    for blob in huerfanos.iterator(chunk_size=500):
+        existe = storage.exists(blob.nombre)
+        if existe and _modificado(storage, blob.nombre) >= limite:
+            continue  # Una subida reciente lo está reutilizando
+        tamaño = storage.size(blob.nombre) if existe else 0
+        if not dry_run:
+            # Primero la fila (condicional): si alguien lo referenció mientras tanto, se conserva
+            borrados, _ = BlobImagen.objects.filter(pk=blob.pk, referencias=0).delete()
+            if not borrados:
+                continue
+            if existe:
+                storage.delete(blob.nombre)
+            if not _sha_en_uso(blob.sha256):
+                for nombre in RENDITIONS:
+                    for formato in FORMATOS_RENDITION:
+                        default_storage.delete(ruta_rendition(blob.sha256, nombre, formato))
+        eliminados += existe
+        liberados += tamaño
+
+    conocidos = set(BlobImagen.objects.values_list('nombre', flat=True))
+    for nombre in _archivos_blob(storage):
+        if nombre in conocidos or _modificado(storage, nombre) >= limite:
+            continue
+        liberados += storage.size(nombre)
+        eliminados += 1
+        if not dry_run:
+            storage.delete(nombre)
+    return eliminados, liberados
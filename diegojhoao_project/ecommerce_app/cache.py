@@ -0,0 +1,213 @@
+# ecommerce_app/cache.py
+"""
+Sellos de versión compartidos a través del cache de Django, y mixins de
+cache HTTP para los ViewSets (GET condicional y respuestas en cache).
+
+Cada "espacio" (ej: 'filtro_bitmap') tiene un contador entero compartido
+por todos los procesos. Cuando cambian los datos se incrementa; los procesos
+que guardan datos en memoria comparan su versión local con la compartida
+para saber si deben recargarlos. Los contadores viven en Redis si hay
+REDIS_URL y, si no, en la tabla SelloVersion (settings.VERSION_STORE): el
+cache por defecto en memoria es de cada proceso, y un cambio hecho en un
+worker o en un comando (import_catalog, expire_reservations...) no llegaría
+a los demás.
+
+En la base de datos, la primera versión que se pide en una petición lee
+todos los sellos con una consulta (la tabla tiene una fila por espacio) y el
+resto de la petición usa esa lectura; fuera de peticiones (comandos) cada
+llamada consulta la tabla.
+"""
+
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from .models import SelloVersion
+
+VERSION_KEY = 'ecommerce:version:{}'
+
+# Sellos leídos en la petición en curso de este hilo; None fuera de una petición
+_peticion = threading.local()
+
+
+def _versiones_en_base_de_datos():
+    return settings.VERSION_STORE == 'database'
+
+
+def inicio_peticion(**kwargs):
+    """Receptor de request_started: los sellos se leen de nuevo en cada petición."""
+    _peticion.sellos = {}
+
+
+def fin_peticion(**kwargs):
+    _peticion.sellos = None
+
+
+def get_version(name):
+    """Versión actual del espacio `name` (la inicializa en 1 si no existe)."""
+    if _versiones_en_base_de_datos():
+        sellos = getattr(_peticion, 'sellos', None)
+        if sellos is None:
+            version = SelloVersion.objects.filter(nombre=name).values_list('version', flat=True).first()
+        else:
+            if not sellos:
+                sellos.update(SelloVersion.objects.values_list('nombre', 'version'))
+            version = sellos.get(name)
+        if version is None:
+            version = SelloVersion.objects.get_or_create(nombre=name)[0].version
+            if sellos is not None:
+                sellos[name] = version
+        return version
+    key = VERSION_KEY.format(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(name):
+    """Incrementa la versión del espacio `name` y devuelve la nueva."""
+    if _versiones_en_base_de_datos():
+        # UPDATE atómico: dos incrementos simultáneos nunca se pisan
+        sellos = SelloVersion.objects.filter(nombre=name)
+        if not sellos.update(version=F('version') + 1):
+            SelloVersion.objects.get_or_create(nombre=name)
+            sellos.update(version=F('version') + 1)
+        # Si otro proceso incrementó entre medias se devuelve un valor mayor: quien lo
+        # compara con su versión local (bitmap.py) simplemente reconstruye
+        version = sellos.values_list('version', flat=True).get()
+        if getattr(_peticion, 'sellos', None):
+            _peticion.sellos[name] = version  # El resto de la petición ve el cambio propio
+        return version
+    key = VERSION_KEY.format(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # La clave no existía (cache vacío o expulsada): se parte de 1
+        cache.add(key, 1, timeout=None)
+        return cache.incr(key)
+
+
+class ConditionalGetMixin:
+    """
+    Mixin para ViewSets: añade ETag y Last-Modified a `list` y `retrieve` y
+    responde 304 a `If-None-Match` / `If-Modified-Since` sin serializar nada.
+
+    Los validadores salen de una sola consulta agregada sobre el queryset ya
+    filtrado: Max() de cada campo de `last_modified_fields` más el número de
+    filas (y de filas relacionadas, para detectar borrados).
+
+    Con `list_version_name`, el ETag de `list` sale del sello de versión de ese
+    espacio y de la URL, sin consultar el queryset (el sello se lee junto con
+    los demás, una vez por petición). Se pierde Last-Modified: el sello no
+    guarda fecha, y el 304 llega por If-None-Match.
+    """
+    last_modified_fields = ('updated_at',)
+    list_version_name = None
+
+    def get_validator_queryset(self, detail, kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_validators(self, request, queryset, extra=''):
+        """Devuelve (etag, last_modified) para el queryset y la URL pedida."""
+        aggregates = {}
+        for i, field in enumerate(self.last_modified_fields):
+            aggregates[f'max_{i}'] = Max(field)
+            if '__' in field:
+                # Cuenta los relacionados para que un borrado cambie el ETag
+                aggregates[f'count_{i}'] = Count(field.rsplit('__', 1)[0], distinct=True)
+        joins = any('__' in field for field in self.last_modified_fields)
+        aggregates['total'] = Count('pk', distinct=joins)
+        values = queryset.order_by().aggregate(**aggregates)
+
+        last_modified = max(
+            (value for key, value in values.items() if key.startswith('max_') and value is not None),
+            default=None,
+        )
+        firma = '|'.join([request.build_absolute_uri(), extra] + [str(values[key]) for key in sorted(values)])
+        etag = quote_etag(hashlib.md5(firma.encode(), usedforsecurity=False).hexdigest())
+        return etag, last_modified
+
+    def get_list_validators(self, request, kwargs):
+        if self.list_version_name is None:
+            return self.get_validators(request, self.get_validator_queryset(False, kwargs))
+        firma = f'{request.build_absolute_uri()}|v{get_version(self.list_version_name)}'
+        return quote_etag(hashlib.md5(firma.encode(), usedforsecurity=False).hexdigest()), None
+
+    def conditional_response(self, request, etag, last_modified, build):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build()
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        # Que el navegador revalide siempre (barato: 304 sin cuerpo)
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_list_validators(request, kwargs)
+        return self.conditional_response(
+            request, etag, last_modified, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, self.get_validator_queryset(True, kwargs))
+        return self.conditional_response(
+            request, etag, last_modified, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+
+class VersionedCacheMixin(ConditionalGetMixin):
+    """
+    Mixin para ViewSets de solo lectura: guarda en cache la respuesta de
+    `list` y `retrieve` bajo la versión `cache_version_name`. Las señales
+    incrementan esa versión al guardar o borrar el modelo (ver signals.py),
+    así las claves antiguas dejan de usarse y nunca se sirve contenido viejo.
+    ETag y Last-Modified se guardan junto a los datos: una petición servida
+    desde cache (incluido el 304) solo lee los sellos de versión.
+    """
+    cache_version_name = None
+    cache_timeout = 60 * 60
+
+    def cached_response(self, request, detail, kwargs, build):
+        version = get_version(self.cache_version_name)
+        # La URL absoluta incluye host (URLs de imágenes) y filtros (?nombre=...)
+        key = 'ecommerce:response:{}:v{}:{}'.format(self.cache_version_name, version, request.build_absolute_uri())
+        entry = cache.get(key)
+        if entry is None:
+            etag, last_modified = self.get_validators(
+                request, self.get_validator_queryset(detail, kwargs), extra=f'v{version}'
+            )
+            response = build()
+            if response.status_code != 200:
+                return response  # No se guardan errores (ej: 404)
+            entry = {'data': response.data, 'etag': etag, 'last_modified': last_modified}
+            cache.set(key, entry, self.cache_timeout)
+        return self.conditional_response(
+            request, entry['etag'], entry['last_modified'], lambda: Response(entry['data'])
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, False, kwargs, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, True, kwargs, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
@@ -0,0 +1,316 @@
+# ecommerce_app/catalog.py
+"""
+Importación y exportación masiva del catálogo de artículos (CSV / JSONL).
+
+Cada fila es un artículo identificado por `sku`:
+
+    sku,nombre,descripcion,precio,stock,activo,destacado,categoria,filtros
+    POLO-001,Polo básico,...,49.90,12,1,0,polos,Color:Rojo|Talla:M
+
+- `categoria` es el slug de la categoría.
+- `filtros` son pares "Filtro:Valor" separados por "|" (en JSONL también
+  una lista). Si la columna viene, reemplaza los filtros del artículo.
+- Las columnas (o claves JSONL) ausentes no se modifican: `{"sku": ..., "stock": 4}`
+  actualiza solo el stock. Un sku nuevo necesita al menos nombre y precio.
+
+Todo funciona con generadores y lotes: la memoria no depende del tamaño del
+archivo. Los artículos se insertan o actualizan con
+`bulk_create(update_conflicts=True)` (un INSERT ... ON CONFLICT por lote).
+Como las escrituras masivas no disparan señales, cada lote recalcula sus
+filas de listado (listing.py) y su entrada en el índice de búsqueda, y al
+terminar se invalida el índice de bitmaps y se incrementan las versiones de
+cache afectadas.
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+
+from .bitmap import filtro_index
+from .cache import bump_version
+from .listing import actualizar_listings
+from .models import Articulo, ArticuloFiltroValor, Categoria, Filtro, FiltroValor
+from .search import index_articulos
+from .signals import escritura_masiva
+
+COLUMNAS = ('sku', 'nombre', 'descripcion', 'precio', 'stock', 'activo', 'destacado', 'categoria', 'filtros')
+CAMPOS_ACTUALIZABLES = ('nombre', 'descripcion', 'precio', 'stock', 'activo', 'destacado', 'categoria')
+SEPARADOR_FILTROS = '|'
+VERDADEROS = {'1', 'true', 'si', 'sí', 'yes', 'x'}
+
+
+class ErrorFila(ValueError):
+    def __init__(self, linea, mensaje):
+        super().__init__(f"Línea {linea}: {mensaje}")
+        self.linea = linea
+
+
+# --- Lectura ---
+
+def leer_csv(archivo):
+    """Genera (número de línea, dict) por fila; `archivo` es un archivo de texto."""
+    reader = csv.DictReader(archivo)
+    for fila in reader:
+        yield reader.line_num, fila
+
+
+def leer_jsonl(archivo):
+    for numero, linea in enumerate(archivo, start=1):
+        if linea.strip():
+            try:
+                yield numero, json.loads(linea)
+            except json.JSONDecodeError as exc:
+                yield numero, {'_error': f"JSON inválido ({exc.msg})"}
+
+
+def leer_filas(archivo, formato):
+    return leer_jsonl(archivo) if formato == 'jsonl' else leer_csv(archivo)
+
+
+def formato_de(nombre):
+    return 'jsonl' if nombre.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def _booleano(valor, defecto):
+    if valor is None or valor == '':
+        return defecto
+    if isinstance(valor, bool):
+        return valor
+    return str(valor).strip().lower() in VERDADEROS
+
+
+def _pares_filtros(valor):
+    partes = valor if isinstance(valor, list) else str(valor).split(SEPARADOR_FILTROS)
+    pares = []
+    for parte in partes:
+        parte = parte.strip()
+        if not parte:
+            continue
+        filtro, separador, valor_filtro = parte.partition(':')
+        if not separador or not filtro.strip() or not valor_filtro.strip():
+            raise ValueError(f"filtro '{parte}' no tiene el formato Filtro:Valor")
+        pares.append((filtro.strip(), valor_filtro.strip()))
+    return pares
+
+
+class CatalogoImporter:
+    """
+    Importa filas (dicts) en lotes. Las categorías y valores de filtro se
+    cargan una sola vez en diccionarios (son tablas pequeñas).
+    """
+
+    def __init__(self, batch_size=1000, crear_valores=False, dry_run=False):
+        self.batch_size = batch_size
+        self.crear_valores = crear_valores
+        self.dry_run = dry_run
+        self.categorias = dict(Categoria.objects.values_list('slug', 'pk'))
+        self.valores = {
+            (filtro.lower(), valor.lower()): pk
+            for pk, filtro, valor in FiltroValor.objects.values_list('pk', 'filtro__nombre', 'valor')
+        }
+        self.totales = {'filas': 0, 'creados': 0, 'actualizados': 0, 'errores': 0}
+        self.errores = []
+
+    def normalizar(self, fila, linea):
+        """
+        Convierte una fila en (Articulo sin guardar, ids de FiltroValor o None).
+        Solo se validan los campos que trae la fila: una fila parcial actualiza
+        un sku existente (guardar_lote exige nombre y precio a los nuevos).
+        """
+        if '_error' in fila:
+            raise ErrorFila(linea, fila['_error'])
+        sku = str(fila.get('sku') or '').strip()
+        if not sku:
+            raise ErrorFila(linea, "falta el sku")
+        nombre = str(fila.get('nombre') or '').strip()
+        if 'nombre' in fila and not nombre:
+            raise ErrorFila(linea, "falta el nombre")
+        try:
+            # Sin columna precio queda un 0 que nunca se escribe (no está en los campos de la fila)
+            precio = Decimal(str(fila['precio']).strip()) if 'precio' in fila else Decimal('0')
+            stock = int(fila.get('stock') or 0)
+        except (InvalidOperation, TypeError, ValueError):
+            raise ErrorFila(linea, "precio o stock inválido")
+        if precio < 0 or stock < 0:
+            raise ErrorFila(linea, "precio y stock no pueden ser negativos")
+
+        categoria_id = None
+        slug = str(fila.get('categoria') or '').strip()
+        if slug:
+            categoria_id = self.categorias.get(slug)
+            if categoria_id is None:
+                raise ErrorFila(linea, f"no existe la categoría '{slug}'")
+
+        valores = None
+        if fila.get('filtros') is not None:
+            try:
+                valores = [self.valor_id(filtro, valor) for filtro, valor in _pares_filtros(fila['filtros'])]
+            except ValueError as exc:
+                raise ErrorFila(linea, str(exc))
+
+        articulo = Articulo(
+            sku=sku, nombre=nombre, descripcion=fila.get('descripcion') or '', precio=precio, stock=stock,
+            activo=_booleano(fila.get('activo'), True), destacado=_booleano(fila.get('destacado'), False),
+            categoria_id=categoria_id,
+        )
+        return articulo, valores
+
+    def valor_id(self, filtro, valor):
+        clave = (filtro.lower(), valor.lower())
+        if clave not in self.valores:
+            if not self.crear_valores or self.dry_run:
+                raise ValueError(f"no existe el valor de filtro '{filtro}:{valor}'")
+            filtro_obj, _ = Filtro.objects.get_or_create(nombre=filtro)
+            self.valores[clave] = FiltroValor.objects.get_or_create(filtro=filtro_obj, valor=valor)[0].pk
+        return self.valores[clave]
+
+    def importar(self, filas):
+        """Consume el generador de (línea, fila) y devuelve los totales."""
+        lote = {}
+        for linea, fila in filas:
+            self.totales['filas'] += 1
+            try:
+                articulo, valores = self.normalizar(fila, linea)
+            except ErrorFila as exc:
+                self.registrar_error(exc)
+                continue
+            # Los campos ausentes de la fila no se sobrescriben (en JSONL cada línea puede traer otros)
+            campos = tuple(campo for campo in CAMPOS_ACTUALIZABLES if campo in fila)
+            lote[articulo.sku] = (articulo, valores, campos, linea)  # El mismo sku dos veces en un lote: gana el último
+            if len(lote) >= self.batch_size:
+                self.guardar_lote(lote)
+                lote = {}
+        if lote:
+            self.guardar_lote(lote)
+        if not self.dry_run and (self.totales['creados'] or self.totales['actualizados']):
+            finalizar_escritura_masiva()
+        return self.totales
+
+    def registrar_error(self, exc):
+        self.totales['errores'] += 1
+        if len(self.errores) < 100:
+            self.errores.append(str(exc))
+
+    def descartar_nuevos_incompletos(self, lote, existentes):
+        for sku, (_, _, campos, linea) in list(lote.items()):
+            if sku not in existentes and not {'nombre', 'precio'} <= set(campos):
+                del lote[sku]
+                self.registrar_error(ErrorFila(linea, f"el sku '{sku}' no existe: hacen falta nombre y precio"))
+
+    def guardar_lote(self, lote):
+        if self.dry_run:
+            existentes = set(Articulo.objects.filter(sku__in=lote.keys()).values_list('sku', flat=True))
+            self.descartar_nuevos_incompletos(lote, existentes)
+            return
+        with transaction.atomic():
+            existentes = set(Articulo.objects.filter(sku__in=lote.keys()).values_list('sku', flat=True))
+            self.descartar_nuevos_incompletos(lote, existentes)
+            if not lote:
+                return
+            ahora = timezone.now()
+            # Un INSERT ... ON CONFLICT por forma de fila (normalmente una sola)
+            por_campos = {}
+            for articulo, _, campos, _ in lote.values():
+                articulo.updated_at = ahora
+                por_campos.setdefault(campos, []).append(articulo)
+            for campos, articulos in por_campos.items():
+                Articulo.objects.bulk_create(
+                    articulos, update_conflicts=True, unique_fields=['sku'], update_fields=[*campos, 'updated_at'],
+                )
+            ids = dict(Articulo.objects.filter(sku__in=lote.keys()).values_list('sku', 'pk'))
+
+            con_filtros = {ids[sku]: valores for sku, (_, valores, _, _) in lote.items() if valores is not None}
+            if con_filtros:
+                # Listado y bitmaps se actualizan por lote (arriba y al final), no fila a fila
+                with escritura_masiva():
+                    ArticuloFiltroValor.objects.filter(articulo_id__in=con_filtros).delete()
+                ArticuloFiltroValor.objects.bulk_create(
+                    [
+                        ArticuloFiltroValor(articulo_id=articulo_id, filtro_valor_id=valor_id)
+                        for articulo_id, valores in con_filtros.items() for valor_id in set(valores)
+                    ],
+                    batch_size=1000,
+                )
+            actualizar_listings(ids.values())
+            # Solo los artículos del lote: reconstruir todo el índice por una fila no compensa
+            index_articulos(ids.values())
+        self.totales['actualizados'] += len(existentes)
+        self.totales['creados'] += len(lote) - len(existentes)
+
+
+def finalizar_escritura_masiva():
+    """Índices y caches que las señales habrían actualizado fila a fila."""
+    filtro_index.invalidate()
+    bump_version('bootstrap')
+
+
+# --- Exportación ---
+
+def exportar_filas(queryset=None, chunk_size=2000):
+    """
+    Genera un dict por artículo (mismas columnas que la importación). Lee los
+    artículos con `.iterator()` y los filtros con una consulta por bloque.
+    """
+    queryset = Articulo.objects.all() if queryset is None else queryset
+    filas = queryset.order_by('pk').values(
+        'pk', 'sku', 'nombre', 'descripcion', 'precio', 'stock', 'activo', 'destacado', 'categoria__slug'
+    ).iterator(chunk_size=chunk_size)
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) >= chunk_size:
+            yield from _con_filtros(bloque)
+            bloque = []
+    if bloque:
+        yield from _con_filtros(bloque)
+
+
+def _con_filtros(bloque):
+    filtros = {}
+    asignados = (
+        ArticuloFiltroValor.objects.filter(articulo_id__in=[fila['pk'] for fila in bloque])
+        .order_by('filtro_valor__filtro__nombre', 'filtro_valor__valor')
+        .values_list('articulo_id', 'filtro_valor__filtro__nombre', 'filtro_valor__valor')
+    )
+    for articulo_id, filtro, valor in asignados:
+        filtros.setdefault(articulo_id, []).append(f'{filtro}:{valor}')
+    for fila in bloque:
+        yield {
+            'sku': fila['sku'] or '',
+            'nombre': fila['nombre'],
+            'descripcion': fila['descripcion'],
+            'precio': str(fila['precio']),
+            'stock': fila['stock'],
+            'activo': int(fila['activo']),
+            'destacado': int(fila['destacado']),
+            'categoria': fila['categoria__slug'] or '',
+            'filtros': filtros.get(fila['pk'], []),
+        }
+
+
+def lineas_csv(filas):
+    """Genera el CSV línea a línea (para archivos o StreamingHttpResponse)."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNAS)
+    writer.writeheader()
+    for fila in filas:
+        writer.writerow(dict(fila, filtros=SEPARADOR_FILTROS.join(fila['filtros'])))
+        if buffer.tell() > 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def lineas_jsonl(filas):
+    for fila in filas:
+        yield json.dumps(fila, ensure_ascii=False) + '\n'
+
+
+def exportar(formato, queryset=None):
+    filas = exportar_filas(queryset)
+    return lineas_jsonl(filas) if formato == 'jsonl' else lineas_csv(filas)
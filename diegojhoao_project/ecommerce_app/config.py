@@ -0,0 +1,93 @@
+# ecommerce_app/config.py
+"""
+Lectura de la tabla Configuracion (clave / valor) desde el código:
+
+    from ecommerce_app.config import get_config
+    minimo = get_config('envio_gratis_minimo', cast=Decimal)
+    whatsapp = get_config('whatsapp_numero', default='')
+
+Cada proceso guarda una copia de toda la tabla en un dict (una consulta) y
+la recarga cuando cambia el sello de versión compartido 'configuracion'
+(cache.py), que las señales incrementan al guardar o borrar una
+Configuracion. La versión se comprueba una vez por petición (request_started)
+y, fuera de peticiones (comandos, workers), como mucho cada `intervalo`
+segundos; el resto de lecturas son búsquedas en el dict.
+"""
+
+import threading
+import time
+
+from .cache import get_version, bump_version
+from .models import Configuracion
+
+VERDADEROS = {'1', 'true', 'si', 'sí', 'yes', 'on'}
+
+
+def _a_bool(valor):
+    return valor.strip().lower() in VERDADEROS
+
+
+class ConfiguracionSnapshot:
+    version_name = 'configuracion'
+    intervalo = 5  # Segundos máximos sin revisar la versión fuera de una petición
+
+    def __init__(self):
+        # (valores, convertidos): se reemplazan juntos para que los hilos nunca mezclen versiones.
+        # convertidos guarda (clave, cast) -> valor ya convertido
+        self._snapshot = None
+        self._version = None
+        self._revisado = 0.0
+        self._lock = threading.Lock()
+
+    def _ensure_current(self):
+        """Devuelve (valores, convertidos) vigentes; recarga la tabla si cambió la versión."""
+        ahora = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and ahora - self._revisado < self.intervalo:
+            return snapshot
+        version = get_version(self.version_name)
+        if version != self._version or snapshot is None:
+            with self._lock:
+                if version != self._version or self._snapshot is None:
+                    self._snapshot = (dict(Configuracion.objects.values_list('clave', 'valor')), {})
+                    self._version = version
+                snapshot = self._snapshot
+        self._revisado = ahora
+        return snapshot
+
+    def nueva_peticion(self, **kwargs):
+        """Receptor de request_started: la primera lectura de cada petición revisa la versión."""
+        self._revisado = 0.0
+
+    def invalidate(self):
+        bump_version(self.version_name)
+        self._snapshot = None  # Este proceso recarga aunque el sello compartido se haya perdido (ej: Redis vaciado)
+
+    def get(self, clave, default=None, cast=None):
+        """
+        Valor de `clave` convertido con `cast` (ej: int, Decimal, bool,
+        json.loads). Si la clave no existe o el valor no se puede convertir,
+        devuelve `default`.
+        """
+        valores, convertidos = self._ensure_current()
+        try:
+            return convertidos[(clave, cast)]
+        except KeyError:
+            pass
+        valor = valores.get(clave)
+        if valor is None:
+            return default
+        if cast is not None:
+            try:
+                valor = _a_bool(valor) if cast is bool else cast(valor)
+            except (ArithmeticError, TypeError, ValueError):
+                return default
+        convertidos[(clave, cast)] = valor
+        return valor
+
+    def all(self):
+        return dict(self._ensure_current()[0])
+
+
+config_snapshot = ConfiguracionSnapshot()
+get_config = config_snapshot.get
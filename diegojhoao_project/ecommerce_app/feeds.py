@@ -0,0 +1,116 @@
+# ecommerce_app/feeds.py
+"""
+Feeds del catálogo completo para socios y Google Merchant Center:
+
+    /api/feeds/articulos.jsonl   un artículo activo por línea (JSON)
+    /api/feeds/articulos.csv     columnas de Google Merchant (id, title, link, price...)
+
+Los artículos se leen con `values()` + `.iterator(chunk_size=...)`, sin
+instancias de modelo ni serializadores, y se envían con
+StreamingHttpResponse (ver ArticuloFeedView): la memoria no crece con el
+tamaño del catálogo y el CSV envía su cabecera antes de la primera consulta.
+"""
+
+import csv
+import io
+import json
+
+from django.conf import settings
+
+from .models import Articulo
+from .storage import blob_storage
+
+CHUNK_SIZE = 2000
+CAMPOS = (
+    'id', 'sku', 'nombre', 'descripcion', 'precio', 'stock', 'destacado', 'imagen_principal',
+    'categoria__nombre', 'categoria__slug', 'updated_at',
+)
+COLUMNAS_MERCHANT = ('id', 'title', 'description', 'link', 'image_link', 'availability', 'price', 'product_type', 'condition')
+MAX_DESCRIPCION_MERCHANT = 5000  # Límite de Google Merchant
+
+
+def filas_feed(chunk_size=CHUNK_SIZE):
+    return (
+        Articulo.objects.filter(activo=True).order_by('pk').values(*CAMPOS).iterator(chunk_size=chunk_size)
+    )
+
+
+class _Urls:
+    """Construye URLs absolutas sin llamar a build_absolute_uri en cada fila."""
+
+    def __init__(self, request):
+        self.host = request.build_absolute_uri('/').rstrip('/')
+        self.storage = blob_storage()
+        self.frontend = settings.FRONTEND_URL.rstrip('/')
+
+    def imagen(self, nombre):
+        if not nombre:
+            return ''
+        url = self.storage.url(nombre)
+        return url if '://' in url else self.host + url
+
+    def producto(self, pk):
+        return f'{self.frontend}/producto/{pk}'
+
+
+def agrupar(partes, tamaño=64 * 1024):
+    """
+    Junta las líneas en bloques de ~64 KB (menos escrituras al socket que una
+    por fila). La primera parte se envía sola para que el cliente reciba el
+    primer byte cuanto antes.
+    """
+    partes = iter(partes)
+    primera = next(partes, None)
+    if primera is not None:
+        yield primera
+    bloque, acumulado = [], 0
+    for parte in partes:
+        bloque.append(parte)
+        acumulado += len(parte)
+        if acumulado >= tamaño:
+            yield ''.join(bloque)
+            bloque, acumulado = [], 0
+    if bloque:
+        yield ''.join(bloque)
+
+
+def lineas_jsonl(request, filas):
+    urls = _Urls(request)
+    for fila in filas:
+        yield json.dumps({
+            'id': fila['id'],
+            'sku': fila['sku'],
+            'nombre': fila['nombre'],
+            'descripcion': fila['descripcion'],
+            'precio': str(fila['precio']),
+            'stock': fila['stock'],
+            'disponible': fila['stock'] > 0,
+            'destacado': fila['destacado'],
+            'categoria': {'nombre': fila['categoria__nombre'], 'slug': fila['categoria__slug']} if fila['categoria__slug'] else None,
+            'imagen': urls.imagen(fila['imagen_principal']),
+            'url': urls.producto(fila['id']),
+            'updated_at': fila['updated_at'].isoformat(),
+        }, ensure_ascii=False) + '\n'
+
+
+def lineas_merchant_csv(request, filas):
+    urls = _Urls(request)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNAS_MERCHANT)
+    yield buffer.getvalue()
+    for fila in filas:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow((
+            fila['sku'] or fila['id'],
+            fila['nombre'],
+            (fila['descripcion'] or '')[:MAX_DESCRIPCION_MERCHANT],
+            urls.producto(fila['id']),
+            urls.imagen(fila['imagen_principal']),
+            'in_stock' if fila['stock'] > 0 else 'out_of_stock',
+            f"{fila['precio']:.2f} {settings.FEED_CURRENCY}",
+            fila['categoria__nombre'] or '',
+            'new',
+        ))
+        yield buffer.getvalue()
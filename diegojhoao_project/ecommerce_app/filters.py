@@ -0,0 +1,124 @@
+# ecommerce_app/filters.py
+
+import django_filters
+from django.db.models import Count
+from rest_framework.filters import OrderingFilter
+
+from .bitmap import filtro_index
+from .models import Articulo, ArticuloFiltroValor
+
+
+class ArticuloOrderingFilter(OrderingFilter):
+    """
+    Orden del listado de artículos con `?ordering=` (ej: precio, -precio,
+    nombre, -created_at, stock, -destacado). Los campos permitidos se declaran
+    en `ordering_fields` de la vista; cada uno tiene su índice `(campo, id)` en
+    Articulo.Meta.
+
+    - Con `?search=` y sin orden explícito se ordena por relevancia.
+    - Se añade 'id' como desempate para que el orden sea estable entre páginas.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view) or [])
+        if 'search_rank' in queryset.query.annotations and request.query_params.get(self.ordering_param) is None:
+            ordering = ['-search_rank'] + ordering
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            # Un solo campo: desempate en su mismo sentido para recorrer el índice (campo, id)
+            ordering.append('-id' if len(ordering) == 1 and ordering[0].startswith('-') else 'id')
+        return ordering
+
+
+def parse_ids(value, separator=','):
+    """Convierte '1,2,3' en [1, 2, 3] ignorando valores no numéricos."""
+    ids = []
+    for part in (value or '').split(separator):
+        part = part.strip()
+        if part.isdigit():
+            ids.append(int(part))
+    return ids
+
+
+def parse_filtros(value):
+    """
+    Parsea la expresión de ?filtros= en una lista de (negado, [ids]):
+    las comas separan términos que se combinan con AND, '|' separa
+    alternativas (OR) y '!' niega el término.
+    Ej: '1|4,2,!7' -> (1 OR 4) AND 2 AND NOT 7.
+    """
+    groups = []
+    for term in (value or '').split(','):
+        term = term.strip()
+        negated = term.startswith('!')
+        ids = parse_ids(term.lstrip('!'), separator='|')
+        if ids:
+            groups.append((negated, ids))
+    return groups
+
+
+class ArticuloFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de artículos (y de sus facetas):
+    ?categoria=, ?activo=, ?destacado=, ?precio_min=, ?precio_max= y
+    ?filtros= con ids de FiltroValor: '1,2' (ambos), '1|4' (cualquiera), '!7' (sin el 7).
+    """
+    precio_min = django_filters.NumberFilter(field_name='precio', lookup_expr='gte')
+    precio_max = django_filters.NumberFilter(field_name='precio', lookup_expr='lte')
+    filtros = django_filters.CharFilter(method='filter_filtros')
+
+    class Meta:
+        model = Articulo
+        fields = ['categoria', 'activo', 'destacado']
+
+    def filter_filtros(self, queryset, name, value):
+        groups = parse_filtros(value)
+        if not groups:
+            return queryset
+        # Primero el índice de bitmaps en memoria; si el resultado es muy grande, SQL
+        filtered = filtro_index.filter_queryset(queryset, groups)
+        if filtered is not None:
+            return filtered
+        for negated, ids in groups:
+            con_valor = ArticuloFiltroValor.objects.filter(filtro_valor_id__in=ids).values('articulo_id')
+            if negated:
+                queryset = queryset.exclude(id__in=con_valor)
+            else:
+                queryset = queryset.filter(id__in=con_valor)
+        return queryset
+
+
+def facet_counts(articulos):
+    """
+    Cuenta, para el conjunto de artículos dado, cuántos tienen cada valor de
+    filtro activo. Es una sola consulta agregada (GROUP BY filtro_valor) sobre
+    ArticuloFiltroValor. Devuelve la lista de filtros con sus valores y conteos.
+    """
+    rows = (
+        ArticuloFiltroValor.objects
+        .filter(
+            articulo__in=articulos.order_by().values('id'),
+            filtro_valor__activo=True,
+            filtro_valor__filtro__activo=True,
+        )
+        .values(
+            'filtro_valor_id', 'filtro_valor__valor', 'filtro_valor__color_hex',
+            'filtro_valor__filtro_id', 'filtro_valor__filtro__nombre',
+        )
+        .annotate(count=Count('articulo_id'))
+        .order_by('filtro_valor__filtro__nombre', 'filtro_valor__valor')
+    )
+
+    filtros = {}
+    for row in rows:
+        filtro = filtros.setdefault(row['filtro_valor__filtro_id'], {
+            'id': row['filtro_valor__filtro_id'],
+            'nombre': row['filtro_valor__filtro__nombre'],
+            'valores': [],
+        })
+        filtro['valores'].append({
+            'id': row['filtro_valor_id'],
+            'valor': row['filtro_valor__valor'],
+            'color_hex': row['filtro_valor__color_hex'],
+            'count': row['count'],
+        })
+    return list(filtros.values())
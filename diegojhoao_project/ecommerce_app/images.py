@@ -0,0 +1,73 @@
+# ecommerce_app/images.py
+"""
+Metadatos de imágenes persistidos en la base de datos.
+
+Tras subir una imagen, el worker de imágenes (ver jobs.py) guarda ancho,
+alto, tamaño en bytes y hash SHA-256 del contenido en columnas del propio
+modelo (`<campo>_ancho`, `<campo>_alto`, `<campo>_bytes`, `<campo>_sha256`),
+así los listados del admin y de la API nunca tienen que consultar el
+almacenamiento (stat local o HEAD remoto).
+
+Para filas antiguas: `python manage.py backfill_image_metadata` las encola
+en el mismo worker.
+"""
+
+import hashlib
+
+from PIL import Image as PILImage, UnidentifiedImageError
+
+from .models import Imagen, Articulo, Categoria, CarouselSlide
+
+CHUNK_SIZE = 64 * 1024
+
+# Modelo -> campos de imagen con metadatos persistidos
+CAMPOS_IMAGEN = {
+    Imagen: ('imagen',),
+    Articulo: ('imagen_principal',),
+    Categoria: ('imagen_categoria',),
+    CarouselSlide: ('imagen',),
+}
+
+
+def leer_metadatos(fieldfile):
+    """
+    Lee el archivo una sola vez en bloques: calcula el SHA-256 y el tamaño
+    mientras se recorre, y las dimensiones desde la cabecera con Pillow.
+    Funciona con archivos recién subidos (aún no guardados) y con archivos
+    ya presentes en el almacenamiento.
+    """
+    recien_subido = not fieldfile._committed
+    fieldfile.open('rb')
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in fieldfile.chunks(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+        fieldfile.seek(0)
+        try:
+            with PILImage.open(fieldfile) as img:
+                ancho, alto = img.size
+        except UnidentifiedImageError:
+            ancho = alto = None
+        fieldfile.seek(0)
+    finally:
+        if not recien_subido:
+            fieldfile.close()  # El archivo subido lo necesita todavía FileField.pre_save
+    return {'ancho': ancho, 'alto': alto, 'bytes': size, 'sha256': digest.hexdigest()}
+
+
+def aplicar_metadatos(instance, campo, metadatos):
+    for clave in ('ancho', 'alto', 'bytes'):
+        setattr(instance, f'{campo}_{clave}', metadatos[clave] if metadatos else None)
+    setattr(instance, f'{campo}_sha256', metadatos['sha256'] if metadatos else '')
+
+
+def formatear_bytes(size):
+    if size is None:
+        return "N/A"
+    if size < 1024:
+        return f"{size} B"
+    elif size < 1024*1024:
+        return f"{size/1024:.1f} KB"
+    return f"{size/(1024*1024):.1f} MB"
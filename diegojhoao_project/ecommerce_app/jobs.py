@@ -0,0 +1,202 @@
+# ecommerce_app/jobs.py
+"""
+Procesamiento de imágenes en segundo plano.
+
+Al guardar un modelo con una imagen nueva solo se guarda el archivo original
+y, tras el commit, se encola un `TrabajoImagen`. El worker
+(`python manage.py process_image_jobs`) reparte los trabajos en un pool de
+procesos y, para cada imagen:
+
+1. elimina los metadatos EXIF (GPS, cámara...) aplicando antes la orientación,
+2. calcula hash SHA-256, tamaño y dimensiones (ver images.py),
+3. genera las renditions WebP/AVIF (ver renditions.py),
+4. guarda los metadatos con `save(update_fields=...)`, así las señales
+   invalidan las caches y cambia el ETag de la API.
+
+Un trabajo que falla vuelve a la cola con espera creciente hasta agotar
+`max_intentos`; entonces queda en estado 'error' (y la Imagen también).
+"""
+
+import io
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image as PILImage, ImageOps, UnidentifiedImageError
+
+from .images import CAMPOS_IMAGEN, aplicar_metadatos, leer_metadatos
+from .models import Imagen, TrabajoImagen
+from .renditions import RENDITIONS_POR_CAMPO, generar_renditions
+from .storage import sha_de_blob
+
+ESPERA_BASE = 30  # Segundos antes del primer reintento; se duplica en cada intento
+BLOQUEO_MAXIMO = timedelta(minutes=15)  # Un trabajo 'procesando' más antiguo se considera abandonado
+
+
+# --- Encolado (camino de la petición) ---
+
+def preparar_imagenes(instance):
+    """
+    Para pre_save: limpia los metadatos de las imágenes recién subidas (o
+    eliminadas) y devuelve los campos que el worker debe procesar.
+    No lee el archivo.
+    """
+    nuevas = []
+    for campo in CAMPOS_IMAGEN.get(type(instance), ()):
+        fieldfile = getattr(instance, campo)
+        if fieldfile and not fieldfile._committed:
+            aplicar_metadatos(instance, campo, None)
+            nuevas.append(campo)
+        elif not fieldfile and getattr(instance, f'{campo}_sha256'):
+            aplicar_metadatos(instance, campo, None)
+    if isinstance(instance, Imagen) and nuevas:
+        instance.estado_procesamiento = 'pendiente'
+    return nuevas
+
+
+def encolar(instance, campos):
+    """Crea un trabajo por campo, salvo que ya haya uno pendiente para el mismo objeto."""
+    modelo = instance._meta.label_lower
+    existentes = set(
+        TrabajoImagen.objects.filter(
+            modelo=modelo, objeto_id=instance.pk, campo__in=campos, estado='pendiente'
+        ).values_list('campo', flat=True)
+    )
+    return TrabajoImagen.objects.bulk_create([
+        TrabajoImagen(modelo=modelo, objeto_id=instance.pk, campo=campo)
+        for campo in campos if campo not in existentes
+    ])
+
+
+def encolar_lote(model, pks, campo):
+    """Encola un trabajo por objeto para filas creadas sin señales (bulk_create)."""
+    modelo = model._meta.label_lower
+    return TrabajoImagen.objects.bulk_create(
+        [TrabajoImagen(modelo=modelo, objeto_id=pk, campo=campo) for pk in pks], batch_size=500
+    )
+
+
+# --- Cola (proceso principal del worker) ---
+
+def liberar_trabajos_bloqueados():
+    """Devuelve a la cola los trabajos de un worker que murió a mitad de proceso."""
+    return TrabajoImagen.objects.filter(
+        estado='procesando', updated_at__lt=timezone.now() - BLOQUEO_MAXIMO
+    ).update(estado='pendiente', updated_at=timezone.now())
+
+
+def reclamar_trabajos(limite):
+    """
+    Marca como 'procesando' hasta `limite` trabajos disponibles y devuelve sus
+    IDs. Cada trabajo se reclama con un UPDATE condicional, así dos workers
+    nunca procesan el mismo (funciona igual en SQLite y PostgreSQL).
+    """
+    ahora = timezone.now()
+    candidatos = list(
+        TrabajoImagen.objects.filter(estado='pendiente', disponible_desde__lte=ahora)
+        .order_by('disponible_desde', 'pk').values_list('pk', flat=True)[:limite]
+    )
+    return [
+        pk for pk in candidatos
+        if TrabajoImagen.objects.filter(pk=pk, estado='pendiente').update(
+            estado='procesando', intentos=F('intentos') + 1, updated_at=ahora
+        )
+    ]
+
+
+# --- Procesamiento (procesos hijos del pool) ---
+
+def eliminar_exif(fieldfile):
+    """
+    Reescribe el original sin EXIF, aplicando antes la orientación para que
+    la foto no quede girada. Devuelve el nombre anterior si el archivo cambió
+    (None si no). El anterior no se borra aquí: la fila sigue apuntando a él
+    hasta que procesar_imagen guarda el nombre nuevo.
+    """
+    fieldfile.open('rb')
+    try:
+        with PILImage.open(fieldfile) as img:
+            if not img.getexif():
+                return None
+            formato = img.format
+            opciones = {'icc_profile': img.info['icc_profile']} if img.info.get('icc_profile') else {}
+            if formato == 'JPEG':
+                opciones['quality'] = 95
+            limpia = ImageOps.exif_transpose(img)
+            buffer = io.BytesIO()
+            limpia.save(buffer, format=formato, **opciones)  # Sin el parámetro exif no se escribe
+    except UnidentifiedImageError:
+        return None
+    finally:
+        fieldfile.close()
+    nombre = fieldfile.name
+    fieldfile.name = fieldfile.storage.save(nombre, ContentFile(buffer.getvalue()))
+    del fieldfile.file  # El archivo abierto antes apunta todavía al nombre anterior
+    return nombre
+
+
+def procesar_imagen(instance, campo):
+    """Procesa un campo de imagen de `instance` y guarda el resultado."""
+    model = type(instance)
+    fieldfile = getattr(instance, campo)
+    if not fieldfile:
+        return
+    nombre_original = fieldfile.name
+    anterior = eliminar_exif(fieldfile)
+    metadatos = leer_metadatos(fieldfile)
+    nombres = RENDITIONS_POR_CAMPO.get(model, {}).get(campo)
+    if nombres:
+        generar_renditions(fieldfile, metadatos['sha256'], nombres)
+
+    # Si mientras tanto se subió otro archivo, su propio trabajo guardará los metadatos
+    if not model.objects.filter(pk=instance.pk, **{campo: nombre_original}).exists():
+        return
+    aplicar_metadatos(instance, campo, metadatos)
+    update_fields = [campo] + [f'{campo}_{sufijo}' for sufijo in ('ancho', 'alto', 'bytes', 'sha256')]
+    if isinstance(instance, Imagen):
+        instance.estado_procesamiento = 'listo'
+        update_fields.append('estado_procesamiento')
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        update_fields.append('updated_at')  # auto_now solo se guarda si está en update_fields
+    instance.save(update_fields=update_fields)
+    # Solo ahora la fila apunta a la copia sin EXIF. Si algo falló antes, el reintento
+    # vuelve a partir del original (la copia huérfana es un blob: la borra collect_image_blobs)
+    if anterior and not sha_de_blob(anterior):
+        fieldfile.storage.delete(anterior)  # Los blobs pueden estar compartidos: los borra collect_image_blobs
+
+
+def _marcar_imagen(instance, campo, estado):
+    if isinstance(instance, Imagen) and campo == 'imagen':
+        Imagen.objects.filter(pk=instance.pk).update(estado_procesamiento=estado)
+
+
+def procesar_trabajo(pk):
+    """Ejecuta un trabajo ya reclamado. Devuelve el estado final del trabajo."""
+    trabajo = TrabajoImagen.objects.get(pk=pk)
+    model = apps.get_model(trabajo.modelo)
+    instance = model.objects.filter(pk=trabajo.objeto_id).first()
+    update_fields = ['estado', 'ultimo_error', 'disponible_desde', 'updated_at']
+    if instance is None:
+        trabajo.estado = 'completado'
+        trabajo.ultimo_error = 'El objeto ya no existe.'
+        trabajo.save(update_fields=update_fields)
+        return trabajo.estado
+
+    _marcar_imagen(instance, trabajo.campo, 'procesando')
+    try:
+        procesar_imagen(instance, trabajo.campo)
+    except Exception as exc:
+        trabajo.ultimo_error = f'{type(exc).__name__}: {exc}'
+        if trabajo.intentos >= trabajo.max_intentos:
+            trabajo.estado = 'error'
+            _marcar_imagen(instance, trabajo.campo, 'error')
+        else:
+            trabajo.estado = 'pendiente'
+            trabajo.disponible_desde = timezone.now() + timedelta(seconds=ESPERA_BASE * 2 ** (trabajo.intentos - 1))
+    else:
+        trabajo.estado = 'completado'
+        trabajo.ultimo_error = ''
+    trabajo.save(update_fields=update_fields)
+    return trabajo.estado
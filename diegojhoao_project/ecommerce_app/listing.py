@@ -0,0 +1,77 @@
+# ecommerce_app/listing.py
+"""
+Modelo de lectura del listado de artículos (ArticuloListing).
+
+Cada artículo guarda su representación de ArticuloSerializer ya calculada
+en una columna JSON: nombre y slug de la categoría, renditions de la imagen
+principal (o de la primera imagen de la galería) y los valores de filtro
+aplicados. El listado de la API (/api/articulos/) la lee con un JOIN por la
+clave primaria, sin recorrer Categoria, ArticuloImagen, Imagen ni
+ArticuloFiltroValor en cada petición.
+
+Las URLs se guardan relativas (sin request); ArticuloListadoSerializer les
+añade el host al responder.
+
+Las señales recalculan las filas afectadas cuando cambia el artículo, su
+categoría, su galería o sus filtros (ver signals.py). Las escrituras masivas
+(catalog.py, import_images) llaman a `actualizar_listings` por lote. Para
+regenerar todo: python manage.py rebuild_listings.
+
+Cada llamada incrementa el sello 'listado', del que sale el ETag del listado
+de la API (ver ConditionalGetMixin en cache.py).
+"""
+
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .cache import bump_version
+from .models import Articulo, ArticuloImagen, ArticuloListing
+from .serializers import ORDEN_GALERIA, ArticuloSerializer, filtros_aplicados_queryset
+
+CHUNK_SIZE = 1000
+
+
+def articulos_con_relaciones(ids):
+    """Artículos con todo lo que necesita el serializer: 3 consultas por lote."""
+    return (
+        Articulo.objects.filter(pk__in=ids)
+        .select_related('categoria')
+        .prefetch_related(
+            Prefetch(
+                'articuloimagen_set',
+                queryset=ArticuloImagen.objects.select_related('imagen').order_by(*ORDEN_GALERIA),
+                to_attr='galeria_ordenada',
+            ),
+            Prefetch('articulofiltrovalor_set', queryset=filtros_aplicados_queryset(), to_attr='filtros_listado'),
+        )
+    )
+
+
+def actualizar_listings(ids):
+    """
+    Recalcula las filas de listado de los artículos `ids` (un INSERT ... ON
+    CONFLICT por lote). Los ids de artículos borrados se ignoran: su fila se
+    borra en cascada.
+    """
+    ids = list(ids)
+    total = 0
+    for inicio in range(0, len(ids), CHUNK_SIZE):
+        ahora = timezone.now()
+        articulos = list(articulos_con_relaciones(ids[inicio:inicio + CHUNK_SIZE]))
+        # many=True: los campos del serializer se construyen una vez por lote, no por artículo
+        filas = [
+            ArticuloListing(articulo_id=datos['id'], datos=datos, updated_at=ahora)
+            for datos in ArticuloSerializer(articulos, many=True).data
+        ]
+        ArticuloListing.objects.bulk_create(
+            filas, update_conflicts=True, unique_fields=['articulo'], update_fields=['datos', 'updated_at'],
+        )
+        total += len(filas)
+    if ids:
+        bump_version('listado')  # Una vez por llamada, no por lote ni por artículo
+    return total
+
+
+def reconstruir_listings():
+    """Regenera las filas de todos los artículos."""
+    return actualizar_listings(Articulo.objects.order_by('pk').values_list('pk', flat=True))
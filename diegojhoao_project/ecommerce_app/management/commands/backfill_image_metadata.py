@@ -0,0 +1,52 @@
+# ecommerce_app/management/commands/backfill_image_metadata.py
+
+from django.core.management.base import BaseCommand
+
+from ecommerce_app.images import CAMPOS_IMAGEN
+from ecommerce_app.jobs import encolar_lote
+from ecommerce_app.models import Imagen, TrabajoImagen
+
+
+class Command(BaseCommand):
+    help = (
+        "Encola un trabajo de imagen para cada imagen que aún no tiene metadatos. El worker "
+        "(process_image_jobs) guarda ancho, alto, tamaño y hash, genera las renditions y "
+        "refresca los listados igual que con una imagen recién subida."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help="Trabajos encolados por lote (por defecto 200).")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model, campos in CAMPOS_IMAGEN.items():
+            for campo in campos:
+                # Las que ya tienen un trabajo en cola las termina ese trabajo
+                en_cola = TrabajoImagen.objects.filter(
+                    modelo=model._meta.label_lower, campo=campo, estado__in=('pendiente', 'procesando')
+                ).values('objeto_id')
+                pendientes = (
+                    model.objects.filter(**{f'{campo}_sha256': ''})
+                    .exclude(**{f'{campo}__isnull': True}).exclude(**{campo: ''})
+                    .exclude(pk__in=en_cola)
+                    .values_list('pk', flat=True)
+                )
+                lote, encolados = [], 0
+                for pk in pendientes.iterator(chunk_size=batch_size):
+                    lote.append(pk)
+                    if len(lote) >= batch_size:
+                        encolados += self.encolar(model, lote, campo)
+                        lote = []
+                if lote:
+                    encolados += self.encolar(model, lote, campo)
+                self.stdout.write(f"{model._meta.verbose_name_plural}.{campo}: {encolados} encoladas")
+        self.stdout.write(self.style.SUCCESS(
+            "Trabajos encolados: ejecuta process_image_jobs para calcular los metadatos y las renditions."
+        ))
+
+    def encolar(self, model, pks, campo):
+        if model is Imagen and campo == 'imagen':
+            # Hasta que el worker termine, la API no anuncia renditions que aún no existen
+            Imagen.objects.filter(pk__in=pks).update(estado_procesamiento='pendiente')
+        encolar_lote(model, pks, campo)
+        return len(pks)
@@ -0,0 +1,177 @@
+# ecommerce_app/management/commands/benchmark_db.py
+
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, transaction
+from django.test import Client
+from django.utils import timezone
+
+from diegojhoao_project.database import sqlite_config
+from ecommerce_app.bitmap import filtro_index
+from ecommerce_app.models import Articulo
+
+URLS = (
+    '/api/articulos/?page_size=20',
+    '/api/articulos/?page_size=20&ordering=precio',
+    '/api/articulos/facets/',
+)
+PERFILES_SQLITE = ('wal', 'default')
+
+
+def describir_conexion():
+    config = connection.settings_dict
+    partes = [connection.vendor, f"CONN_MAX_AGE={config.get('CONN_MAX_AGE', 0)}"]
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            partes.append(f"journal_mode={cursor.fetchone()[0]}")
+            cursor.execute('PRAGMA synchronous')
+            partes.append(f"synchronous={cursor.fetchone()[0]}")
+    elif 'pool' in config.get('OPTIONS', {}):
+        partes.append(f"pool={config['OPTIONS']['pool']}")
+    return ', '.join(partes)
+
+
+def copiar_sqlite(origen, destino):
+    """Copia consistente (API de backup de SQLite) en modo de journal por defecto."""
+    with sqlite3.connect(origen) as fuente, sqlite3.connect(destino) as copia:
+        fuente.backup(copia)
+        copia.execute('PRAGMA journal_mode=DELETE')  # Cada perfil parte del mismo estado
+    fuente.close()
+    copia.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide cuántas lecturas por segundo atiende la API con la base de datos configurada "
+        "(ver diegojhoao_project/database.py). Con SQLite compara en una sola ejecución los "
+        "perfiles de --profiles, cada uno sobre una copia temporal de la base (la original no "
+        "se toca). Con --writer, un hilo simula ediciones masivas del admin mientras se mide. "
+        "Con PostgreSQL mide la configuración activa (DB_CONN_MAX_AGE / DB_POOL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=10, help="Duración de cada medición (por defecto 10).")
+        parser.add_argument('--threads', type=int, default=4, help="Hilos que hacen peticiones (por defecto 4).")
+        parser.add_argument('--writer', action='store_true',
+                            help="Añade un hilo que actualiza artículos en lotes de 500 durante la medición.")
+        parser.add_argument('--profiles', default=','.join(PERFILES_SQLITE),
+                            help="Perfiles SQLite a comparar, separados por comas (por defecto 'wal,default').")
+
+    def handle(self, *args, **options):
+        if not Articulo.objects.exists():
+            raise CommandError("No hay artículos: importa un catálogo antes (import_catalog).")
+        if connection.vendor != 'sqlite':
+            self.mostrar([(describir_conexion(), self.medir(options))], options)
+            return
+
+        perfiles = [perfil.strip().lower() for perfil in options['profiles'].split(',') if perfil.strip()]
+        desconocidos = set(perfiles) - set(PERFILES_SQLITE)
+        if not perfiles or desconocidos:
+            raise CommandError(f"Perfiles desconocidos: {sorted(desconocidos)} (usa {', '.join(PERFILES_SQLITE)}).")
+        if connection.is_in_memory_db():
+            raise CommandError("La base SQLite está en memoria: no se puede copiar para comparar perfiles.")
+
+        # Las conexiones de cada hilo se crean a partir de este diccionario: se cambia en su sitio
+        ajustes = connection.settings_dict
+        original = dict(ajustes)
+        resultados = []
+        try:
+            with tempfile.TemporaryDirectory() as directorio:
+                for perfil in perfiles:
+                    copia = os.path.join(directorio, f'{perfil}.sqlite3')
+                    connection.close()
+                    copiar_sqlite(original['NAME'], copia)
+                    config = sqlite_config(copia, perfil)
+                    ajustes.pop('PRAGMAS', None)
+                    ajustes.update(config, CONN_MAX_AGE=config.get('CONN_MAX_AGE', 0))
+                    # Sin caches calientes de la medición anterior (mismos sellos de versión en la copia)
+                    cache.clear()
+                    filtro_index.invalidate()
+                    resultados.append((f"{perfil}: {describir_conexion()}", self.medir(options)))
+                    connection.close()
+        finally:
+            ajustes.clear()
+            ajustes.update(original)
+        self.mostrar(resultados, options)
+
+    def medir(self, options):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h[0] not in '.*'), 'localhost')
+        fin = time.monotonic() + options['seconds']
+        latencias, errores, escrituras = [], [], [0]
+        lock = threading.Lock()
+
+        def lector(semilla):
+            client = Client(HTTP_HOST=host)
+            azar = random.Random(semilla)
+            propias, fallos = [], 0
+            while time.monotonic() < fin:
+                inicio = time.perf_counter()
+                try:
+                    # El test client emite request_started/finished: CONN_MAX_AGE se respeta como en gunicorn
+                    ok = client.get(azar.choice(URLS)).status_code == 200
+                except Exception:
+                    ok = False
+                if ok:
+                    propias.append(time.perf_counter() - inicio)
+                else:
+                    fallos += 1
+            connection.close()  # Conexión de este hilo: la copia temporal se borra al terminar
+            with lock:
+                latencias.extend(propias)
+                errores.append(fallos)
+
+        def escritor():
+            ids = list(Articulo.objects.values_list('pk', flat=True)[:20000])
+            while time.monotonic() < fin:
+                lote = random.sample(ids, min(500, len(ids)))
+                try:
+                    with transaction.atomic():
+                        # updated_at: cambia los ETag igual que una edición del admin
+                        Articulo.objects.filter(pk__in=lote).update(updated_at=timezone.now())
+                    escrituras[0] += 1
+                except Exception:
+                    pass
+                time.sleep(0.01)
+            close_old_connections()
+            connection.close()
+
+        hilos = [threading.Thread(target=lector, args=(i,)) for i in range(options['threads'])]
+        if options['writer']:
+            hilos.append(threading.Thread(target=escritor))
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        latencias.sort()
+        return {'latencias': latencias, 'errores': sum(errores), 'escrituras': escrituras[0]}
+
+    def mostrar(self, resultados, options):
+        base = None
+        for descripcion, medida in resultados:
+            latencias = medida['latencias']
+            self.stdout.write(f"Base de datos: {descripcion}")
+            if not latencias:
+                self.stdout.write(self.style.ERROR(f"  Ninguna petición terminó bien ({medida['errores']} errores)."))
+                continue
+            por_segundo = len(latencias) / options['seconds']
+            base = base or por_segundo
+            self.stdout.write(self.style.SUCCESS(
+                f"  {por_segundo:.1f} peticiones/s con {options['threads']} hilos"
+                + (f" (x{por_segundo / base:.2f} respecto al primero)" if len(resultados) > 1 else "") + " | "
+                f"p50 {statistics.median(latencias) * 1000:.1f} ms, "
+                f"p95 {latencias[int(len(latencias) * 0.95) - 1] * 1000:.1f} ms, "
+                f"p99 {latencias[int(len(latencias) * 0.99) - 1] * 1000:.1f} ms | "
+                f"errores: {medida['errores']}" + (f" | lotes escritos: {medida['escrituras']}" if options['writer'] else "")
+            ))
+        if base is None:
+            raise CommandError("Ninguna petición terminó bien.")
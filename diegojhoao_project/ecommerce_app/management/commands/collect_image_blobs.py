@@ -0,0 +1,38 @@
+# ecommerce_app/management/commands/collect_image_blobs.py
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from ecommerce_app.blobs import importar_archivos_antiguos, recontar_referencias, recolectar_huerfanos
+from ecommerce_app.images import formatear_bytes
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula las referencias de los blobs de imagen y elimina los archivos huérfanos "
+        "(y sus renditions). Con --import-legacy deduplica también los archivos subidos "
+        "antes del almacén de blobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--import-legacy', action='store_true',
+                            help="Mueve al almacén de blobs los archivos de banco_imagenes/, categorias/, etc.")
+        parser.add_argument('--grace-minutes', type=int, default=60,
+                            help="Solo borra archivos sin uso desde hace al menos N minutos (por defecto 60).")
+        parser.add_argument('--dry-run', action='store_true', help="Muestra lo que se haría sin borrar nada.")
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        if options['import_legacy']:
+            filas, archivos = importar_archivos_antiguos(dry_run=dry_run)
+            self.stdout.write(f"Archivos antiguos importados: {archivos} ({filas} filas)")
+        if not dry_run:
+            self.stdout.write(f"Contadores corregidos: {recontar_referencias()}")
+        eliminados, liberados = recolectar_huerfanos(
+            gracia=timedelta(minutes=options['grace_minutes']), dry_run=dry_run
+        )
+        accion = "Se eliminarían" if dry_run else "Eliminados"
+        self.stdout.write(self.style.SUCCESS(
+            f"{accion} {eliminados} archivos huérfanos ({formatear_bytes(liberados)})."
+        ))
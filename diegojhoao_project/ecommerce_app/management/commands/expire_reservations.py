@@ -0,0 +1,27 @@
+# ecommerce_app/management/commands/expire_reservations.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ecommerce_app.pedidos import expirar_reservas
+
+
+class Command(BaseCommand):
+    help = (
+        "Expira los pedidos reservados cuya reserva venció y devuelve su stock. "
+        "Ejecutar periódicamente (cron) o con --loop como proceso aparte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="No termina: revisa las reservas cada --sleep segundos.")
+        parser.add_argument('--sleep', type=float, default=30, help="Segundos entre revisiones con --loop (por defecto 30).")
+
+    def handle(self, *args, **options):
+        while True:
+            liberados = expirar_reservas()
+            if liberados or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f"Reservas expiradas: {liberados}."))
+            if not options['loop']:
+                return
+            time.sleep(options['sleep'])
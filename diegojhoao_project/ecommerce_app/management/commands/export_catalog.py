@@ -0,0 +1,25 @@
+# ecommerce_app/management/commands/export_catalog.py
+
+from django.core.management.base import BaseCommand
+
+from ecommerce_app.catalog import exportar, formato_de
+
+
+class Command(BaseCommand):
+    help = "Exporta el catálogo de artículos a CSV o JSONL (mismo formato que import_catalog)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', default='-', help="Archivo de salida (por defecto, la salida estándar).")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Por defecto, según la extensión (csv).")
+
+    def handle(self, *args, **options):
+        salida = options['output']
+        formato = options['format'] or formato_de(salida)
+        if salida == '-':
+            for parte in exportar(formato):
+                self.stdout.write(parte, ending='')
+            return
+        with open(salida, 'w', encoding='utf-8', newline='') as archivo:
+            for parte in exportar(formato):
+                archivo.write(parte)
+        self.stderr.write(self.style.SUCCESS(f"Catálogo exportado en {salida}."))
@@ -0,0 +1,27 @@
+# ecommerce_app/management/commands/generate_renditions.py
+
+from django.core.management.base import BaseCommand
+
+from ecommerce_app.renditions import RENDITIONS_POR_CAMPO, generar_renditions_instancia, formatos_disponibles
+
+
+class Command(BaseCommand):
+    help = "Genera las renditions WebP/AVIF que falten para las imágenes existentes."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Formatos: {', '.join(formatos_disponibles())}")
+        total = 0
+        for model, campos in RENDITIONS_POR_CAMPO.items():
+            for campo in campos:
+                pendientes = model.objects.exclude(**{f'{campo}_sha256': ''}).only(
+                    'pk', campo, f'{campo}_sha256'
+                )
+                creadas = 0
+                for obj in pendientes.iterator(chunk_size=200):
+                    try:
+                        creadas += len(generar_renditions_instancia(obj, [campo]))
+                    except OSError as exc:
+                        self.stderr.write(f"{model.__name__} {obj.pk}: {exc}")
+                self.stdout.write(f"{model._meta.verbose_name_plural}.{campo}: {creadas} archivos creados")
+                total += creadas
+        self.stdout.write(self.style.SUCCESS(f"Renditions generadas: {total}."))
@@ -0,0 +1,42 @@
+# ecommerce_app/management/commands/import_catalog.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ecommerce_app.catalog import CatalogoImporter, formato_de, leer_filas
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa artículos desde CSV o JSONL (clave: sku). Crea los nuevos y actualiza los "
+        "existentes en lotes; la categoría va por slug y los filtros como 'Color:Rojo|Talla:M'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Ruta del archivo .csv o .jsonl")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Por defecto, según la extensión.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Filas por INSERT ... ON CONFLICT.")
+        parser.add_argument('--create-values', action='store_true',
+                            help="Crea los filtros y valores de filtro que no existan.")
+        parser.add_argument('--dry-run', action='store_true', help="Solo valida el archivo.")
+
+    def handle(self, *args, **options):
+        formato = options['format'] or formato_de(options['archivo'])
+        importer = CatalogoImporter(
+            batch_size=options['batch_size'], crear_valores=options['create_values'], dry_run=options['dry_run'],
+        )
+        inicio = time.monotonic()
+        try:
+            with open(options['archivo'], encoding='utf-8-sig', newline='') as archivo:
+                totales = importer.importar(leer_filas(archivo, formato))
+        except OSError as exc:
+            raise CommandError(str(exc))
+        segundos = max(time.monotonic() - inicio, 1e-6)
+
+        for error in importer.errores:
+            self.stderr.write(error)
+        self.stdout.write(self.style.SUCCESS(
+            f"{totales['filas']} filas en {segundos:.1f}s ({totales['filas'] / segundos:.0f} filas/s): "
+            f"{totales['creados']} creados, {totales['actualizados']} actualizados, {totales['errores']} con error."
+        ))
@@ -0,0 +1,180 @@
+# ecommerce_app/management/commands/import_images.py
+
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ecommerce_app.blobs import sumar_referencias
+from ecommerce_app.images import formatear_bytes
+from ecommerce_app.jobs import encolar_lote
+from ecommerce_app.listing import actualizar_listings
+from ecommerce_app.models import Articulo, ArticuloImagen, Imagen
+from ecommerce_app.storage import blob_storage
+
+EXTENSIONES = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
+# "POLO-001.jpg" -> ('POLO-001', 0); "POLO-001_2.jpg" o "POLO-001-2.jpg" -> ('POLO-001', 2)
+_SUFIJO_ORDEN_RE = re.compile(r'^(?P<sku>.+?)[_-](?P<orden>\d{1,3})$')
+
+
+def sku_y_orden(nombre_archivo, skus):
+    """
+    Busca el artículo por el nombre del archivo (sin extensión, sin distinguir
+    mayúsculas). Primero el nombre completo como SKU; si no existe, el nombre
+    sin el sufijo numérico, que se usa como orden en la galería.
+    Devuelve (articulo_id, orden) o (None, None).
+    """
+    base = os.path.splitext(nombre_archivo)[0].strip().lower()
+    if base in skus:
+        return skus[base], 0
+    match = _SUFIJO_ORDEN_RE.match(base)
+    if match and match.group('sku') in skus:
+        return skus[match.group('sku')], int(match.group('orden'))
+    return None, None
+
+
+@contextmanager
+def listar_archivos(origen):
+    """
+    (nombre de archivo, tamaño, función que abre el archivo) para cada imagen
+    del directorio o ZIP. El ZIP sigue abierto hasta salir del bloque `with`,
+    así los hilos pueden leer también el último lote.
+    """
+    if zipfile.is_zipfile(origen):
+        with zipfile.ZipFile(origen) as zf:  # ZipFile permite lecturas desde varios hilos
+            yield _archivos_zip(zf)
+    elif os.path.isdir(origen):
+        yield _archivos_directorio(origen)
+    else:
+        raise CommandError(f"{origen} no es un directorio ni un archivo ZIP.")
+
+
+def _archivos_zip(zf):
+    for info in zf.infolist():
+        nombre = os.path.basename(info.filename)
+        if not info.is_dir() and os.path.splitext(nombre)[1].lower() in EXTENSIONES:
+            yield nombre, info.file_size, (lambda info=info: zf.open(info))
+
+
+def _archivos_directorio(origen):
+    for raiz, _, archivos in os.walk(origen):
+        for nombre in sorted(archivos):
+            if os.path.splitext(nombre)[1].lower() in EXTENSIONES:
+                ruta = os.path.join(raiz, nombre)
+                yield nombre, os.path.getsize(ruta), (lambda ruta=ruta: open(ruta, 'rb'))
+
+
+def guardar_blob(nombre, abrir):
+    """Se ejecuta en el pool de hilos: copia el archivo al almacén de blobs (hash incluido)."""
+    with abrir() as archivo:
+        return blob_storage().save(f'banco_imagenes/{nombre}', File(archivo, name=nombre))
+
+
+def lotes(iterable, tamaño):
+    lote = []
+    for item in iterable:
+        lote.append(item)
+        if len(lote) >= tamaño:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa imágenes de un directorio o ZIP al banco de imágenes. Los archivos "
+        "cuyo nombre coincide con el SKU de un artículo (SKU.jpg, SKU_2.jpg...) se "
+        "añaden a su galería con ese orden."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('origen', help="Directorio o archivo .zip")
+        parser.add_argument('--workers', type=int, default=min(32, (os.cpu_count() or 1) * 4),
+                            help="Hilos que copian y calculan el hash de los archivos.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Archivos por transacción / bulk_create.")
+        parser.add_argument('--only-matched', action='store_true',
+                            help="Omite los archivos que no coinciden con ningún SKU.")
+        parser.add_argument('--dry-run', action='store_true', help="Solo muestra cuántos archivos coinciden.")
+
+    def handle(self, *args, **options):
+        skus = {
+            sku.strip().lower(): pk
+            for pk, sku in Articulo.objects.exclude(sku__isnull=True).exclude(sku='').values_list('pk', 'sku')
+        }
+        inicio = time.monotonic()
+        totales = {'archivos': 0, 'bytes': 0, 'imagenes': 0, 'galeria': 0, 'sin_sku': 0, 'errores': 0}
+
+        # El pool termina antes de cerrar el ZIP (los with se cierran en orden inverso)
+        with (
+            listar_archivos(options['origen']) as archivos,
+            ThreadPoolExecutor(max_workers=max(options['workers'], 1)) as pool,
+        ):
+            for lote in lotes(archivos, options['batch_size']):
+                entradas = []
+                for nombre, tamaño, abrir in lote:
+                    articulo_id, orden = sku_y_orden(nombre, skus)
+                    if articulo_id is None:
+                        totales['sin_sku'] += 1
+                        if options['only_matched']:
+                            continue
+                    entradas.append((nombre, tamaño, abrir, articulo_id, orden))
+                if options['dry_run']:
+                    totales['archivos'] += len(entradas)
+                    continue
+                futures = [pool.submit(guardar_blob, nombre, abrir) for nombre, _, abrir, _, _ in entradas]
+                guardados = []
+                for entrada, future in zip(entradas, futures):
+                    try:
+                        guardados.append((future.result(),) + entrada)
+                    except OSError as exc:
+                        totales['errores'] += 1
+                        self.stderr.write(f"{entrada[0]}: {exc}")
+                self.registrar_lote(guardados, totales)
+                self.stdout.write(self.progreso(totales, inicio))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{self.progreso(totales, inicio)}\n"
+            f"Imágenes nuevas: {totales['imagenes']}, en galerías: {totales['galeria']}, "
+            f"sin SKU: {totales['sin_sku']}, errores: {totales['errores']}."
+        ))
+
+    @transaction.atomic
+    def registrar_lote(self, guardados, totales):
+        """Crea las Imagen (o reutiliza las que ya apuntan al mismo blob) y las filas de galería."""
+        blobs = {blob for blob, *_ in guardados}
+        existentes = dict(Imagen.objects.filter(imagen__in=blobs).values_list('imagen', 'pk'))
+        nuevas = {}
+        for blob, nombre, *_ in guardados:
+            if blob not in existentes and blob not in nuevas:
+                nuevas[blob] = Imagen(imagen=blob, nombre_archivo=nombre)
+        Imagen.objects.bulk_create(nuevas.values(), batch_size=500)  # Sin señales: referencias y trabajos a mano
+        sumar_referencias(list(nuevas))
+        encolar_lote(Imagen, [imagen.pk for imagen in nuevas.values()], 'imagen')
+        existentes.update({blob: imagen.pk for blob, imagen in nuevas.items()})
+
+        galeria = [
+            ArticuloImagen(articulo_id=articulo_id, imagen_id=existentes[blob], orden=orden)
+            for blob, _, _, _, articulo_id, orden in guardados if articulo_id is not None
+        ]
+        # unique_together (articulo, imagen): volver a importar el mismo archivo no duplica la galería
+        ArticuloImagen.objects.bulk_create(galeria, batch_size=500, ignore_conflicts=True)
+        actualizar_listings({fila.articulo_id for fila in galeria})
+
+        totales['archivos'] += len(guardados)
+        totales['bytes'] += sum(tamaño for _, _, tamaño, *_ in guardados)
+        totales['imagenes'] += len(nuevas)
+        totales['galeria'] += len(galeria)
+
+    def progreso(self, totales, inicio):
+        segundos = max(time.monotonic() - inicio, 1e-6)
+        return (
+            f"{totales['archivos']} archivos, {formatear_bytes(totales['bytes'])} en {segundos:.1f}s "
+            f"({totales['archivos'] / segundos:.1f} archivos/s, {formatear_bytes(int(totales['bytes'] / segundos))}/s)"
+        )
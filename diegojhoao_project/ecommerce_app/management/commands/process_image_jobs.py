@@ -0,0 +1,72 @@
+# ecommerce_app/management/commands/process_image_jobs.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from ecommerce_app.jobs import liberar_trabajos_bloqueados, reclamar_trabajos, procesar_trabajo
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker de imágenes: procesa la cola TrabajoImagen (EXIF, hash, dimensiones "
+        "y renditions) en un pool de procesos. Con --once termina cuando la cola queda vacía."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Procesos del pool (por defecto, uno por CPU). 0 = en este mismo proceso.")
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help="Trabajos reclamados por vuelta (por defecto, 4 por proceso).")
+        parser.add_argument('--once', action='store_true', help="Procesa lo pendiente y termina.")
+        parser.add_argument('--sleep', type=float, default=5.0, help="Segundos de espera con la cola vacía.")
+
+    def handle(self, *args, **options):
+        workers = max(options['workers'], 0)
+        batch_size = options['batch_size'] or max(workers, 1) * 4
+        pool = None
+        if workers:
+            # Cada proceso hijo abre su propia conexión a la base de datos
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+        totales = {'completado': 0, 'pendiente': 0, 'error': 0}
+        try:
+            while True:
+                liberados = liberar_trabajos_bloqueados()
+                if liberados:
+                    self.stdout.write(f"{liberados} trabajos abandonados devueltos a la cola")
+                ids = reclamar_trabajos(batch_size)
+                if not ids:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+                for pk, estado in self.procesar(ids, pool):
+                    totales[estado] = totales.get(estado, 0) + 1
+                    if estado != 'completado':
+                        self.stderr.write(f"Trabajo {pk}: {estado}")
+        except KeyboardInterrupt:
+            self.stdout.write("Worker detenido.")
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"Completados: {totales['completado']}, reintentos: {totales['pendiente']}, con error: {totales['error']}."
+        ))
+
+    def procesar(self, ids, pool):
+        if pool is None:
+            return [(pk, procesar_trabajo(pk)) for pk in ids]
+        connections.close_all()  # No compartir la conexión del proceso principal con los hijos
+        futures = {pool.submit(procesar_trabajo, pk): pk for pk in ids}
+        resultados = []
+        for future in as_completed(futures):
+            try:
+                resultados.append((futures[future], future.result()))
+            except Exception as exc:
+                # Fallo fuera del propio trabajo (ej: base de datos); liberar_trabajos_bloqueados lo recupera
+                self.stderr.write(f"Trabajo {futures[future]}: {exc}")
+        return resultados
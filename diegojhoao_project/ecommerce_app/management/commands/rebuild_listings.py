@@ -0,0 +1,21 @@
+# ecommerce_app/management/commands/rebuild_listings.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ecommerce_app.listing import reconstruir_listings
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenera el modelo de lectura del listado (ArticuloListing) de todos los artículos. "
+        "Necesario tras loaddata o cambios en ArticuloSerializer."
+    )
+
+    def handle(self, *args, **options):
+        inicio = time.monotonic()
+        total = reconstruir_listings()
+        self.stdout.write(self.style.SUCCESS(
+            f"Listado reconstruido ({total} artículos en {time.monotonic() - inicio:.1f}s)."
+        ))
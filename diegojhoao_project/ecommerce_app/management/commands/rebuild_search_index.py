@@ -0,0 +1,18 @@
+# ecommerce_app/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+
+from ecommerce_app.models import Articulo
+from ecommerce_app.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de texto completo de los artículos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help="Alias de la base de datos (por defecto 'default').")
+
+    def handle(self, *args, **options):
+        rebuild_index(using=options['database'])
+        total = Articulo.objects.using(options['database']).count()
+        self.stdout.write(self.style.SUCCESS(f"Índice de búsqueda reconstruido ({total} artículos)."))
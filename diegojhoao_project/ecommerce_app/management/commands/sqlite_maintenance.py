@@ -0,0 +1,65 @@
+# ecommerce_app/management/commands/sqlite_maintenance.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Mantenimiento de la base SQLite. Sin opciones ejecuta PRAGMA optimize (actualiza "
+        "las estadísticas del planificador solo donde hace falta; barato, apto para cron diario). "
+        "--analyze recalcula todas las estadísticas, --checkpoint vuelca el WAL al archivo "
+        "principal y lo trunca, y --vacuum reescribe el archivo para recuperar espacio "
+        "(bloquea las escrituras mientras dura; mejor fuera de horario)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true', help="ANALYZE completo de todas las tablas.")
+        parser.add_argument('--vacuum', action='store_true', help="VACUUM: compacta el archivo.")
+        parser.add_argument('--checkpoint', action='store_true', help="PRAGMA wal_checkpoint(TRUNCATE).")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="Alias de la base de datos (por defecto 'default').")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"La base '{options['database']}' no es SQLite ({connection.vendor}).")
+        if options['vacuum'] and connection.in_atomic_block:
+            raise CommandError("VACUUM no se puede ejecutar dentro de una transacción.")
+        nombre = connection.settings_dict['NAME']
+        tamaño_inicial = self._tamaño(connection)
+
+        with connection.cursor() as cursor:
+            if options['analyze']:
+                cursor.execute('ANALYZE')
+                self.stdout.write("ANALYZE completado.")
+            else:
+                cursor.execute('PRAGMA optimize')
+                self.stdout.write("PRAGMA optimize completado.")
+            if options['vacuum']:
+                cursor.execute('VACUUM')
+                self.stdout.write(f"VACUUM completado: {tamaño_inicial:,} -> {self._tamaño(connection):,} bytes.")
+            if options['checkpoint']:
+                self._checkpoint(cursor)
+        self.stdout.write(self.style.SUCCESS(f"Mantenimiento de {nombre} terminado."))
+
+    def _tamaño(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA page_count')
+            paginas = cursor.fetchone()[0]
+            cursor.execute('PRAGMA page_size')
+            return paginas * cursor.fetchone()[0]
+
+    def _checkpoint(self, cursor):
+        cursor.execute('PRAGMA journal_mode')
+        if cursor.fetchone()[0] != 'wal':
+            self.stdout.write("La base no usa WAL: no hay checkpoint que hacer.")
+            return
+        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        ocupada, paginas_wal, volcadas = cursor.fetchone()
+        if ocupada:
+            # Otra conexión tenía una lectura abierta: el WAL se volcó solo en parte
+            self.stdout.write(self.style.WARNING(
+                f"Checkpoint parcial: {volcadas} de {paginas_wal} páginas (base de datos ocupada)."
+            ))
+        else:
+            self.stdout.write(f"Checkpoint del WAL: {volcadas} páginas volcadas.")
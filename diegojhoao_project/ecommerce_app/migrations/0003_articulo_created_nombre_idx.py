@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0002_carousel_contentblock_navigationlink_carouselslide'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(fields=['-created_at', 'nombre'], name='articulo_created_nombre_idx'),
+        ),
+    ]
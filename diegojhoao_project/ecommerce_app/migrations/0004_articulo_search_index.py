@@ -0,0 +1,60 @@
+# Índice de texto completo para la búsqueda de artículos.
+# SQLite: tabla virtual FTS5. PostgreSQL: columna tsvector + índice GIN.
+
+from django.db import migrations
+
+FTS_TABLE = 'ecommerce_app_articulo_fts'
+
+
+def crear_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "nombre, descripcion, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, nombre, descripcion) "
+            "SELECT id, nombre, coalesce(descripcion, '') FROM ecommerce_app_articulo"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+        schema_editor.execute(
+            "DO $$ BEGIN "
+            "IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'ecommerce_es') THEN "
+            "CREATE TEXT SEARCH CONFIGURATION ecommerce_es (COPY = pg_catalog.spanish); "
+            "ALTER TEXT SEARCH CONFIGURATION ecommerce_es "
+            "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem; "
+            "END IF; END $$"
+        )
+        schema_editor.execute("ALTER TABLE ecommerce_app_articulo ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        schema_editor.execute(
+            "UPDATE ecommerce_app_articulo SET search_vector = "
+            "setweight(to_tsvector('ecommerce_es', coalesce(nombre, '')), 'A') || "
+            "setweight(to_tsvector('ecommerce_es', coalesce(descripcion, '')), 'B')"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS articulo_search_vector_gin "
+            "ON ecommerce_app_articulo USING GIN (search_vector)"
+        )
+
+
+def eliminar_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS articulo_search_vector_gin")
+        schema_editor.execute("ALTER TABLE ecommerce_app_articulo DROP COLUMN IF EXISTS search_vector")
+        schema_editor.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS ecommerce_es")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0003_articulo_created_nombre_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0004_articulo_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(fields=['activo', 'categoria', 'precio'], name='articulo_act_cat_precio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(fields=['activo', 'destacado', 'created_at'], name='articulo_act_dest_created_idx'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0006_filtrovalor_updated_at_navigationlink_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articulo',
+            name='imagen_principal_alto',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto (px)'),
+        ),
+        migrations.AddField(
+            model_name='articulo',
+            name='imagen_principal_ancho',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho (px)'),
+        ),
+        migrations.AddField(
+            model_name='articulo',
+            name='imagen_principal_bytes',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, verbose_name='Tamaño (bytes)'),
+        ),
+        migrations.AddField(
+            model_name='articulo',
+            name='imagen_principal_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Hash SHA-256 del contenido'),
+        ),
+        migrations.AddField(
+            model_name='carouselslide',
+            name='imagen_alto',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto (px)'),
+        ),
+        migrations.AddField(
+            model_name='carouselslide',
+            name='imagen_ancho',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho (px)'),
+        ),
+        migrations.AddField(
+            model_name='carouselslide',
+            name='imagen_bytes',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, verbose_name='Tamaño (bytes)'),
+        ),
+        migrations.AddField(
+            model_name='carouselslide',
+            name='imagen_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Hash SHA-256 del contenido'),
+        ),
+        migrations.AddField(
+            model_name='categoria',
+            name='imagen_categoria_alto',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto (px)'),
+        ),
+        migrations.AddField(
+            model_name='categoria',
+            name='imagen_categoria_ancho',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho (px)'),
+        ),
+        migrations.AddField(
+            model_name='categoria',
+            name='imagen_categoria_bytes',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, verbose_name='Tamaño (bytes)'),
+        ),
+        migrations.AddField(
+            model_name='categoria',
+            name='imagen_categoria_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Hash SHA-256 del contenido'),
+        ),
+        migrations.AddField(
+            model_name='imagen',
+            name='imagen_alto',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto (px)'),
+        ),
+        migrations.AddField(
+            model_name='imagen',
+            name='imagen_ancho',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho (px)'),
+        ),
+        migrations.AddField(
+            model_name='imagen',
+            name='imagen_bytes',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, verbose_name='Tamaño (bytes)'),
+        ),
+        migrations.AddField(
+            model_name='imagen',
+            name='imagen_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Hash SHA-256 del contenido'),
+        ),
+    ]
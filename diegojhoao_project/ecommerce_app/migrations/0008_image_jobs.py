@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def marcar_imagenes_procesadas(apps, schema_editor):
+    # Las imágenes que ya tienen metadatos (migración 0007) no necesitan pasar por el worker
+    Imagen = apps.get_model('ecommerce_app', 'Imagen')
+    Imagen.objects.exclude(imagen_sha256='').update(estado_procesamiento='listo')
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0007_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagen',
+            name='estado_procesamiento',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('listo', 'Listo'), ('error', 'Error')], default='pendiente', editable=False, max_length=20, verbose_name='Estado del procesamiento'),
+        ),
+        migrations.CreateModel(
+            name='TrabajoImagen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(help_text='app_label.modelo, ej: ecommerce_app.imagen', max_length=100, verbose_name='Modelo')),
+                ('objeto_id', models.PositiveBigIntegerField(verbose_name='ID del objeto')),
+                ('campo', models.CharField(max_length=50, verbose_name='Campo de imagen')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('completado', 'Completado'), ('error', 'Error')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('intentos', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('max_intentos', models.PositiveSmallIntegerField(default=3, verbose_name='Máximo de intentos')),
+                ('disponible_desde', models.DateTimeField(default=django.utils.timezone.now, help_text='Los reintentos se programan con espera creciente', verbose_name='Disponible desde')),
+                ('ultimo_error', models.TextField(blank=True, verbose_name='Último error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Trabajo de Imagen',
+                'verbose_name_plural': 'Trabajos de Imágenes',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['estado', 'disponible_desde'], name='trabajoimagen_cola_idx')],
+            },
+        ),
+        migrations.RunPython(marcar_imagenes_procesadas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:08
+
+import ecommerce_app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0008_image_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlobImagen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=255, unique=True, verbose_name='Ruta en el almacenamiento')),
+                ('sha256', models.CharField(db_index=True, max_length=64, verbose_name='Hash SHA-256 del contenido')),
+                ('referencias', models.PositiveIntegerField(default=0, help_text='Campos de imagen que apuntan a este archivo', verbose_name='Referencias')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Blob de Imagen',
+                'verbose_name_plural': 'Blobs de Imágenes',
+            },
+        ),
+        migrations.AlterField(
+            model_name='articulo',
+            name='imagen_principal',
+            field=models.ImageField(blank=True, null=True, storage=ecommerce_app.storage.blob_storage, upload_to='articulos_principales/', verbose_name='Imagen Principal del Artículo'),
+        ),
+        migrations.AlterField(
+            model_name='carouselslide',
+            name='imagen',
+            field=models.ImageField(storage=ecommerce_app.storage.blob_storage, upload_to='carousels/', verbose_name='Imagen del slide'),
+        ),
+        migrations.AlterField(
+            model_name='categoria',
+            name='imagen_categoria',
+            field=models.ImageField(blank=True, null=True, storage=ecommerce_app.storage.blob_storage, upload_to='categorias/', verbose_name='Imagen de la Categoría'),
+        ),
+        migrations.AlterField(
+            model_name='contentblock',
+            name='imagen_asociada',
+            field=models.ImageField(blank=True, null=True, storage=ecommerce_app.storage.blob_storage, upload_to='content_blocks/'),
+        ),
+        migrations.AlterField(
+            model_name='imagen',
+            name='imagen',
+            field=models.ImageField(storage=ecommerce_app.storage.blob_storage, upload_to='banco_imagenes/', verbose_name='Archivo de imagen'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def poblar_listings(apps, schema_editor):
+    # Sin filas, cada artículo del listado se serializaría en el momento. Se usa el código
+    # actual (serializer y renditions): la representación no se puede reconstruir con
+    # modelos históricos. Con la tabla de artículos vacía no hay nada que hacer
+    if not apps.get_model('ecommerce_app', 'Articulo').objects.exists():
+        return
+    from ecommerce_app.listing import reconstruir_listings
+    reconstruir_listings()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0009_image_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticuloListing',
+            fields=[
+                ('articulo', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='ecommerce_app.articulo', verbose_name='Artículo')),
+                ('datos', models.JSONField(verbose_name='Datos del listado')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+            ],
+            options={
+                'verbose_name': 'Listado de Artículo',
+                'verbose_name_plural': 'Listado de Artículos',
+            },
+        ),
+        migrations.RunPython(poblar_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:25
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0010_articulo_listing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Pedido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Identifica el pedido en la API (no es adivinable)', unique=True, verbose_name='Código')),
+                ('nombre_cliente', models.CharField(blank=True, max_length=200, verbose_name='Nombre del cliente')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='Email')),
+                ('telefono', models.CharField(blank=True, max_length=30, verbose_name='Teléfono')),
+                ('estado', models.CharField(choices=[('reservado', 'Reservado'), ('confirmado', 'Confirmado'), ('cancelado', 'Cancelado'), ('expirado', 'Expirado')], default='reservado', max_length=20, verbose_name='Estado')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total')),
+                ('reservado_hasta', models.DateTimeField(help_text='Pasada esta fecha, el stock reservado se libera', verbose_name='Reserva válida hasta')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pedidos', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Pedido',
+                'verbose_name_plural': 'Pedidos',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PedidoItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=200, verbose_name='Nombre del artículo')),
+                ('sku', models.CharField(blank=True, max_length=100, verbose_name='SKU')),
+                ('precio_unitario', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Precio unitario')),
+                ('cantidad', models.PositiveIntegerField(verbose_name='Cantidad')),
+                ('articulo', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pedido_items', to='ecommerce_app.articulo', verbose_name='Artículo')),
+                ('pedido', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='ecommerce_app.pedido', verbose_name='Pedido')),
+            ],
+            options={
+                'verbose_name': 'Artículo del Pedido',
+                'verbose_name_plural': 'Artículos del Pedido',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['estado', 'reservado_hasta'], name='pedido_reserva_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='pedidoitem',
+            unique_together={('pedido', 'articulo')},
+        ),
+    ]
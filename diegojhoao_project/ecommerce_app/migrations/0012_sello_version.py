@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:41
+
+from django.db import migrations, models
+
+# Espacios que usa el código (bitmap.py, config.py, views.py, signals.py). Se crean
+# aquí para que la primera petición no tenga que insertarlos
+ESPACIOS = ('filtro_bitmap', 'configuracion', 'bootstrap', 'carousel', 'navigationlink', 'contentblock')
+
+
+def crear_sellos(apps, schema_editor):
+    SelloVersion = apps.get_model('ecommerce_app', 'SelloVersion')
+    SelloVersion.objects.bulk_create([SelloVersion(nombre=nombre) for nombre in ESPACIOS], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0011_pedidos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SelloVersion',
+            fields=[
+                ('nombre', models.CharField(help_text='Espacio versionado, ej: filtro_bitmap, configuracion', max_length=100, primary_key=True, serialize=False, verbose_name='Nombre')),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='Versión')),
+            ],
+            options={
+                'verbose_name': 'Sello de Versión',
+                'verbose_name_plural': 'Sellos de Versión',
+            },
+        ),
+        migrations.RunPython(crear_sellos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def regenerar_listings(apps, schema_editor):
+    # 'filtros_aplicados' pasó de lista plana a agrupada por filtro e 'imagenes_galeria'
+    # y 'categoria_slug' son nuevos: las filas ya guardadas se recalculan con el código
+    # actual para que la tienda no reciba formas mezcladas
+    if not apps.get_model('ecommerce_app', 'ArticuloListing').objects.exists():
+        return
+    from ecommerce_app.listing import reconstruir_listings
+    reconstruir_listings()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0012_sello_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(regenerar_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0013_regenerar_listings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(fields=['precio', 'id'], name='articulo_precio_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(fields=['nombre', 'id'], name='articulo_nombre_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(fields=['destacado', 'id'], name='articulo_destacado_id_idx'),
+        ),
+    ]
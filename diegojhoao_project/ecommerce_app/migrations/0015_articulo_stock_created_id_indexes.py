@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0014_articulo_ordering_id_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(fields=['stock', 'id'], name='articulo_stock_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(fields=['created_at', 'id'], name='articulo_created_id_idx'),
+        ),
+    ]
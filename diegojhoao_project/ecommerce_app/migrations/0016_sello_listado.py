@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:05
+
+from django.db import migrations
+
+
+def crear_sello_listado(apps, schema_editor):
+    # Espacio del ETag del listado de artículos (listing.py, views.py), como los de 0012
+    SelloVersion = apps.get_model('ecommerce_app', 'SelloVersion')
+    SelloVersion.objects.get_or_create(nombre='listado')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce_app', '0015_articulo_stock_created_id_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_sello_listado, migrations.RunPython.noop),
+    ]
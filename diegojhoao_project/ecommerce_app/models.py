@@ -1,9 +1,14 @@
 # ecommerce_app/models.py
 
+import uuid
+
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.auth.models import User # Para futuras referencias a usuarios
 
+from .storage import blob_storage  # Imágenes deduplicadas por contenido (ver storage.py y blobs.py)
+
 # Modelo para las Categorías de los artículos
 class Categoria(models.Model):
     nombre = models.CharField(max_length=100, unique=True, verbose_name="Nombre de la categoría")
@@ -11,7 +16,12 @@ class Categoria(models.Model):
     slug = models.SlugField(max_length=120, unique=True, blank=True, help_text="Dejar en blanco para autogenerar")
     activo = models.BooleanField(default=True, verbose_name="¿Está activa?")
     orden = models.PositiveIntegerField(default=0, verbose_name="Orden de aparición")
-    imagen_categoria = models.ImageField(upload_to='categorias/', blank=True, null=True, verbose_name="Imagen de la Categoría")
+    imagen_categoria = models.ImageField(upload_to='categorias/', storage=blob_storage, blank=True, null=True, verbose_name="Imagen de la Categoría")
+    # Metadatos de la imagen (se calculan al subir el archivo, ver images.py)
+    imagen_categoria_ancho = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="Ancho (px)")
+    imagen_categoria_alto = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="Alto (px)")
+    imagen_categoria_bytes = models.PositiveBigIntegerField(blank=True, null=True, editable=False, verbose_name="Tamaño (bytes)")
+    imagen_categoria_sha256 = models.CharField(max_length=64, blank=True, editable=False, verbose_name="Hash SHA-256 del contenido")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
 
@@ -31,7 +41,20 @@ class Categoria(models.Model):
 # Modelo para las Imágenes (banco de imágenes)
 class Imagen(models.Model):
     nombre_archivo = models.CharField(max_length=255, blank=True, verbose_name="Nombre del archivo (opcional)")
-    imagen = models.ImageField(upload_to='banco_imagenes/', verbose_name="Archivo de imagen")
+    imagen = models.ImageField(upload_to='banco_imagenes/', storage=blob_storage, verbose_name="Archivo de imagen")
+    # Metadatos de la imagen (se calculan al subir el archivo, ver images.py)
+    imagen_ancho = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="Ancho (px)")
+    imagen_alto = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="Alto (px)")
+    imagen_bytes = models.PositiveBigIntegerField(blank=True, null=True, editable=False, verbose_name="Tamaño (bytes)")
+    imagen_sha256 = models.CharField(max_length=64, blank=True, editable=False, verbose_name="Hash SHA-256 del contenido")
+    # Lo actualiza el worker de imágenes (python manage.py process_image_jobs)
+    ESTADO_PROCESAMIENTO_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('procesando', 'Procesando'),
+        ('listo', 'Listo'),
+        ('error', 'Error'),
+    ]
+    estado_procesamiento = models.CharField(max_length=20, choices=ESTADO_PROCESAMIENTO_CHOICES, default='pendiente', editable=False, verbose_name="Estado del procesamiento")
     alt_text = models.CharField(max_length=255, blank=True, null=True, verbose_name="Texto alternativo (SEO)")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de subida")
 
@@ -54,7 +77,12 @@ class Articulo(models.Model):
     activo = models.BooleanField(default=True, verbose_name="¿Visible para clientes?")
     destacado = models.BooleanField(default=False, verbose_name="¿Artículo destacado?")
     # Imagen principal directamente en el artículo para simplificar, o se puede usar ArticuloImagen
-    imagen_principal = models.ImageField(upload_to='articulos_principales/', blank=True, null=True, verbose_name="Imagen Principal del Artículo")
+    imagen_principal = models.ImageField(upload_to='articulos_principales/', storage=blob_storage, blank=True, null=True, verbose_name="Imagen Principal del Artículo")
+    # Metadatos de la imagen principal (se calculan al subir el archivo, ver images.py)
+    imagen_principal_ancho = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="Ancho (px)")
+    imagen_principal_alto = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="Alto (px)")
+    imagen_principal_bytes = models.PositiveBigIntegerField(blank=True, null=True, editable=False, verbose_name="Tamaño (bytes)")
+    imagen_principal_sha256 = models.CharField(max_length=64, blank=True, editable=False, verbose_name="Hash SHA-256 del contenido")
     # Relación a través de ArticuloImagen para múltiples imágenes
     imagenes_galeria = models.ManyToManyField(Imagen, through='ArticuloImagen', related_name='articulos_galeria', blank=True, verbose_name="Imágenes de Galería")
     
@@ -65,10 +93,42 @@ class Articulo(models.Model):
         verbose_name = "Artículo"
         verbose_name_plural = "Artículos"
         ordering = ['-created_at', 'nombre']
+        indexes = [
+            # Soporta la paginación por cursor (keyset) de la API sobre el orden por defecto
+            models.Index(fields=['-created_at', 'nombre'], name='articulo_created_nombre_idx'),
+            # Listados filtrados por categoría/destacado y ordenados en la base de datos (?ordering=)
+            models.Index(fields=['activo', 'categoria', 'precio'], name='articulo_act_cat_precio_idx'),
+            models.Index(fields=['activo', 'destacado', 'created_at'], name='articulo_act_dest_created_idx'),
+            # ?ordering= sin filtros: (campo, id) cubre el orden y el desempate de ArticuloOrderingFilter
+            models.Index(fields=['precio', 'id'], name='articulo_precio_id_idx'),
+            models.Index(fields=['nombre', 'id'], name='articulo_nombre_id_idx'),
+            models.Index(fields=['destacado', 'id'], name='articulo_destacado_id_idx'),
+            models.Index(fields=['stock', 'id'], name='articulo_stock_id_idx'),
+            models.Index(fields=['created_at', 'id'], name='articulo_created_id_idx'),
+        ]
 
     def __str__(self):
         return self.nombre
 
+# Modelo de lectura para el listado de la tienda (ver listing.py)
+class ArticuloListing(models.Model):
+    """
+    Representación ya serializada de cada artículo (mismos campos que
+    ArticuloSerializer: categoría, renditions de la imagen principal, filtros
+    aplicados...). Las señales la mantienen al día; para regenerarla por
+    completo: python manage.py rebuild_listings.
+    """
+    articulo = models.OneToOneField(Articulo, primary_key=True, on_delete=models.CASCADE, related_name='listing', verbose_name="Artículo")
+    datos = models.JSONField(verbose_name="Datos del listado")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
+
+    class Meta:
+        verbose_name = "Listado de Artículo"
+        verbose_name_plural = "Listado de Artículos"
+
+    def __str__(self):
+        return f"Listado de {self.articulo_id}"
+
 # Modelo intermedio para la relación muchos-a-muchos entre Artículo e Imagen (para la galería)
 class ArticuloImagen(models.Model):
     articulo = models.ForeignKey(Articulo, on_delete=models.CASCADE, verbose_name="Artículo")
@@ -110,6 +170,7 @@ class FiltroValor(models.Model):
     activo = models.BooleanField(default=True, verbose_name="¿Valor activo?")
     # Relación ManyToMany con Articulo para aplicar este valor de filtro a artículos
     articulos = models.ManyToManyField(Articulo, related_name='filtros_aplicados', blank=True, through='ArticuloFiltroValor', verbose_name="Artículos con este filtro")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
 
 
     class Meta:
@@ -164,7 +225,12 @@ class Carousel(models.Model):
 
 class CarouselSlide(models.Model):
     carousel = models.ForeignKey(Carousel, related_name='slides', on_delete=models.CASCADE)
-    imagen = models.ImageField(upload_to='carousels/', verbose_name="Imagen del slide")
+    imagen = models.ImageField(upload_to='carousels/', storage=blob_storage, verbose_name="Imagen del slide")
+    # Metadatos de la imagen (se calculan al subir el archivo, ver images.py)
+    imagen_ancho = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="Ancho (px)")
+    imagen_alto = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="Alto (px)")
+    imagen_bytes = models.PositiveBigIntegerField(blank=True, null=True, editable=False, verbose_name="Tamaño (bytes)")
+    imagen_sha256 = models.CharField(max_length=64, blank=True, editable=False, verbose_name="Hash SHA-256 del contenido")
     # Usaremos el modelo Imagen existente si quieres reutilizar imágenes del banco de imágenes
     # imagen_banco = models.ForeignKey(Imagen, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Imagen del Banco")
     titulo = models.CharField(max_length=200, blank=True, null=True, help_text="Título opcional que se superpone a la imagen")
@@ -197,6 +263,7 @@ class NavigationLink(models.Model):
     orden = models.PositiveIntegerField(default=0)
     abrir_en_nueva_pestana = models.BooleanField(default=False, help_text="Marcar si el enlace debe abrirse en una nueva pestaña")
     activo = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.texto_del_enlace} ({self.get_ubicacion_display()})"
@@ -212,7 +279,7 @@ class ContentBlock(models.Model):
     titulo = models.CharField(max_length=200, blank=True, null=True)
     contenido_html = models.TextField(blank=True, null=True, help_text="Contenido principal del bloque. Puede ser HTML.")
     # Podrías usar un RichTextField si instalas django-ckeditor o similar
-    imagen_asociada = models.ImageField(upload_to='content_blocks/', blank=True, null=True)
+    imagen_asociada = models.ImageField(upload_to='content_blocks/', storage=blob_storage, blank=True, null=True)
     enlace_url = models.URLField(max_length=300, blank=True, null=True, help_text="URL a la que podría enlazar este bloque (opcional)")
     activo = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -225,4 +292,114 @@ class ContentBlock(models.Model):
         verbose_name = "Bloque de Contenido"
         verbose_name_plural = "Bloques de Contenido"
 
+# Cola de procesamiento de imágenes (la consume: python manage.py process_image_jobs)
+class TrabajoImagen(models.Model):
+    ESTADO_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('procesando', 'Procesando'),
+        ('completado', 'Completado'),
+        ('error', 'Error'),
+    ]
+    modelo = models.CharField(max_length=100, verbose_name="Modelo", help_text="app_label.modelo, ej: ecommerce_app.imagen")
+    objeto_id = models.PositiveBigIntegerField(verbose_name="ID del objeto")
+    campo = models.CharField(max_length=50, verbose_name="Campo de imagen")
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='pendiente', verbose_name="Estado")
+    intentos = models.PositiveSmallIntegerField(default=0, verbose_name="Intentos")
+    max_intentos = models.PositiveSmallIntegerField(default=3, verbose_name="Máximo de intentos")
+    disponible_desde = models.DateTimeField(default=timezone.now, verbose_name="Disponible desde", help_text="Los reintentos se programan con espera creciente")
+    ultimo_error = models.TextField(blank=True, verbose_name="Último error")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Trabajo de Imagen"
+        verbose_name_plural = "Trabajos de Imágenes"
+        ordering = ['created_at']
+        indexes = [
+            # El worker busca: estado='pendiente' AND disponible_desde <= ahora
+            models.Index(fields=['estado', 'disponible_desde'], name='trabajoimagen_cola_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo} #{self.objeto_id} ({self.campo}): {self.estado}"
+
+# Archivos de imagen deduplicados: un blob por contenido, compartido por varias filas
+class BlobImagen(models.Model):
+    nombre = models.CharField(max_length=255, unique=True, verbose_name="Ruta en el almacenamiento")
+    sha256 = models.CharField(max_length=64, db_index=True, verbose_name="Hash SHA-256 del contenido")
+    referencias = models.PositiveIntegerField(default=0, verbose_name="Referencias", help_text="Campos de imagen que apuntan a este archivo")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Blob de Imagen"
+        verbose_name_plural = "Blobs de Imágenes"
+
+    def __str__(self):
+        return f"{self.nombre} ({self.referencias} ref.)"
+
+# Pedidos de la tienda: al crearse reservan el stock durante un tiempo limitado (ver pedidos.py)
+class Pedido(models.Model):
+    ESTADO_CHOICES = [
+        ('reservado', 'Reservado'),
+        ('confirmado', 'Confirmado'),
+        ('cancelado', 'Cancelado'),
+        ('expirado', 'Expirado'),
+    ]
+    codigo = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, verbose_name="Código", help_text="Identifica el pedido en la API (no es adivinable)")
+    usuario = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='pedidos', verbose_name="Usuario")
+    nombre_cliente = models.CharField(max_length=200, blank=True, verbose_name="Nombre del cliente")
+    email = models.EmailField(blank=True, verbose_name="Email")
+    telefono = models.CharField(max_length=30, blank=True, verbose_name="Teléfono")
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='reservado', verbose_name="Estado")
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Total")
+    reservado_hasta = models.DateTimeField(verbose_name="Reserva válida hasta", help_text="Pasada esta fecha, el stock reservado se libera")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
+
+    class Meta:
+        verbose_name = "Pedido"
+        verbose_name_plural = "Pedidos"
+        ordering = ['-created_at']
+        indexes = [
+            # expire_reservations busca: estado='reservado' AND reservado_hasta <= ahora
+            models.Index(fields=['estado', 'reservado_hasta'], name='pedido_reserva_idx'),
+        ]
+
+    def __str__(self):
+        return f"Pedido {str(self.codigo)[:8]} ({self.get_estado_display()})"
+
+class PedidoItem(models.Model):
+    pedido = models.ForeignKey(Pedido, related_name='items', on_delete=models.CASCADE, verbose_name="Pedido")
+    # Si el artículo se borra, el pedido conserva nombre, SKU y precio
+    articulo = models.ForeignKey(Articulo, related_name='pedido_items', on_delete=models.SET_NULL, null=True, verbose_name="Artículo")
+    nombre = models.CharField(max_length=200, verbose_name="Nombre del artículo")
+    sku = models.CharField(max_length=100, blank=True, verbose_name="SKU")
+    precio_unitario = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Precio unitario")
+    cantidad = models.PositiveIntegerField(verbose_name="Cantidad")
+
+    class Meta:
+        verbose_name = "Artículo del Pedido"
+        verbose_name_plural = "Artículos del Pedido"
+        unique_together = ('pedido', 'articulo')
+
+    def __str__(self):
+        return f"{self.cantidad} x {self.nombre}"
+
+    @property
+    def subtotal(self):
+        return self.precio_unitario * self.cantidad
+
+# Sellos de versión compartidos por todos los procesos (workers y comandos), ver cache.py
+class SelloVersion(models.Model):
+    nombre = models.CharField(max_length=100, primary_key=True, verbose_name="Nombre", help_text="Espacio versionado, ej: filtro_bitmap, configuracion")
+    version = models.PositiveBigIntegerField(default=1, verbose_name="Versión")
+
+    class Meta:
+        verbose_name = "Sello de Versión"
+        verbose_name_plural = "Sellos de Versión"
+
+    def __str__(self):
+        return f"{self.nombre} v{self.version}"
+
 # Create your models here.
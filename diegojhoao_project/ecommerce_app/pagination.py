@@ -0,0 +1,139 @@
+# ecommerce_app/pagination.py
+
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+def _valor_cursor(valor):
+    # str() conserva los microsegundos y los decimales exactos; el campo los vuelve a convertir al filtrar
+    return str(valor) if isinstance(valor, (Decimal, date)) else valor
+
+
+def despues_de(ordering, valores):
+    """
+    Condición keyset "fila posterior a `valores`" para un orden compuesto:
+    (a > v1) OR (a = v1 AND b > v2) OR ..., con < en los campos descendentes.
+    El primer término se repite como a >= v1 para que la base use el índice como rango.
+    """
+    condicion, iguales = Q(), Q()
+    for campo, valor in zip(ordering, valores):
+        nombre = campo.lstrip('-')
+        operador = 'lt' if campo.startswith('-') else 'gt'
+        termino = iguales & Q(**{f'{nombre}__{operador}': valor})
+        condicion = termino if not condicion else condicion | termino
+        iguales &= Q(**{nombre: valor})
+    primero = ordering[0]
+    rango = Q(**{f"{primero.lstrip('-')}__{'lte' if primero.startswith('-') else 'gte'}": valores[0]})
+    return rango & condicion
+
+
+class ArticuloCursorPagination(CursorPagination):
+    """
+    Paginación por cursor (keyset) para el listado de artículos.
+    En lugar de OFFSET, cada página continúa desde la posición del último
+    elemento de la anterior, así el coste de pedir una página no crece con
+    el tamaño de la tabla `Articulo`.
+    Acepta `?page_size=` y también `?limit=` (lo que ya envía el frontend).
+    Si la vista usa ArticuloOrderingFilter, el orden (y el cursor) lo decide ese filtro.
+
+    A diferencia de CursorPagination de DRF, que solo guarda el primer campo
+    del orden y resuelve los empates con un offset (limitado a
+    `offset_cutoff`), el cursor guarda los valores de todos los campos del
+    orden, que siempre termina en 'id'. Así órdenes con muchos empates
+    (destacado, precios repetidos, relevancia) recorren cada artículo una vez.
+    """
+    ordering = ('-created_at', 'nombre')  # Mismo orden que Articulo.Meta.ordering
+    page_size = 20
+    page_size_query_param = 'page_size'
+    limit_query_param = 'limit'  # Alias usado por Home.js y ProductDetail.js
+    max_page_size = 100
+
+    def get_page_size(self, request):
+        # Si no llega 'page_size' probamos con 'limit'
+        if self.page_size_query_param not in request.query_params and self.limit_query_param in request.query_params:
+            try:
+                limit = int(request.query_params[self.limit_query_param])
+            except (TypeError, ValueError):
+                return self.page_size
+            if limit > 0:
+                return min(limit, self.max_page_size)
+            return self.page_size
+        return super().get_page_size(request)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not any(campo.lstrip('-') in ('id', 'pk') for campo in ordering):
+            ordering += ('id',)  # El cursor necesita un orden total
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        # Hacia atrás se recorre el orden invertido desde la primera fila de la página y se da la vuelta al resultado
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            try:
+                queryset = queryset.filter(despues_de(ordering, self.cursor.position))
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)  # Cursor manipulado: valores que no encajan con el campo
+
+        # Una fila de más para saber si hay otra página
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        hay_mas = len(results) > len(self.page)
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, hay_mas
+        else:
+            self.has_next, self.has_previous = hay_mas, self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._posicion(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._posicion(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _posicion(self, instance):
+        return [_valor_cursor(getattr(instance, campo.lstrip('-'))) for campo in self.ordering]
+
+    def encode_cursor(self, cursor):
+        # Con los campos del orden: un cursor de otro ?ordering= se rechaza en lugar de filtrar mal
+        position = json.dumps([self.ordering, cursor.position])
+        return super().encode_cursor(cursor._replace(position=position))
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+        try:
+            ordering, position = json.loads(cursor.position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering != list(self.ordering) or not isinstance(position, list) or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor._replace(offset=0, position=position)
@@ -0,0 +1,237 @@
+# ecommerce_app/pedidos.py
+"""
+Pedidos con reserva de stock.
+
+Al crear un pedido, el stock de cada artículo se descuenta con un UPDATE
+condicional, sin leer el valor antes:
+
+    UPDATE articulo SET stock = stock - n WHERE id = ... AND stock >= n
+
+Si dos compradores piden las últimas unidades a la vez, la base de datos
+ordena los dos UPDATE sobre la misma fila: el segundo ya no cumple
+`stock >= n`, no actualiza nada y su pedido se rechaza. Solo se bloquean
+las filas de los artículos del pedido (nunca la tabla), y en un orden fijo
+(por id) para que dos pedidos con los mismos artículos no se interbloqueen.
+
+La reserva dura `RESERVA_STOCK_MINUTOS`. Un pedido confirmado conserva el
+stock descontado; uno cancelado o expirado lo devuelve con el UPDATE
+inverso. El cambio de estado también es condicional (WHERE estado =
+'reservado'), así el stock se devuelve una sola vez aunque el comprador
+cancele mientras expire_reservations procesa el mismo pedido.
+"""
+
+import operator
+from datetime import timedelta
+from decimal import Decimal
+from functools import reduce
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .cache import bump_version
+from .config import get_config
+from .listing import actualizar_listings
+from .models import Articulo, Pedido, PedidoItem
+
+
+class StockInsuficiente(Exception):
+    def __init__(self, disponibles):
+        # {articulo_id: unidades disponibles} de los artículos que no alcanzaron
+        super().__init__("Stock insuficiente para los artículos %s" % sorted(disponibles))
+        self.disponibles = disponibles
+
+
+class ReservaExpirada(Exception):
+    pass
+
+
+def stock_modificado(ids, bootstrap=False):
+    """
+    Los UPDATE de stock no disparan señales: el listado se actualiza aquí
+    (y con él el sello 'listado', porque el listado de la API muestra el stock).
+    El bootstrap (en cache) solo se invalida con `bootstrap=True`, cuando un
+    artículo destacado se agota o vuelve a tener stock: así una venta con
+    muchos pedidos no tira la cache del bootstrap en cada pedido. Entre medias
+    el `stock` de los destacados del bootstrap puede ir atrasado; la
+    disponibilidad no.
+    """
+    actualizar_listings(ids)
+    if bootstrap:
+        bump_version('bootstrap')
+
+
+def _destacados(filtro):
+    return Articulo.objects.filter(filtro, destacado=True, activo=True).exists()
+
+
+def reservar(cantidades, **datos_cliente):
+    """
+    Crea un pedido 'reservado' descontando el stock de `cantidades`
+    ({articulo_id: cantidad}). Lanza StockInsuficiente si algún artículo no
+    tiene unidades suficientes (o no está activo); en ese caso no se reserva nada.
+    Antes de rechazar, libera las reservas vencidas que retienen esos artículos.
+    """
+    try:
+        return _reservar(cantidades, datos_cliente)
+    except StockInsuficiente as exc:
+        if not expirar_reservas(articulos=exc.disponibles):
+            raise
+    return _reservar(cantidades, datos_cliente)
+
+
+def _reservar(cantidades, datos_cliente):
+    ahora = timezone.now()
+    with transaction.atomic():
+        faltantes = [
+            articulo_id for articulo_id in sorted(cantidades)
+            if not Articulo.objects.filter(pk=articulo_id, activo=True, stock__gte=cantidades[articulo_id])
+            .update(stock=F('stock') - cantidades[articulo_id], updated_at=ahora)
+        ]
+        if faltantes:
+            disponibles = dict(Articulo.objects.filter(pk__in=faltantes, activo=True).values_list('pk', 'stock'))
+            # La excepción deshace los UPDATE que sí se aplicaron
+            raise StockInsuficiente({pk: disponibles.get(pk, 0) for pk in faltantes})
+
+        articulos = Articulo.objects.only('nombre', 'sku', 'precio').in_bulk(list(cantidades))
+        items = [
+            PedidoItem(
+                articulo_id=pk, nombre=articulos[pk].nombre, sku=articulos[pk].sku or '',
+                precio_unitario=articulos[pk].precio, cantidad=cantidad,
+            )
+            for pk, cantidad in sorted(cantidades.items())
+        ]
+        pedido = Pedido.objects.create(
+            total=sum(item.subtotal for item in items),
+            reservado_hasta=ahora + timedelta(minutes=settings.RESERVA_STOCK_MINUTOS),
+            **datos_cliente,
+        )
+        for item in items:
+            item.pedido = pedido
+        PedidoItem.objects.bulk_create(items)
+        # Un destacado con stock 0 tras la reserva acaba de agotarse
+        agotados = _destacados(Q(pk__in=list(cantidades), stock=0))
+        transaction.on_commit(lambda: stock_modificado(list(cantidades), bootstrap=agotados))
+    return pedido
+
+
+def liberar(pedido, estado):
+    """
+    Pasa un pedido 'reservado' a `estado` ('cancelado' o 'expirado') y
+    devuelve su stock. Devuelve False si el pedido ya no estaba reservado.
+    """
+    ahora = timezone.now()
+    with transaction.atomic():
+        if not Pedido.objects.filter(pk=pedido.pk, estado='reservado').update(estado=estado, updated_at=ahora):
+            return False
+        items = list(PedidoItem.objects.filter(pedido=pedido, articulo__isnull=False).order_by('articulo_id')
+                     .values_list('articulo_id', 'cantidad'))
+        for articulo_id, cantidad in items:
+            Articulo.objects.filter(pk=articulo_id).update(stock=F('stock') + cantidad, updated_at=ahora)
+        # Stock igual a lo devuelto: el destacado estaba agotado y vuelve a estar disponible
+        repuestos = bool(items) and _destacados(
+            reduce(operator.or_, (Q(pk=articulo_id, stock=cantidad) for articulo_id, cantidad in items))
+        )
+        transaction.on_commit(lambda: stock_modificado([articulo_id for articulo_id, _ in items], bootstrap=repuestos))
+    pedido.estado = estado
+    return True
+
+
+def confirmar(pedido):
+    """
+    Confirma una reserva vigente (el stock queda descontado). Si ya venció,
+    la expira, devuelve el stock y lanza ReservaExpirada. Devuelve False si
+    el pedido no estaba reservado.
+    """
+    ahora = timezone.now()
+    confirmados = Pedido.objects.filter(pk=pedido.pk, estado='reservado', reservado_hasta__gt=ahora).update(
+        estado='confirmado', updated_at=ahora
+    )
+    if confirmados:
+        pedido.estado = 'confirmado'
+        return True
+    if liberar(pedido, 'expirado'):
+        raise ReservaExpirada(f"La reserva del pedido {pedido.codigo} venció")
+    return False
+
+
+def expirar_si_vencido(pedido):
+    if pedido.estado == 'reservado' and pedido.reservado_hasta <= timezone.now():
+        liberar(pedido, 'expirado')
+    return pedido
+
+
+def expirar_reservas(articulos=None, limite=None):
+    """
+    Expira las reservas vencidas (todas, o las que contienen alguno de
+    `articulos`) y devuelve cuántas se liberaron.
+    """
+    vencidos = Pedido.objects.filter(estado='reservado', reservado_hasta__lte=timezone.now())
+    if articulos is not None:
+        vencidos = vencidos.filter(items__articulo_id__in=list(articulos)).distinct()
+    liberados = 0
+    for pedido in vencidos.order_by('reservado_hasta').only('pk')[:limite]:
+        liberados += liberar(pedido, 'expirado')
+    return liberados
+
+
+def validar_carrito(items):
+    """
+    Precio y disponibilidad actuales de las líneas de un carrito con una sola
+    consulta (id__in). `items` son dicts con 'articulo', 'cantidad' y
+    opcionalmente 'precio' (el que el cliente tenía guardado). Los importes
+    se devuelven como texto, igual que los DecimalField de la API.
+    Varias líneas del mismo artículo comparten su stock (como al reservar,
+    que suma las cantidades por artículo): se reparte en orden de línea.
+    """
+    articulos = {
+        fila['id']: fila
+        for fila in Articulo.objects.filter(pk__in={item['articulo'] for item in items})
+        .values('id', 'nombre', 'precio', 'stock', 'activo')
+    }
+    restante = {pk: articulo['stock'] for pk, articulo in articulos.items()}
+    lineas, total, unidades = [], Decimal('0.00'), 0
+    for item in items:
+        articulo = articulos.get(item['articulo'])
+        if articulo is None or not articulo['activo']:
+            lineas.append({
+                'articulo': item['articulo'], 'cantidad': item['cantidad'], 'estado': 'no_disponible',
+                'disponible': False, 'cantidad_disponible': 0,
+            })
+            continue
+        cantidad_disponible = min(item['cantidad'], restante[articulo['id']])
+        restante[articulo['id']] -= cantidad_disponible
+        subtotal = articulo['precio'] * cantidad_disponible
+        if not articulo['stock']:
+            estado = 'agotado'
+        elif cantidad_disponible < item['cantidad']:
+            estado = 'stock_insuficiente'
+        elif item.get('precio') is not None and item['precio'] != articulo['precio']:
+            estado = 'precio_cambio'
+        else:
+            estado = 'ok'
+        lineas.append({
+            'articulo': articulo['id'],
+            'nombre': articulo['nombre'],
+            'precio': str(articulo['precio']),
+            'precio_anterior': str(item['precio']) if item.get('precio') is not None else None,
+            'cantidad': item['cantidad'],
+            'stock': articulo['stock'],
+            'disponible': cantidad_disponible == item['cantidad'],
+            'cantidad_disponible': cantidad_disponible,
+            'subtotal': str(subtotal),
+            'estado': estado,
+        })
+        total += subtotal
+        unidades += cantidad_disponible
+    envio_gratis_minimo = get_config('envio_gratis_minimo', cast=Decimal)
+    return {
+        'items': lineas,
+        'total': str(total),
+        'cantidad_total': unidades,
+        'valido': all(linea['estado'] == 'ok' for linea in lineas),
+        # Configurable desde el admin (Configuracion 'envio_gratis_minimo'); None si no está definido
+        'envio_gratis_minimo': str(envio_gratis_minimo) if envio_gratis_minimo is not None else None,
+        'envio_gratis': envio_gratis_minimo is not None and total >= envio_gratis_minimo,
+    }
@@ -0,0 +1,14 @@
+# ecommerce_app/permissions.py
+
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+
+class IsStaffOrReadOnly(BasePermission):
+    """
+    Lectura para todos; escritura solo para el personal (is_staff).
+    Evita que cualquiera modifique precio o stock a través de la API: el stock
+    de la tienda solo cambia con los pedidos (ver pedidos.py) o desde el admin.
+    """
+
+    def has_permission(self, request, view):
+        return request.method in SAFE_METHODS or bool(request.user and request.user.is_staff)
@@ -0,0 +1,164 @@
+# ecommerce_app/renditions.py
+"""
+Versiones redimensionadas (renditions) de las imágenes en WebP y AVIF.
+
+Cada imagen original genera variantes de tamaño fijo (thumb, card, detail,
+carousel) que se guardan en el almacenamiento por defecto con nombres
+basados en el hash del contenido:
+
+    renditions/ab/ab12...ef_card.webp
+
+Como el nombre depende solo del contenido, la misma foto subida en varios
+modelos comparte sus renditions, y las URLs se pueden construir (junto con
+el ancho de cada variante, a partir de las dimensiones guardadas en la base
+de datos) sin consultar el almacenamiento.
+
+AVIF es opcional: se usa si Pillow lo soporta (Pillow >= 11.3 o el plugin
+`pillow-avif-plugin`).
+"""
+
+import io
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image as PILImage, ImageOps
+
+from .models import Imagen, Articulo, CarouselSlide
+
+try:  # Plugin opcional para versiones de Pillow sin AVIF nativo
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+# nombre -> (ancho, alto, recortar). Sin recorte la imagen se ajusta dentro de la caja.
+RENDITIONS = {
+    'thumb': (150, 150, True),
+    'card': (480, 480, False),
+    'detail': (1200, 1200, False),
+    'carousel': (1920, 800, True),
+}
+
+CALIDAD = {'webp': 80, 'avif': 55}
+
+# Modelo -> campo de imagen -> renditions que se generan
+RENDITIONS_POR_CAMPO = {
+    Imagen: {'imagen': ('thumb', 'card', 'detail')},
+    Articulo: {'imagen_principal': ('thumb', 'card', 'detail')},
+    CarouselSlide: {'imagen': ('thumb', 'carousel')},
+}
+
+RUTA_BASE = 'renditions'
+
+
+def formatos_disponibles():
+    PILImage.init()
+    formatos = ['webp']
+    if 'AVIF' in PILImage.SAVE:
+        formatos.append('avif')
+    return formatos
+
+
+def ruta_rendition(sha256, nombre, formato):
+    return f'{RUTA_BASE}/{sha256[:2]}/{sha256}_{nombre}.{formato}'
+
+
+def dimensiones_rendition(nombre, ancho, alto):
+    """Tamaño final de la variante a partir del tamaño del original (sin ampliar)."""
+    max_ancho, max_alto, recortar = RENDITIONS[nombre]
+    if recortar:
+        return max_ancho, max_alto
+    if not ancho or not alto:
+        return max_ancho, max_alto
+    escala = min(max_ancho / ancho, max_alto / alto, 1)
+    return max(1, round(ancho * escala)), max(1, round(alto * escala))
+
+
+def generar_renditions(fieldfile, sha256, nombres):
+    """
+    Genera las variantes que falten para un archivo de imagen. Abre el
+    original una sola vez; las variantes ya existentes (mismo hash) se omiten.
+    Devuelve la lista de rutas creadas.
+    """
+    pendientes = [
+        (nombre, formato) for nombre in nombres for formato in formatos_disponibles()
+        if not default_storage.exists(ruta_rendition(sha256, nombre, formato))
+    ]
+    if not pendientes:
+        return []
+
+    creadas = []
+    fieldfile.open('rb')
+    try:
+        with PILImage.open(fieldfile) as original:
+            original = ImageOps.exif_transpose(original)
+            if original.mode not in ('RGB', 'RGBA'):
+                original = original.convert('RGBA' if 'A' in original.getbands() else 'RGB')
+            for nombre, formato in pendientes:
+                ancho, alto, recortar = RENDITIONS[nombre]
+                if recortar:
+                    variante = ImageOps.fit(original, (ancho, alto), PILImage.LANCZOS)
+                else:
+                    variante = original.copy()
+                    variante.thumbnail((ancho, alto), PILImage.LANCZOS)
+                buffer = io.BytesIO()
+                variante.save(buffer, format=formato.upper(), quality=CALIDAD[formato])
+                ruta = ruta_rendition(sha256, nombre, formato)
+                creadas.append(default_storage.save(ruta, ContentFile(buffer.getvalue())))
+    finally:
+        fieldfile.close()
+    return creadas
+
+
+def generar_renditions_instancia(instance, campos=None):
+    """Genera las renditions de los campos de imagen (todos o los indicados) de `instance`."""
+    creadas = []
+    for campo, nombres in RENDITIONS_POR_CAMPO.get(type(instance), {}).items():
+        if campos is not None and campo not in campos:
+            continue
+        fieldfile = getattr(instance, campo)
+        sha256 = getattr(instance, f'{campo}_sha256')
+        if fieldfile and sha256:
+            creadas += generar_renditions(fieldfile, sha256, nombres)
+    return creadas
+
+
+def rendition_lista(instance, campo):
+    """
+    True si las renditions del campo ya existen. El worker guarda el hash
+    después de generarlas; en Imagen además se exige estado 'listo'.
+    """
+    if not getattr(instance, campo) or not getattr(instance, f'{campo}_sha256', ''):
+        return False
+    return getattr(instance, 'estado_procesamiento', 'listo') == 'listo'
+
+
+def renditions_de(instance, campo, request=None):
+    """
+    Descripción de las variantes de un campo de imagen para la API, sin tocar
+    el almacenamiento. Ejemplo:
+        {'card': {'width': 480, 'height': 320, 'webp': url, 'avif': url}, ...,
+         'srcset': {'webp': 'url 480w, url 1200w', 'avif': ...}}
+    Devuelve None mientras el worker no haya procesado la imagen.
+    """
+    if not rendition_lista(instance, campo):
+        return None
+    sha256 = getattr(instance, f'{campo}_sha256')
+    ancho = getattr(instance, f'{campo}_ancho')
+    alto = getattr(instance, f'{campo}_alto')
+    formatos = formatos_disponibles()
+
+    def url(ruta):
+        ruta = default_storage.url(ruta)
+        return request.build_absolute_uri(ruta) if request is not None else ruta
+
+    data = {}
+    srcset = {formato: [] for formato in formatos}
+    for nombre in RENDITIONS_POR_CAMPO[type(instance)][campo]:
+        w, h = dimensiones_rendition(nombre, ancho, alto)
+        data[nombre] = {'width': w, 'height': h}
+        for formato in formatos:
+            data[nombre][formato] = url(ruta_rendition(sha256, nombre, formato))
+            if not RENDITIONS[nombre][2]:  # Solo variantes sin recorte (misma proporción)
+                srcset[formato].append(f"{data[nombre][formato]} {w}w")
+    data['srcset'] = {formato: ', '.join(partes) for formato, partes in srcset.items() if partes}
+    return data
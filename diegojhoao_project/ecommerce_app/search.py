@@ -0,0 +1,170 @@
+# ecommerce_app/search.py
+"""
+Búsqueda de texto completo para artículos.
+
+- SQLite (desarrollo / despliegues de un solo nodo): tabla virtual FTS5
+  `ecommerce_app_articulo_fts` con el tokenizador `unicode61 remove_diacritics 2`
+  (ignora tildes: "algodon" encuentra "Algodón").
+- PostgreSQL: columna `search_vector` (tsvector) con índice GIN y la
+  configuración `ecommerce_es` (spanish + unaccent).
+
+Ambos índices se crean en la migración 0004 y se mantienen sincronizados
+desde las señales de `Articulo` (ver signals.py). Para reconstruirlos por
+completo: `python manage.py rebuild_search_index`.
+"""
+
+import re
+
+from django.db import connection, connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+FTS_TABLE = 'ecommerce_app_articulo_fts'
+PG_TS_CONFIG = 'ecommerce_es'
+# Pesos del ranking: el nombre pesa más que la descripción
+PESO_NOMBRE = 10.0
+PESO_DESCRIPCION = 1.0
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(term):
+    """Extrae las palabras de la búsqueda descartando la sintaxis de consulta."""
+    return _TOKEN_RE.findall(term or '')[:10]
+
+
+def _fts5_query(tokens):
+    # Cada palabra entre comillas (literal) y con '*' para buscar por prefijo
+    return ' '.join('"%s"*' % token for token in tokens)
+
+
+def _tsquery(tokens):
+    return ' & '.join('%s:*' % token for token in tokens)
+
+
+def search_articulos(queryset, term):
+    """
+    Filtra `queryset` a los artículos que coinciden con `term` y lo anota con
+    `search_rank` (mayor = más relevante). Devuelve el queryset sin cambios si
+    la búsqueda no tiene palabras útiles.
+    """
+    tokens = tokenize(term)
+    if not tokens:
+        return queryset
+
+    table = queryset.model._meta.db_table
+    if connection.vendor == 'postgresql':
+        query = _tsquery(tokens)
+        matches = RawSQL(
+            f"SELECT id FROM {table} WHERE search_vector @@ to_tsquery(%s, %s)",
+            (PG_TS_CONFIG, query),
+        )
+        rank = RawSQL(
+            f"ts_rank({table}.search_vector, to_tsquery(%s, %s))",
+            (PG_TS_CONFIG, query),
+            output_field=FloatField(),
+        )
+    elif connection.vendor == 'sqlite':
+        query = _fts5_query(tokens)
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (query,))
+        # bm25() es "menor = mejor"; se invierte el signo para ordenar igual que ts_rank
+        rank = RawSQL(
+            f"(SELECT -bm25({FTS_TABLE}, {PESO_NOMBRE}, {PESO_DESCRIPCION}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {table}.id)",
+            (query,),
+            output_field=FloatField(),
+        )
+    else:
+        # Motor sin índice de texto: búsqueda simple sin ranking
+        condition = Q()
+        for token in tokens:
+            condition &= Q(nombre__icontains=token) | Q(descripcion__icontains=token)
+        return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    return queryset.filter(id__in=matches).annotate(search_rank=rank)
+
+
+def index_articulo(articulo):
+    """Inserta o actualiza un artículo en el índice de búsqueda."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                f"UPDATE {articulo._meta.db_table} SET search_vector = "
+                "setweight(to_tsvector(%s, coalesce(nombre, '')), 'A') || "
+                "setweight(to_tsvector(%s, coalesce(descripcion, '')), 'B') "
+                "WHERE id = %s",
+                [PG_TS_CONFIG, PG_TS_CONFIG, articulo.pk],
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [articulo.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, nombre, descripcion) VALUES (%s, %s, %s)",
+                [articulo.pk, articulo.nombre, articulo.descripcion or ''],
+            )
+
+
+def index_articulos(ids, chunk_size=500):
+    """Versión por lotes de index_articulo: una sentencia por bloque de ids (importaciones masivas)."""
+    ids = list(ids)
+    table = 'ecommerce_app_articulo'
+    with connection.cursor() as cursor:
+        for inicio in range(0, len(ids), chunk_size):
+            bloque = ids[inicio:inicio + chunk_size]
+            marcas = ', '.join(['%s'] * len(bloque))
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    f"UPDATE {table} SET search_vector = "
+                    "setweight(to_tsvector(%s, coalesce(nombre, '')), 'A') || "
+                    "setweight(to_tsvector(%s, coalesce(descripcion, '')), 'B') "
+                    f"WHERE id IN ({marcas})",
+                    [PG_TS_CONFIG, PG_TS_CONFIG, *bloque],
+                )
+            elif connection.vendor == 'sqlite':
+                cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marcas})", bloque)
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, nombre, descripcion) "
+                    f"SELECT id, nombre, coalesce(descripcion, '') FROM {table} WHERE id IN ({marcas})",
+                    bloque,
+                )
+
+
+def remove_articulo(pk):
+    """Elimina un artículo del índice (en PostgreSQL la fila ya no existe)."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild_index(using='default'):
+    """Reconstruye el índice completo a partir de la tabla de artículos."""
+    conn = connections[using]
+    table = 'ecommerce_app_articulo'
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            cursor.execute(
+                f"UPDATE {table} SET search_vector = "
+                "setweight(to_tsvector(%s, coalesce(nombre, '')), 'A') || "
+                "setweight(to_tsvector(%s, coalesce(descripcion, '')), 'B')",
+                [PG_TS_CONFIG, PG_TS_CONFIG],
+            )
+        elif conn.vendor == 'sqlite':
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, nombre, descripcion) "
+                f"SELECT id, nombre, coalesce(descripcion, '') FROM {table}"
+            )
+
+
+class ArticuloSearchFilter(BaseFilterBackend):
+    """
+    Filtro DRF para `?search=`: usa el índice de texto completo y anota
+    `search_rank` para poder ordenar por relevancia.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+        return search_articulos(queryset, term)
@@ -1,9 +1,32 @@
 # ecommerce_app/serializers.py
 
+from itertools import groupby
+
 from rest_framework import serializers
-from .models import Categoria, Articulo, Imagen, ArticuloImagen, Filtro, FiltroValor, Carousel, CarouselSlide, NavigationLink, ContentBlock # Nuevos modelos
+from .models import Categoria, Articulo, Imagen, ArticuloImagen, ArticuloFiltroValor, Filtro, FiltroValor, Carousel, CarouselSlide, NavigationLink, ContentBlock, Pedido, PedidoItem # Nuevos modelos
+from .renditions import renditions_de
  # Importa tus modelos
 
+# Orden de la galería: la marcada como principal primero y luego por 'orden'
+ORDEN_GALERIA = ('-es_principal', 'orden', 'pk')
+
+
+def filtros_aplicados_queryset():
+    """Valores de filtro aplicados a artículos, solo los activos (y de filtros activos)."""
+    return (
+        ArticuloFiltroValor.objects.filter(filtro_valor__activo=True, filtro_valor__filtro__activo=True)
+        .select_related('filtro_valor__filtro')
+        .order_by('filtro_valor__filtro__nombre', 'filtro_valor__valor')
+    )
+
+
+def campos_pedidos(request):
+    """Campos pedidos con ?fields=id,nombre,precio (sparse fieldsets), o None si no se indicaron."""
+    valor = request.query_params.get('fields') if request is not None else None
+    if not valor:
+        return None
+    return {campo.strip() for campo in valor.split(',') if campo.strip()}
+
 class CategoriaSerializer(serializers.ModelSerializer):
     class Meta:
         model = Categoria
@@ -11,14 +34,36 @@ class CategoriaSerializer(serializers.ModelSerializer):
         # Si quieres que el slug sea solo de lectura en la API (ya que se autogenera):
         # read_only_fields = ['slug', 'created_at', 'updated_at']
 
+class ArticuloImagenSerializer(serializers.ModelSerializer):
+    """Imagen de la galería de un artículo (con los datos de la Imagen del banco)."""
+    imagen = serializers.ImageField(source='imagen.imagen', read_only=True)
+    alt_text = serializers.CharField(source='imagen.alt_text', read_only=True)
+    ancho = serializers.IntegerField(source='imagen.imagen_ancho', read_only=True)
+    alto = serializers.IntegerField(source='imagen.imagen_alto', read_only=True)
+    renditions = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArticuloImagen
+        fields = ['id', 'imagen', 'alt_text', 'ancho', 'alto', 'orden', 'es_principal', 'renditions']
+
+    def get_renditions(self, obj):
+        return renditions_de(obj.imagen, 'imagen', self.context.get('request'))
+
 # NUEVO: ArticuloSerializer
 class ArticuloSerializer(serializers.ModelSerializer):
     # Para mostrar el nombre de la categoría en lugar de solo su ID al LEER datos.
     # Para ESCRIBIR datos (crear/actualizar artículo), el cliente enviará el ID de la categoría.
     categoria_nombre = serializers.CharField(source='categoria.nombre', read_only=True)
+    categoria_slug = serializers.CharField(source='categoria.slug', read_only=True)
     # El campo 'categoria' se usará para las operaciones de escritura (asignar por ID)
     # y por defecto mostrará el ID en la representación si no se especifica lo contrario
     # o si no se usa un serializer anidado para lectura.
+    # Variantes WebP/AVIF de la imagen principal con sus URLs y 'srcset' (ver renditions.py)
+    imagen_principal_renditions = serializers.SerializerMethodField()
+    # Galería ordenada y valores de filtro activos agrupados por filtro (ej: Color: [Rojo, Azul]).
+    # listing.py los precarga con Prefetch(to_attr=...) en 'galeria_ordenada' y 'filtros_listado'
+    imagenes_galeria = serializers.SerializerMethodField()
+    filtros_aplicados = serializers.SerializerMethodField()
 
     class Meta:
         model = Articulo
@@ -26,6 +71,7 @@ class ArticuloSerializer(serializers.ModelSerializer):
             'id',
             'categoria', # Para escritura (se espera un ID de categoría)
             'categoria_nombre', # Para lectura (muestra el nombre de la categoría)
+            'categoria_slug',
             'nombre',
             'descripcion',
             'precio',
@@ -34,11 +80,13 @@ class ArticuloSerializer(serializers.ModelSerializer):
             'activo',
             'destacado',
             'imagen_principal', # ImageField se manejará bien por defecto
-            # Más adelante podemos añadir 'imagenes_galeria' y 'filtros_aplicados'
+            'imagen_principal_renditions',
+            'imagenes_galeria',
+            'filtros_aplicados',
             'created_at',
             'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'categoria_nombre']
+        read_only_fields = ['created_at', 'updated_at', 'categoria_nombre', 'categoria_slug']
 
         # Opcional: Para que el campo 'categoria' (ID) solo se use para escribir,
         # y el objeto completo de categoría (usando CategoriaSerializer) se muestre al leer:
@@ -50,24 +98,161 @@ class ArticuloSerializer(serializers.ModelSerializer):
         # La combinación de 'categoria' (para el ID de escritura) y 'categoria_nombre' (para el nombre de lectura)
         # es un enfoque común y simple para empezar.
 
+    def galeria(self, obj):
+        galeria = getattr(obj, 'galeria_ordenada', None)
+        if galeria is None:
+            galeria = obj.galeria_ordenada = list(
+                ArticuloImagen.objects.filter(articulo=obj).select_related('imagen').order_by(*ORDEN_GALERIA)
+            )
+        return galeria
+
+    def get_imagen_principal_renditions(self, obj):
+        request = self.context.get('request')
+        if obj.imagen_principal:
+            return renditions_de(obj, 'imagen_principal', request)
+        # Sin imagen principal: la primera imagen de la galería (es_principal y luego orden)
+        galeria = self.galeria(obj)
+        return renditions_de(galeria[0].imagen, 'imagen', request) if galeria else None
+
+    def get_imagenes_galeria(self, obj):
+        return ArticuloImagenSerializer(self.galeria(obj), many=True, context=self.context).data
+
+    def get_filtros_aplicados(self, obj):
+        aplicados = getattr(obj, 'filtros_listado', None)
+        if aplicados is None:
+            aplicados = filtros_aplicados_queryset().filter(articulo=obj)
+        # Vienen ordenados por nombre del filtro y valor: groupby los agrupa en una pasada
+        return [
+            {
+                'id': filtro.id,
+                'nombre': filtro.nombre,
+                'valores': [{'id': valor.id, 'valor': valor.valor, 'color_hex': valor.color_hex} for valor in valores],
+            }
+            for filtro, valores in groupby((a.filtro_valor for a in aplicados), key=lambda valor: valor.filtro)
+        ]
+
+
+# Claves cuyo valor (o todo lo que contienen) son URLs de archivos
+CLAVES_URL = ('imagen_principal', 'imagen')
+
+
+def absolutizar_urls(datos, request):
+    """
+    Las filas de ArticuloListing guardan URLs relativas (se generan sin
+    request); aquí se les añade el host de la petición, igual que haría
+    ArticuloSerializer con el request en el contexto. Recorre también las
+    renditions (incluidos los 'srcset') y las imágenes de la galería.
+    """
+    if request is None:
+        return datos
+    host = request.build_absolute_uri('/').rstrip('/')
+
+    def url(valor):
+        return host + valor if valor.startswith('/') else valor
+
+    def recorrer(valor, es_url=False):
+        if isinstance(valor, dict):
+            return {
+                clave: recorrer(v, es_url or clave in CLAVES_URL or clave.endswith('renditions'))
+                for clave, v in valor.items()
+            }
+        if isinstance(valor, list):
+            return [recorrer(v, es_url) for v in valor]
+        if es_url and isinstance(valor, str):
+            return ', '.join(url(parte) for parte in valor.split(', '))  # 'srcset': "url 480w, url 1200w"
+        return valor
+
+    return recorrer(datos)
+
+
+def _datos_listing(articulo):
+    try:
+        return articulo.listing.datos
+    except Articulo.listing.RelatedObjectDoesNotExist:
+        return None
+
+
+def serializar_sin_listing(ids, context):
+    """
+    Representación de los artículos `ids` que aún no tienen fila en
+    ArticuloListing. Se recargan completos (el queryset de la vista solo trae
+    las columnas del listado) con sus relaciones precargadas: 3 consultas
+    por lote en vez de varias por artículo.
+    """
+    from .listing import articulos_con_relaciones  # listing.py importa este módulo
+    return {datos['id']: datos for datos in ArticuloSerializer(articulos_con_relaciones(ids), many=True, context=context).data}
+
+
+class ArticuloListadoListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        articulos = list(data.all() if hasattr(data, 'all') else data)
+        faltantes = [articulo.pk for articulo in articulos if _datos_listing(articulo) is None]
+        self.child.sin_listing = serializar_sin_listing(faltantes, self.context) if faltantes else {}
+        return [self.child.to_representation(articulo) for articulo in articulos]
+
+
+class ArticuloListadoSerializer(serializers.BaseSerializer):
+    """
+    Solo lectura: devuelve la representación ya calculada en ArticuloListing
+    (misma forma que ArticuloSerializer) sin recorrer relaciones. El queryset
+    debe traer 'listing' con select_related.
+
+    Los listados omiten `CAMPOS_SOLO_DETALLE` salvo que se pidan con
+    ?fields=; con ?fields= solo se devuelven los campos indicados.
+    """
+    CAMPOS_SOLO_DETALLE = ('imagenes_galeria',)
+    sin_listing = {}  # Artículos sin fila, ya serializados por ArticuloListadoListSerializer
+
+    class Meta:
+        list_serializer_class = ArticuloListadoListSerializer
+
+    def to_representation(self, instance):
+        request = self.context.get('request')
+        datos = _datos_listing(instance)
+        if datos is None:
+            # Aún sin fila materializada (ej: antes de rebuild_listings): se serializa en el momento
+            datos = self.sin_listing.get(instance.pk) or serializar_sin_listing([instance.pk], self.context)[instance.pk]
+        campos = campos_pedidos(request)
+        if campos is None and not self.context.get('detalle'):
+            campos = set(datos) - set(self.CAMPOS_SOLO_DETALLE)
+        if campos is not None:
+            datos = {clave: valor for clave, valor in datos.items() if clave in campos}
+        return absolutizar_urls(datos, request)
+
+# --- FILTROS (para la barra lateral de la tienda) ---
+
+class FiltroValorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FiltroValor
+        fields = ['id', 'valor', 'color_hex']
+
+class FiltroSerializer(serializers.ModelSerializer):
+    # La vista precarga solo los valores activos en 'valores_activos'
+    valores = FiltroValorSerializer(source='valores_activos', many=True, read_only=True)
+
+    class Meta:
+        model = Filtro
+        fields = ['id', 'nombre', 'valores']
+
 # --- NUEVOS SERIALIZERS ---
 
 class CarouselSlideSerializer(serializers.ModelSerializer):
+    imagen_renditions = serializers.SerializerMethodField()
+
     class Meta:
         model = CarouselSlide
-        fields = ['id', 'imagen', 'titulo', 'subtitulo', 'enlace_url', 'orden', 'activo']
+        fields = ['id', 'imagen', 'imagen_renditions', 'titulo', 'subtitulo', 'enlace_url', 'orden', 'activo']
+
+    def get_imagen_renditions(self, obj):
+        return renditions_de(obj, 'imagen', self.context.get('request'))
 
 class CarouselSerializer(serializers.ModelSerializer):
-    slides = CarouselSlideSerializer(many=True, read_only=True) # Anida los slides activos
+    # Solo slides activos y ordenados: la vista los precarga en 'slides_activos'
+    slides = CarouselSlideSerializer(source='slides_activos', many=True, read_only=True)
 
     class Meta:
         model = Carousel
         fields = ['id', 'nombre', 'activo', 'slides']
-    
-    def get_slides(self, obj):
-        # Opcional: Si solo quieres slides activos en la API
-        active_slides = obj.slides.filter(activo=True).order_by('orden')
-        return CarouselSlideSerializer(active_slides, many=True).data
 
 class NavigationLinkSerializer(serializers.ModelSerializer):
     class Meta:
@@ -78,3 +263,44 @@ class ContentBlockSerializer(serializers.ModelSerializer):
     class Meta:
         model = ContentBlock
         fields = ['id', 'identificador', 'titulo', 'contenido_html', 'imagen_asociada', 'enlace_url', 'activo']
+
+# --- PEDIDOS (ver pedidos.py) ---
+
+class PedidoItemEntradaSerializer(serializers.Serializer):
+    articulo = serializers.IntegerField(min_value=1)
+    cantidad = serializers.IntegerField(min_value=1, max_value=1000)
+
+class PedidoCrearSerializer(serializers.Serializer):
+    items = PedidoItemEntradaSerializer(many=True, allow_empty=False, max_length=200)
+    nombre_cliente = serializers.CharField(max_length=200, required=False, allow_blank=True)
+    email = serializers.EmailField(required=False, allow_blank=True)
+    telefono = serializers.CharField(max_length=30, required=False, allow_blank=True)
+
+    def validate_items(self, items):
+        # El mismo artículo en varias líneas se suma: {articulo_id: cantidad}
+        cantidades = {}
+        for item in items:
+            cantidades[item['articulo']] = cantidades.get(item['articulo'], 0) + item['cantidad']
+        return cantidades
+
+class CarritoItemSerializer(PedidoItemEntradaSerializer):
+    # Precio que el cliente tiene guardado (opcional): si cambió, la línea se marca
+    precio = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+
+class CarritoValidarSerializer(serializers.Serializer):
+    items = CarritoItemSerializer(many=True, max_length=500)
+
+class PedidoItemSerializer(serializers.ModelSerializer):
+    subtotal = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = PedidoItem
+        fields = ['articulo', 'nombre', 'sku', 'precio_unitario', 'cantidad', 'subtotal']
+
+class PedidoSerializer(serializers.ModelSerializer):
+    items = PedidoItemSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Pedido
+        fields = ['codigo', 'estado', 'nombre_cliente', 'email', 'telefono', 'items', 'total', 'reservado_hasta', 'created_at']
+        read_only_fields = fields
@@ -0,0 +1,259 @@
+# ecommerce_app/signals.py
+
+import threading
+from contextlib import contextmanager
+
+from django.core.signals import request_started, request_finished
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    Imagen, Articulo, ArticuloImagen, ArticuloFiltroValor, Categoria, Filtro, FiltroValor,
+    Carousel, CarouselSlide, NavigationLink, ContentBlock, Configuracion, Pedido,
+)
+from . import search
+from .listing import actualizar_listings
+from .bitmap import filtro_index
+from .cache import bump_version, inicio_peticion, fin_peticion
+from .config import config_snapshot
+from .jobs import preparar_imagenes, encolar
+from .pedidos import liberar
+from .blobs import nombres_guardados, nombres_actuales, actualizar_referencias, liberar_referencias
+
+
+# Escrituras masivas (catalog.py) que ya actualizan listado e índices por lote
+_masiva = threading.local()
+
+
+@contextmanager
+def escritura_masiva():
+    """Dentro del bloque, los receptores por fila de ArticuloFiltroValor no hacen nada."""
+    _masiva.activa = True
+    try:
+        yield
+    finally:
+        _masiva.activa = False
+
+
+def _en_escritura_masiva():
+    return getattr(_masiva, 'activa', False)
+
+
+# --- Índice de búsqueda de texto completo ---
+
+@receiver(post_save, sender=Articulo)
+def actualizar_indice_busqueda(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata: el índice se reconstruye con rebuild_search_index
+        return
+    search.index_articulo(instance)
+
+
+@receiver(post_delete, sender=Articulo)
+def eliminar_de_indice_busqueda(sender, instance, **kwargs):
+    search.remove_articulo(instance.pk)
+
+
+# --- Modelo de lectura del listado (ArticuloListing, ver listing.py) ---
+
+def _actualizar_listings_al_confirmar(ids):
+    ids = list(ids)
+    if ids:
+        transaction.on_commit(lambda: actualizar_listings(ids))
+
+
+@receiver(post_save, sender=Articulo)
+def actualizar_listing_articulo(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata: python manage.py rebuild_listings
+        return
+    # Síncrono, como el índice de búsqueda: la respuesta del guardado ya ve la fila nueva
+    actualizar_listings([instance.pk])
+
+
+@receiver(post_delete, sender=Articulo)
+def invalidar_listado_articulo_borrado(sender, instance, **kwargs):
+    # La fila de listado se borra en cascada, sin pasar por actualizar_listings
+    transaction.on_commit(lambda: bump_version('listado'))
+
+
+@receiver([post_save, post_delete], sender=ArticuloImagen)
+@receiver([post_save, post_delete], sender=ArticuloFiltroValor)
+def actualizar_listing_relacion(sender, instance, raw=False, **kwargs):
+    if not raw and not _en_escritura_masiva():
+        _actualizar_listings_al_confirmar([instance.articulo_id])
+
+
+@receiver(post_save, sender=Imagen)
+def actualizar_listing_imagen(sender, instance, raw=False, created=False, **kwargs):
+    # El worker guarda la Imagen al terminar: sus renditions ya se pueden mostrar
+    if not raw and not created:
+        _actualizar_listings_al_confirmar(
+            ArticuloImagen.objects.filter(imagen=instance).values_list('articulo_id', flat=True).distinct()
+        )
+
+
+@receiver(post_save, sender=Categoria)
+def actualizar_listing_categoria(sender, instance, raw=False, created=False, **kwargs):
+    if not raw and not created:
+        _actualizar_listings_al_confirmar(instance.articulos.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Categoria)
+def recordar_articulos_categoria(sender, instance, **kwargs):
+    # SET_NULL usa un UPDATE sin señales: se guardan los ids antes de borrar
+    instance._articulos_listing = list(instance.articulos.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Categoria)
+def actualizar_listing_categoria_borrada(sender, instance, **kwargs):
+    _actualizar_listings_al_confirmar(getattr(instance, '_articulos_listing', []))
+
+
+@receiver(post_save, sender=FiltroValor)
+def actualizar_listing_filtro_valor(sender, instance, raw=False, created=False, **kwargs):
+    if not raw and not created:
+        _actualizar_listings_al_confirmar(
+            ArticuloFiltroValor.objects.filter(filtro_valor=instance).values_list('articulo_id', flat=True)
+        )
+
+
+@receiver(post_save, sender=Filtro)
+def actualizar_listing_filtro(sender, instance, raw=False, created=False, **kwargs):
+    if not raw and not created:
+        _actualizar_listings_al_confirmar(
+            ArticuloFiltroValor.objects.filter(filtro_valor__filtro=instance)
+            .values_list('articulo_id', flat=True).distinct()
+        )
+
+
+# --- Índice de bitmaps de filtros (se aplica al confirmar la transacción) ---
+
+@receiver(post_save, sender=ArticuloFiltroValor)
+def actualizar_bitmap_filtros(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(lambda: filtro_index.add(instance.filtro_valor_id, instance.articulo_id))
+    else:
+        # Una edición puede haber cambiado el valor o el artículo: reconstrucción completa
+        transaction.on_commit(filtro_index.invalidate)
+
+
+@receiver(post_delete, sender=ArticuloFiltroValor)
+def quitar_de_bitmap_filtros(sender, instance, **kwargs):
+    if not _en_escritura_masiva():
+        transaction.on_commit(lambda: filtro_index.remove(instance.filtro_valor_id, instance.articulo_id))
+
+
+# --- Cache del bootstrap de la tienda (/api/bootstrap/) ---
+
+@receiver([post_save, post_delete], sender=Categoria)
+@receiver([post_save, post_delete], sender=Articulo)
+@receiver([post_save, post_delete], sender=Carousel)
+@receiver([post_save, post_delete], sender=CarouselSlide)
+@receiver([post_save, post_delete], sender=NavigationLink)
+@receiver([post_save, post_delete], sender=ContentBlock)
+def invalidar_bootstrap(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version('bootstrap'))
+
+
+# --- Cache de respuestas de los endpoints de contenido (VersionedCacheMixin) ---
+
+@receiver([post_save, post_delete], sender=Carousel)
+@receiver([post_save, post_delete], sender=CarouselSlide)
+def invalidar_cache_carousels(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version('carousel'))
+
+
+@receiver([post_save, post_delete], sender=NavigationLink)
+def invalidar_cache_navigation_links(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version('navigationlink'))
+
+
+@receiver([post_save, post_delete], sender=ContentBlock)
+def invalidar_cache_content_blocks(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version('contentblock'))
+
+
+# --- Sellos de versión: una lectura de la tabla por petición (ver cache.py) ---
+
+request_started.connect(inicio_peticion, dispatch_uid='sellos_inicio_peticion')
+request_finished.connect(fin_peticion, dispatch_uid='sellos_fin_peticion')
+
+
+# --- Copia en memoria de Configuracion (get_config, ver config.py) ---
+
+@receiver([post_save, post_delete], sender=Configuracion)
+def invalidar_configuracion(sender, **kwargs):
+    transaction.on_commit(config_snapshot.invalidate)
+
+
+@receiver(request_started)
+def revisar_configuracion(sender, **kwargs):
+    config_snapshot.nueva_peticion()
+
+
+# --- Pedidos: borrar una reserva vigente devuelve su stock (admin, shell, etc.) ---
+
+@receiver(pre_delete, sender=Pedido)
+def liberar_stock_al_borrar(sender, instance, **kwargs):
+    # pre_delete: los PedidoItem aún existen (se borran en cascada después)
+    if instance.estado == 'reservado':
+        liberar(instance, 'cancelado')
+
+
+# --- Procesamiento de imágenes en segundo plano (ver jobs.py) ---
+
+@receiver(pre_save, sender=Imagen)
+@receiver(pre_save, sender=Articulo)
+@receiver(pre_save, sender=Categoria)
+@receiver(pre_save, sender=CarouselSlide)
+def preparar_imagenes_nuevas(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Solo marca las imágenes nuevas; hash, EXIF, dimensiones y renditions los hace el worker
+    instance._imagenes_nuevas = preparar_imagenes(instance)
+
+
+@receiver(post_save, sender=Imagen)
+@receiver(post_save, sender=Articulo)
+@receiver(post_save, sender=Categoria)
+@receiver(post_save, sender=CarouselSlide)
+def encolar_procesamiento_imagenes(sender, instance, raw=False, **kwargs):
+    campos = getattr(instance, '_imagenes_nuevas', None)
+    if raw or not campos:
+        return
+    transaction.on_commit(lambda: encolar(instance, campos))
+
+
+# --- Referencias a los blobs de imagen deduplicados (ver blobs.py) ---
+
+@receiver(pre_save, sender=Imagen)
+@receiver(pre_save, sender=Articulo)
+@receiver(pre_save, sender=Categoria)
+@receiver(pre_save, sender=CarouselSlide)
+@receiver(pre_save, sender=ContentBlock)
+def recordar_blobs_anteriores(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:  # loaddata: collect_image_blobs recalcula los contadores
+        return
+    instance._blobs_anteriores = nombres_guardados(instance, update_fields)
+
+
+@receiver(post_save, sender=Imagen)
+@receiver(post_save, sender=Articulo)
+@receiver(post_save, sender=Categoria)
+@receiver(post_save, sender=CarouselSlide)
+@receiver(post_save, sender=ContentBlock)
+def actualizar_referencias_blobs(sender, instance, raw=False, update_fields=None, **kwargs):
+    anteriores = getattr(instance, '_blobs_anteriores', None)
+    if raw or anteriores is None:
+        return
+    actualizar_referencias(anteriores, nombres_actuales(instance, update_fields))
+    del instance._blobs_anteriores
+
+
+@receiver(post_delete, sender=Imagen)
+@receiver(post_delete, sender=Articulo)
+@receiver(post_delete, sender=Categoria)
+@receiver(post_delete, sender=CarouselSlide)
+@receiver(post_delete, sender=ContentBlock)
+def liberar_referencias_blobs(sender, instance, **kwargs):
+    liberar_referencias(instance)
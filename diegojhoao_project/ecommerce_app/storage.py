@@ -0,0 +1,83 @@
+# ecommerce_app/storage.py
+"""
+Almacenamiento direccionado por contenido para las imágenes subidas.
+
+Cada archivo se guarda una sola vez bajo un nombre derivado de su SHA-256:
+
+    blobs/ab/ab12...ef.jpg
+
+El hash se calcula mientras el archivo se escribe (una sola pasada); si el
+blob ya existía, la copia temporal se descarta y el modelo apunta al
+existente. Las referencias y la limpieza de blobs huérfanos están en blobs.py.
+
+No importa modelos: models.py lo usa en el `storage=` de los ImageField.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+CHUNK_SIZE = 64 * 1024
+PREFIJO_BLOBS = 'blobs'
+
+_BLOB_RE = re.compile(r'^%s/[0-9a-f]{2}/([0-9a-f]{64})(\.\w+)?$' % PREFIJO_BLOBS)
+
+
+def ruta_blob(sha256, extension=''):
+    return f'{PREFIJO_BLOBS}/{sha256[:2]}/{sha256}{extension}'
+
+
+def sha_de_blob(nombre):
+    """SHA-256 de un nombre de blob, o None si el archivo no está en el almacén de blobs."""
+    match = _BLOB_RE.match(nombre or '')
+    return match.group(1) if match else None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage que ignora `upload_to` (salvo la extensión) y deduplica por contenido."""
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        extension = os.path.splitext(name)[1].lower()
+
+        # Temporal en el mismo sistema de archivos para que os.replace sea atómico
+        directorio = self.path(PREFIJO_BLOBS)
+        os.makedirs(directorio, exist_ok=True)
+        fd, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as destino:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    digest.update(chunk)
+                    destino.write(chunk)
+            nombre = ruta_blob(digest.hexdigest(), extension)
+            ruta = self.path(nombre)
+            if os.path.exists(ruta):
+                os.remove(temporal)  # Mismo contenido ya guardado: se reutiliza
+                os.utime(ruta)  # collect_image_blobs no borra blobs tocados recientemente
+            else:
+                os.makedirs(os.path.dirname(ruta), exist_ok=True)
+                os.chmod(temporal, self.file_permissions_mode or 0o644)
+                os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        return nombre
+
+
+_blob_storage = ContentAddressedStorage()
+
+
+def blob_storage():
+    """Callable para `ImageField(storage=...)`: las migraciones no dependen de la instancia."""
+    return _blob_storage
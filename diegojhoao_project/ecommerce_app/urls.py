@@ -2,16 +2,18 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CategoriaViewSet, ArticuloViewSet, CarouselViewSet, NavigationLinkViewSet, ContentBlockViewSet 
+from .views import CategoriaViewSet, ArticuloViewSet, FiltroViewSet, CarouselViewSet, NavigationLinkViewSet, ContentBlockViewSet, StorefrontBootstrapView, ArticuloFeedView, PedidoViewSet, CarritoValidarView
 
 # Crea un router y registra nuestros viewsets con él.
 router = DefaultRouter()
 router.register(r'categorias', CategoriaViewSet, basename='categoria')
 router.register(r'articulos', ArticuloViewSet, basename='articulo') # NUEVA LÍNEA
+router.register(r'filtros', FiltroViewSet, basename='filtro')
 # Registrar nuevos Viewsets
 router.register(r'carousels', CarouselViewSet, basename='carousel')
 router.register(r'navigation-links', NavigationLinkViewSet, basename='navigationlink')
 router.register(r'content-blocks', ContentBlockViewSet, basename='contentblock')
+router.register(r'pedidos', PedidoViewSet, basename='pedido')
 
 # El prefijo 'categorias' será la base para las URLs de este ViewSet.
 # basename='categoria' se usa para nombrar las URLs generadas. Es útil si necesitas revertir URLs.
@@ -21,5 +23,9 @@ router.register(r'content-blocks', ContentBlockViewSet, basename='contentblock')
 
 # Las URLs de la API son determinadas automáticamente por el router.
 urlpatterns = [
+    path('bootstrap/', StorefrontBootstrapView.as_view(), name='bootstrap'),
+    path('feeds/articulos.jsonl', ArticuloFeedView.as_view(formato='jsonl'), name='feed-articulos-jsonl'),
+    path('feeds/articulos.csv', ArticuloFeedView.as_view(formato='csv'), name='feed-articulos-csv'),
+    path('cart/validate/', CarritoValidarView.as_view(), name='cart-validate'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
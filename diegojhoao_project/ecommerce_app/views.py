@@ -3,13 +3,29 @@ from django.shortcuts import render
 # Create your views here.
 # ecommerce_app/views.py
 
-from rest_framework import viewsets, permissions
-from .models import Categoria, Articulo, Carousel, NavigationLink, ContentBlock
+from rest_framework import mixins, status, viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.db.models import Prefetch
+from django_filters.rest_framework import DjangoFilterBackend
+from .models import Categoria, Articulo, Filtro, FiltroValor, Carousel, CarouselSlide, NavigationLink, ContentBlock, Pedido
 # Más adelante importaremos Articulo, Imagen, etc.
-from .serializers import CategoriaSerializer, ArticuloSerializer, CarouselSerializer, NavigationLinkSerializer, ContentBlockSerializer
+from .serializers import CategoriaSerializer, ArticuloSerializer, ArticuloListadoSerializer, FiltroSerializer, CarouselSerializer, NavigationLinkSerializer, ContentBlockSerializer
+from .serializers import CarritoValidarSerializer, PedidoCrearSerializer, PedidoSerializer
 # Más adelante importaremos ArticuloSerializer, etc.
+from .pagination import ArticuloCursorPagination
+from .cache import get_version, ConditionalGetMixin, VersionedCacheMixin
+from .search import ArticuloSearchFilter
+from .filters import ArticuloFilter, ArticuloOrderingFilter, facet_counts
+from .feeds import agrupar, filas_feed, lineas_jsonl, lineas_merchant_csv
+from .pedidos import ReservaExpirada, StockInsuficiente, confirmar, expirar_si_vencido, liberar, reservar, validar_carrito
+from .permissions import IsStaffOrReadOnly
 
-class CategoriaViewSet(viewsets.ModelViewSet):
+class CategoriaViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     Este ViewSet provee automáticamente acciones `list`, `create`, `retrieve`,
     `update`, y `destroy` para el modelo Categoria.
@@ -19,41 +35,253 @@ class CategoriaViewSet(viewsets.ModelViewSet):
     # Opcional: Define permisos. Por ahora, usaremos los definidos en settings.py (AllowAny)
     # permission_classes = [permissions.IsAuthenticatedOrReadOnly] # Ejemplo: solo lectura para anónimos, escritura para autenticados
 # NUEVO: ArticuloViewSet
-class ArticuloViewSet(viewsets.ModelViewSet):
-    queryset = Articulo.objects.all().order_by('-created_at', 'nombre')
+class ArticuloViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    # select_related evita una consulta extra por artículo al leer 'categoria_nombre'
+    queryset = Articulo.objects.select_related('categoria').order_by('-created_at', 'nombre')
     serializer_class = ArticuloSerializer
-    # permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # Solo el personal puede crear o editar artículos (precio y stock) desde la API
+    permission_classes = [IsStaffOrReadOnly]
+    # Paginación por cursor: respuestas de tamaño fijo aunque el catálogo crezca.
+    # Respeta ?limit= y ?page_size= (máximo 100 por página).
+    pagination_class = ArticuloCursorPagination
+    # ETag / Last-Modified del detalle: el nombre de la categoría también forma parte de la respuesta,
+    # y la fila de listado cambia cuando se procesan imágenes o cambian los filtros aplicados
+    last_modified_fields = ('updated_at', 'categoria__updated_at', 'listing__updated_at')
+    # ETag del listado: sello que incrementan actualizar_listings y los borrados (sin agregado sobre el catálogo)
+    list_version_name = 'listado'
+    # Lectura (list/retrieve) desde ArticuloListing: un JOIN por clave primaria y
+    # la representación ya calculada (ver listing.py). Solo se cargan las columnas
+    # que usan los filtros, el orden y la paginación por cursor.
+    campos_listado = ('id', 'nombre', 'precio', 'stock', 'destacado', 'created_at', 'listing__datos')
+    # ?search= usa el índice de texto completo (FTS5 / tsvector) y ordena por relevancia
+    # ?ordering= ordena en la base de datos (ej: precio, -precio, nombre, -created_at, stock, -destacado)
+    filter_backends = [DjangoFilterBackend, ArticuloSearchFilter, ArticuloOrderingFilter]
+    ordering_fields = ['precio', 'nombre', 'created_at', 'stock', 'destacado']  # Cada uno con su índice (campo, id) en Articulo.Meta
+    ordering = ('-created_at', 'nombre')
 
-    # AÑADE ESTA LÍNEA PARA HABILITAR EL FILTRADO POR CATEGORÍA
-    filterset_fields = ['categoria', 'activo', 'destacado'] 
+    # Filtrado por categoría, activo, destacado, rango de precio y valores de filtro (ver filters.py)
+    filterset_class = ArticuloFilter
     # 'categoria' permitirá filtrar por el ID de la categoría.
-    # También he añadido 'activo' y 'destacado' como ejemplos de otros campos por los que podrías querer filtrar.
+    # ?precio_min= / ?precio_max= para el rango de precios y ?filtros=1,2 para valores de filtro (ej: Rojo, M).
+
+    def get_queryset(self):
+        if self.action in ('list', 'retrieve'):
+            return Articulo.objects.select_related('listing').only(*self.campos_listado).order_by('-created_at', 'nombre')
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.action in ('list', 'retrieve'):
+            return ArticuloListadoSerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        # El detalle incluye la galería; los listados solo si se pide con ?fields=
+        return {**super().get_serializer_context(), 'detalle': self.action == 'retrieve'}
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Conteo de artículos por valor de filtro para los filtros actuales, ej:
+        /api/articulos/facets/?categoria=1&precio_max=100&filtros=3
+        """
+        articulos = self.filter_queryset(self.get_queryset())
+        return Response({
+            'total': articulos.order_by().count(),
+            'filtros': facet_counts(articulos),
+        })
 # --- NUEVOS VIEWSETS ---
 
-class CarouselViewSet(viewsets.ReadOnlyModelViewSet): # ReadOnly porque se gestionan desde el admin
+class FiltroViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint para obtener los filtros activos (ej: Color, Talla) con sus valores activos.
+    """
+    queryset = Filtro.objects.filter(activo=True).prefetch_related(
+        Prefetch('valores', queryset=FiltroValor.objects.filter(activo=True).order_by('valor'), to_attr='valores_activos')
+    ).order_by('nombre')
+    serializer_class = FiltroSerializer
+    last_modified_fields = ('updated_at', 'valores__updated_at')
+
+class CarouselViewSet(VersionedCacheMixin, viewsets.ReadOnlyModelViewSet): # ReadOnly porque se gestionan desde el admin
     """
     API endpoint para obtener carruseles activos con sus slides activos.
     Filtra por el 'nombre' del carrusel para obtener uno específico, ej: /api/carousels/?nombre=principal
     """
-    queryset = Carousel.objects.filter(activo=True)
+    queryset = Carousel.objects.filter(activo=True).prefetch_related(
+        # Dos consultas en total: carruseles + todos sus slides activos ya ordenados
+        Prefetch('slides', queryset=CarouselSlide.objects.filter(activo=True).order_by('orden'), to_attr='slides_activos')
+    )
     serializer_class = CarouselSerializer
+    cache_version_name = 'carousel'  # Respuestas en cache; se invalidan al editar carruseles o slides
+    last_modified_fields = ('updated_at', 'slides__updated_at')
     filterset_fields = ['nombre'] # Permite filtrar por el nombre identificador del carrusel
 
-class NavigationLinkViewSet(viewsets.ReadOnlyModelViewSet):
+class NavigationLinkViewSet(VersionedCacheMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint para obtener enlaces de navegación activos, ordenados.
     Filtra por 'ubicacion', ej: /api/navigation-links/?ubicacion=header
     """
     queryset = NavigationLink.objects.filter(activo=True).order_by('ubicacion', 'orden')
     serializer_class = NavigationLinkSerializer
+    cache_version_name = 'navigationlink'
     filterset_fields = ['ubicacion']
 
-class ContentBlockViewSet(viewsets.ReadOnlyModelViewSet):
+class ContentBlockViewSet(VersionedCacheMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint para obtener bloques de contenido activos.
     Filtra por 'identificador', ej: /api/content-blocks/?identificador=banner-bienvenida-home
     """
     queryset = ContentBlock.objects.filter(activo=True)
     serializer_class = ContentBlockSerializer
+    cache_version_name = 'contentblock'
     filterset_fields = ['identificador'] # Permite buscar un bloque específico por su slug
 
+
+# --- BOOTSTRAP DE LA TIENDA ---
+
+class StorefrontBootstrapView(APIView):
+    """
+    API endpoint con todo lo necesario para el primer render de la tienda
+    (Header, Home y carruseles) en una sola petición:
+    categorías, enlaces de navegación, bloques de contenido, carruseles con
+    sus slides y artículos destacados.
+    La respuesta se guarda en cache bajo la versión 'bootstrap', que las
+    señales incrementan cuando cambia cualquiera de estos modelos.
+    """
+    version_name = 'bootstrap'
+    cache_timeout = 60 * 60
+    destacados_limit = 8
+
+    def get(self, request):
+        # La URL base forma parte de la clave porque las URLs de imágenes son absolutas
+        cache_key = 'ecommerce:bootstrap:v{}:{}'.format(
+            get_version(self.version_name), request.build_absolute_uri('/')
+        )
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.build(request)
+            cache.set(cache_key, data, self.cache_timeout)
+        return Response(data)
+
+    def build(self, request):
+        context = {'request': request}
+        categorias = Categoria.objects.filter(activo=True).order_by('orden', 'nombre')
+        navigation_links = NavigationLink.objects.filter(activo=True).order_by('ubicacion', 'orden')
+        content_blocks = ContentBlock.objects.filter(activo=True)
+        carousels = CarouselViewSet.queryset.all()
+        destacados = (
+            Articulo.objects.select_related('listing')
+            .only(*ArticuloViewSet.campos_listado)
+            .filter(activo=True, destacado=True)
+            .order_by('-created_at', 'nombre')[:self.destacados_limit]
+        )
+        return {
+            'categorias': CategoriaSerializer(categorias, many=True, context=context).data,
+            'navigation_links': NavigationLinkSerializer(navigation_links, many=True, context=context).data,
+            'content_blocks': ContentBlockSerializer(content_blocks, many=True, context=context).data,
+            'carousels': CarouselSerializer(carousels, many=True, context=context).data,
+            'articulos_destacados': ArticuloListadoSerializer(destacados, many=True, context=context).data,
+        }
+
+
+# --- FEEDS DEL CATÁLOGO ---
+
+class ArticuloFeedView(ConditionalGetMixin, APIView):
+    """
+    Catálogo completo de artículos activos en streaming (ver feeds.py):
+    /api/feeds/articulos.jsonl y /api/feeds/articulos.csv (Google Merchant).
+    Con ETag / Last-Modified: un socio que consulta a menudo recibe 304 sin cuerpo.
+    """
+    formato = 'jsonl'
+    last_modified_fields = ('updated_at', 'categoria__updated_at')
+    formatos = {
+        # formato -> (generador de líneas, content type, nombre del archivo)
+        'jsonl': (lineas_jsonl, 'application/x-ndjson; charset=utf-8', 'articulos.jsonl'),
+        'csv': (lineas_merchant_csv, 'text/csv; charset=utf-8', 'articulos.csv'),
+    }
+
+    def get(self, request):
+        lineas, content_type, nombre = self.formatos[self.formato]
+        etag, last_modified = self.get_validators(request, Articulo.objects.filter(activo=True))
+
+        def build():
+            response = StreamingHttpResponse(agrupar(lineas(request, filas_feed())), content_type=content_type)
+            response['Content-Disposition'] = f'inline; filename="{nombre}"'
+            return response
+        return self.conditional_response(request, etag, last_modified, build)
+
+
+# --- PEDIDOS (reserva de stock, ver pedidos.py) ---
+
+class PedidoViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Checkout de la tienda:
+      POST /api/pedidos/                      {"items": [{"articulo": 1, "cantidad": 2}], "email": ...}
+                                              reserva el stock (201) o responde 409 si no alcanza
+      GET  /api/pedidos/<codigo>/             estado del pedido
+      POST /api/pedidos/<codigo>/confirmar/   confirma la reserva antes de que venza
+      POST /api/pedidos/<codigo>/cancelar/    cancela y devuelve el stock
+    El código (UUID) es la única forma de acceder a un pedido: no hay listado.
+    """
+    queryset = Pedido.objects.prefetch_related('items')
+    serializer_class = PedidoSerializer
+    lookup_field = 'codigo'
+    # Crear un pedido bloquea stock: límite por cliente (settings: DEFAULT_THROTTLE_RATES['pedidos'])
+    throttle_scope = 'pedidos'
+
+    def get_throttles(self):
+        if self.action == 'create':
+            return [ScopedRateThrottle()]
+        return super().get_throttles()
+
+    def get_serializer_class(self):
+        return PedidoCrearSerializer if self.action == 'create' else PedidoSerializer
+
+    def get_object(self):
+        return expirar_si_vencido(super().get_object())
+
+    def create(self, request, *args, **kwargs):
+        entrada = self.get_serializer(data=request.data)
+        entrada.is_valid(raise_exception=True)
+        datos = entrada.validated_data
+        usuario = request.user if request.user.is_authenticated else None
+        try:
+            pedido = reservar(datos.pop('items'), usuario=usuario, **datos)
+        except StockInsuficiente as exc:
+            return Response({
+                'detail': "No hay stock suficiente para algunos artículos.",
+                'articulos': [{'id': pk, 'disponible': disponible} for pk, disponible in sorted(exc.disponibles.items())],
+            }, status=status.HTTP_409_CONFLICT)
+        return Response(PedidoSerializer(self.get_queryset().get(pk=pedido.pk)).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def confirmar(self, request, codigo=None):
+        pedido = self.get_object()
+        try:
+            confirmado = confirmar(pedido)
+        except ReservaExpirada:
+            return Response({'detail': "La reserva venció y el stock fue liberado."}, status=status.HTTP_409_CONFLICT)
+        if not confirmado:
+            return Response({'detail': f"El pedido está {pedido.get_estado_display().lower()}."}, status=status.HTTP_409_CONFLICT)
+        return Response(PedidoSerializer(pedido).data)
+
+    @action(detail=True, methods=['post'])
+    def cancelar(self, request, codigo=None):
+        pedido = self.get_object()
+        if not liberar(pedido, 'cancelado'):
+            return Response({'detail': f"El pedido está {pedido.get_estado_display().lower()}."}, status=status.HTTP_409_CONFLICT)
+        return Response(PedidoSerializer(pedido).data)
+
+
+class CarritoValidarView(APIView):
+    """
+    Revalida el carrito del navegador (localStorage) en una sola petición:
+    POST /api/cart/validate/ {"items": [{"articulo": 1, "cantidad": 2, "precio": "25.50"}, ...]}
+    Devuelve precio y stock actuales de cada línea, su estado ('ok',
+    'precio_cambio', 'stock_insuficiente', 'agotado', 'no_disponible') y el
+    total. Una sola consulta (id__in) sin importar el tamaño del carrito.
+    """
+
+    def post(self, request):
+        entrada = CarritoValidarSerializer(data=request.data)
+        entrada.is_valid(raise_exception=True)
+        return Response(validar_carrito(entrada.validated_data['items']))
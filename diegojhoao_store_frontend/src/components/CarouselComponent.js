@@ -1,6 +1,7 @@
 // src/components/CarouselComponent.js
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
+import ApiService from '../services/api';
 import { Carousel } from 'react-responsive-carousel';
 import "react-responsive-carousel/lib/styles/carousel.min.css";
 import { Link } from 'react-router-dom';
@@ -16,6 +17,14 @@ function CarouselComponent({ carouselName = "principal" }) {
       setLoading(true);
       setError(null);
       try {
+        // Primero se busca en el bootstrap (ya pedido por Header/Home)
+        const bootstrap = await ApiService.getBootstrap().catch(() => null);
+        const fromBootstrap = (bootstrap?.carousels || []).find(c => c.nombre === carouselName);
+        if (fromBootstrap) {
+          setCarouselData(fromBootstrap);
+          return;
+        }
+
         const response = await axios.get(`http://localhost:8000/api/carousels/?nombre=${carouselName}&activo=true`);
         if (response.data && Array.isArray(response.data) && response.data.length > 0) {
           setCarouselData(response.data[0]);
@@ -105,11 +114,16 @@ function CarouselComponent({ carouselName = "principal" }) {
       >
         {carouselData.slides.filter(slide => slide.activo).map(slide => (
           <div key={slide.id} className="h-full w-full relative select-none">
-            <img
-              src={slide.imagen && slide.imagen.startsWith('http') ? slide.imagen : `http://localhost:8000${slide.imagen || ''}`}
-              alt={slide.titulo || `Slide de ${carouselData.nombre}`}
-              className="w-full h-full object-cover" 
-            />
+            <picture>
+              {/* Variante 'carousel' (1920x800) en AVIF/WebP generada en el servidor */}
+              {slide.imagen_renditions?.carousel?.avif && <source type="image/avif" srcSet={slide.imagen_renditions.carousel.avif} />}
+              {slide.imagen_renditions?.carousel?.webp && <source type="image/webp" srcSet={slide.imagen_renditions.carousel.webp} />}
+              <img
+                src={slide.imagen && slide.imagen.startsWith('http') ? slide.imagen : `http://localhost:8000${slide.imagen || ''}`}
+                alt={slide.titulo || `Slide de ${carouselData.nombre}`}
+                className="w-full h-full object-cover" 
+              />
+            </picture>
             {/* ---- INICIO DE CAMBIOS EN EL OVERLAY DE TEXTO ---- */}
             <div className="absolute inset-0 flex flex-col justify-end items-center p-4 sm:p-6 md:p-8 lg:p-10 xl:p-12 bg-gradient-to-t from-brand-almost-black/80 via-brand-almost-black/50 to-transparent z-10"> {/* Añadido z-10, ajustado padding */}
               {(slide.titulo || slide.subtitulo || slide.enlace_url) && (
@@ -16,13 +16,11 @@ const Header = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [categoriasData, navLinksData] = await Promise.all([
-          ApiService.getCategorias(),
-          ApiService.getNavigationLinks('header') // Solo enlaces para 'header'
-        ]);
+        const bootstrap = await ApiService.getBootstrap();
         // Asegurarse de que siempre sea un array para .map()
-        setCategorias(categoriasData?.results || categoriasData || []);
-        setNavigationLinks(navLinksData?.results || navLinksData || []);
+        setCategorias(bootstrap?.categorias || []);
+        // Solo enlaces para 'header'
+        setNavigationLinks((bootstrap?.navigation_links || []).filter(link => link.ubicacion === 'header'));
       } catch (error) {
         console.error('Error fetching header data:', error);
         setCategorias([]); // En caso de error, un array vacío
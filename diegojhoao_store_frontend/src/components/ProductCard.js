@@ -4,6 +4,9 @@ import { Link, useNavigate } from 'react-router-dom'; // Importa useNavigate
 import { ShoppingCart, Eye } from 'lucide-react';
 import { useCart } from '../context/CartContext';
 
+// Ancho aproximado de la tarjeta según el grid (1, 2, 3 o 4 columnas)
+const CARD_SIZES = '(min-width: 1280px) 25vw, (min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw';
+
 const ProductCard = ({ product }) => {
   const { addToCart } = useCart();
   const navigate = useNavigate(); // Hook para navegación programática
@@ -34,18 +37,25 @@ const ProductCard = ({ product }) => {
   const imageUrl = product.imagen_principal 
     ? (product.imagen_principal.startsWith('http') ? product.imagen_principal : `http://localhost:8000${product.imagen_principal}`) 
     : '/img/placeholder-image.png'; // Asegúrate de tener este placeholder en public/img/
+  const renditions = product.imagen_principal_renditions;
 
   return (
     <div className="bg-white rounded-lg shadow-md hover:shadow-xl transition-shadow duration-300 group flex flex-col overflow-hidden border border-transparent hover:border-brand-deep-plum/30">
       {/* La imagen y el nombre del producto son los enlaces principales al detalle */}
       <Link to={`/producto/${product.id}`} className="block group/image relative">
         <div className="aspect-square overflow-hidden"> {/* Ratio de aspecto para la imagen */}
-          <img
-            src={imageUrl}
-            alt={product.nombre}
-            className="w-full h-full object-cover group-hover/image:scale-105 transition-transform duration-500 ease-out"
-            onError={(e) => { e.target.onerror = null; e.target.src='/img/placeholder-image.png'; }}
-          />
+          <picture>
+            {/* Variantes AVIF/WebP redimensionadas en el servidor; el navegador elige el tamaño */}
+            {renditions?.srcset?.avif && <source type="image/avif" srcSet={renditions.srcset.avif} sizes={CARD_SIZES} />}
+            {renditions?.srcset?.webp && <source type="image/webp" srcSet={renditions.srcset.webp} sizes={CARD_SIZES} />}
+            <img
+              src={imageUrl}
+              alt={product.nombre}
+              loading="lazy"
+              className="w-full h-full object-cover group-hover/image:scale-105 transition-transform duration-500 ease-out"
+              onError={(e) => { e.target.onerror = null; e.target.src='/img/placeholder-image.png'; }}
+            />
+          </picture>
         </div>
         {/* Badges */}
         <div className="absolute top-2 left-2 space-y-1">
@@ -1,5 +1,6 @@
 // context/CartContext.js
-import React, { createContext, useContext, useReducer, useEffect } from 'react';
+import React, { createContext, useContext, useReducer, useEffect, useCallback } from 'react';
+import ApiService from '../services/api';
 
 const CartContext = createContext();
 
@@ -45,6 +46,24 @@ const cartReducer = (state, action) => {
         items: []
       };
     
+    case 'SYNC_CART': {
+      // Resultado de /api/cart/validate/: precio, stock y estado actuales de cada línea
+      const lineas = new Map(action.payload.items.map((linea) => [linea.articulo, linea]));
+      return {
+        ...state,
+        items: state.items.map((item) => {
+          const linea = lineas.get(item.id);
+          if (!linea) return item;
+          return {
+            ...item,
+            precio: linea.precio ?? item.precio,
+            stock: linea.stock ?? 0,
+            estado: linea.estado,
+          };
+        })
+      };
+    }
+
     case 'LOAD_CART':
       return {
         ...state,
@@ -88,6 +107,14 @@ export const CartProvider = ({ children }) => {
     dispatch({ type: 'CLEAR_CART' });
   };
 
+  // Revalida precios y stock contra el servidor (una petición para todo el carrito)
+  const validateCart = useCallback(async () => {
+    if (state.items.length === 0) return null;
+    const resultado = await ApiService.validarCarrito(state.items);
+    dispatch({ type: 'SYNC_CART', payload: resultado });
+    return resultado;
+  }, [state.items]);
+
   const getCartTotal = () => {
     return state.items.reduce((total, item) => total + (item.precio * item.quantity), 0);
   };
@@ -103,6 +130,7 @@ export const CartProvider = ({ children }) => {
       removeFromCart,
       updateQuantity,
       clearCart,
+      validateCart,
       getCartTotal,
       getCartItemsCount
     }}>
@@ -1,8 +1,9 @@
 // src/pages/Cart.js
-import React from 'react';
+import React, { useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { Minus, Plus, Trash2, ShoppingBag, MessageCircle } from 'lucide-react'; 
 import { useCart } from '../context/CartContext';
+import ApiService from '../services/api';
 
 const Cart = () => {
   // En tu CartContext.js, la función se llama getCartItemsCount
@@ -13,9 +14,23 @@ const Cart = () => {
     removeFromCart, 
     clearCart, 
     getCartTotal,
-    getCartItemsCount // Asegúrate que este sea el nombre correcto de la función en tu CartContext
+    getCartItemsCount, // Asegúrate que este sea el nombre correcto de la función en tu CartContext
+    validateCart
   } = useCart();
 
+  // Al abrir el carrito, precios y stock se actualizan con los del servidor
+  useEffect(() => {
+    validateCart().catch((error) => console.error('No se pudo validar el carrito:', error));
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  const AVISOS_ESTADO = {
+    precio_cambio: 'El precio cambió',
+    stock_insuficiente: 'Stock insuficiente',
+    agotado: 'Agotado',
+    no_disponible: 'Ya no está disponible',
+  };
+
   const formatPrice = (price) => {
     return new Intl.NumberFormat('es-PE', {
       style: 'currency',
@@ -48,7 +63,7 @@ const Cart = () => {
   };
 
 
-  const generateWhatsAppMessage = () => {
+  const generateWhatsAppMessage = (pedido) => {
     const orderDetails = items.map(item => 
       `• ${item.nombre} (${item.marca || ''} ${item.talla || ''} ${item.color || ''}) - Cantidad: ${item.quantity} - Subtotal: ${formatPrice(parseFloat(item.precio) * item.quantity)}`
     ).join('\n');
@@ -60,6 +75,7 @@ const Cart = () => {
 ${orderDetails}
 
 *Total del Pedido: ${total}*
+${pedido ? `Código de reserva: ${pedido.codigo.slice(0, 8)}` : ''}
 
 Por favor, confírmame la disponibilidad, detalles de pago y opciones de entrega.
 
@@ -68,7 +84,7 @@ Por favor, confírmame la disponibilidad, detalles de pago y opciones de entrega
     return encodeURIComponent(message);
   };
 
-  const handleWhatsAppOrder = () => {
+  const handleWhatsAppOrder = async () => {
     // **IMPORTANTE: Reemplaza con tu número de WhatsApp real y asegúrate que esté configurado como variable de entorno**
     const phoneNumber = process.env.REACT_APP_WHATSAPP_NUMBER || "51917277552"; 
     const placeholderNumber = "TU_NUMERO_DE_WHATSAPP_AQUI"; // Un placeholder para comparación
@@ -78,7 +94,24 @@ Por favor, confírmame la disponibilidad, detalles de pago y opciones de entrega
         console.error("Error: El número de WhatsApp no está configurado correctamente. Revisa las variables de entorno o el código.");
         return;
     }
-    const message = generateWhatsAppMessage();
+    // Reserva el stock antes de enviar el pedido (la reserva vence a los pocos minutos si no se confirma)
+    let pedido = null;
+    try {
+      pedido = await ApiService.crearPedido(items);
+    } catch (error) {
+      if (error.status === 409) {
+        const agotados = (error.data?.articulos || [])
+          .map(({ id, disponible }) => {
+            const item = items.find((i) => i.id === id);
+            return `• ${item ? item.nombre : id}: ${disponible} disponibles`;
+          })
+          .join('\n');
+        alert(`No hay stock suficiente para:\n${agotados}\n\nAjusta las cantidades e inténtalo de nuevo.`);
+        return;
+      }
+      console.error('No se pudo reservar el stock:', error);
+    }
+    const message = generateWhatsAppMessage(pedido);
     const whatsappUrl = `https://wa.me/${phoneNumber}?text=${message}`;
     window.open(whatsappUrl, '_blank');
     // Considera vaciar el carrito después de enviar a WhatsApp:
@@ -146,6 +179,12 @@ Por favor, confírmame la disponibilidad, detalles de pago y opciones de entrega
                       </Link>
                       {/* Podrías añadir más detalles como talla o color si los tienes en 'item' */}
                       <p className="text-xs text-slate-500">{item.sku || `ID: ${item.id}`}</p>
+                      {AVISOS_ESTADO[item.estado] && (
+                        <p className="text-xs font-medium text-amber-600">
+                          {AVISOS_ESTADO[item.estado]}
+                          {item.estado === 'stock_insuficiente' && ` (quedan ${item.stock})`}
+                        </p>
+                      )}
                     </div>
                   </div>
 
@@ -26,15 +26,12 @@ const Home = () => {
       setLoading(true);
       try {
         // CarouselComponent maneja su propia data.
-        const [productsData, contentData] = await Promise.all([
-          ApiService.getArticulos({ destacado: 'true', limit: 4 }), // Ajustado a 4 para un grid común
-          ApiService.getContentBlocks()
-        ]);
+        const bootstrap = await ApiService.getBootstrap();
 
-        setFeaturedProducts(productsData.results || productsData || []);
+        setFeaturedProducts((bootstrap.articulos_destacados || []).slice(0, 4)); // Ajustado a 4 para un grid común
 
         const contentMap = {};
-        (contentData.results || contentData || []).forEach(block => {
+        (bootstrap.content_blocks || []).forEach(block => {
           contentMap[block.identificador] = block;
         });
         setContentBlocks(contentMap);
@@ -97,11 +97,11 @@ const ProductDetail = () => {
     );
   }
 
-  // Mock images array - in real app you'd get this from product.imagenes_galeria
-  const images = [
-    product.imagen_principal,
-    // Add more images here when you implement the gallery
-  ].filter(Boolean);
+  // Imagen principal + galería ordenada (imagenes_galeria viene en el detalle del artículo)
+  const galleryImages = (product.imagenes_galeria || []).map(
+    (item) => item.renditions?.detail?.webp || item.imagen
+  );
+  const images = [product.imagen_principal, ...galleryImages].filter(Boolean);
 
   return (
     <div className="min-h-screen bg-gray-50 py-8">
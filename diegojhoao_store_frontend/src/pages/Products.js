@@ -1,10 +1,19 @@
 // pages/Products.js
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useParams, useSearchParams } from 'react-router-dom';
 import { Filter, Grid, List, SortAsc } from 'lucide-react';
 import ApiService from '../services/api';
 import ProductCard from '../components/ProductCard';
 
+// Maps the sort options to the API's ?ordering= values
+const SORT_ORDERING = {
+  'name': 'nombre',
+  'price-low': 'precio',
+  'price-high': '-precio',
+  'newest': '-created_at',
+  'featured': '-destacado',
+};
+
 const Products = () => {
   const { categoriaId } = useParams();
   const [searchParams] = useSearchParams();
@@ -19,7 +28,11 @@ const Products = () => {
   const [filterFeatured, setFilterFeatured] = useState(false);
   const [viewMode, setViewMode] = useState('grid');
   const [showFilters, setShowFilters] = useState(false);
-  const [currentPage, setCurrentPage] = useState(1);
+  // Paginación por cursor: la API devuelve 20 artículos y la URL `next` de la siguiente página
+  const [nextUrl, setNextUrl] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Descarta respuestas de "cargar más" que llegan después de cambiar los filtros
+  const requestId = useRef(0);
 
   useEffect(() => {
     fetchProducts();
@@ -36,6 +49,7 @@ const Products = () => {
   };
 
   const fetchProducts = async () => {
+    const id = ++requestId.current;
     setLoading(true);
     try {
       const params = {};
@@ -54,50 +68,46 @@ const Products = () => {
         params.destacado = true;
       }
 
-      const data = await ApiService.getArticulos(params);
-      let productsData = data.results || data;
-
-      // Filter by search term if provided
+      // Search is resolved server-side with the full-text index
       if (searchTerm) {
-        productsData = productsData.filter(product =>
-          product.nombre.toLowerCase().includes(searchTerm.toLowerCase()) ||
-          (product.descripcion && product.descripcion.toLowerCase().includes(searchTerm.toLowerCase()))
-        );
+        params.search = searchTerm;
       }
 
-      // Sort products
-      productsData = sortProducts(productsData, sortBy);
-      
-      setProducts(productsData);
+      // Sorting is done by the database (indexed columns)
+      const ordering = SORT_ORDERING[sortBy];
+      if (ordering) {
+        params.ordering = ordering;
+      }
+
+      const data = await ApiService.getArticulos(params);
+      if (id !== requestId.current) return;
+      setProducts(data.results || data);
+      setNextUrl(data.next || null);
     } catch (error) {
       console.error('Error fetching products:', error);
     } finally {
-      setLoading(false);
+      if (id === requestId.current) setLoading(false);
     }
   };
 
-  const sortProducts = (products, sortType) => {
-    const sorted = [...products];
-    
-    switch (sortType) {
-      case 'name':
-        return sorted.sort((a, b) => a.nombre.localeCompare(b.nombre));
-      case 'price-low':
-        return sorted.sort((a, b) => a.precio - b.precio);
-      case 'price-high':
-        return sorted.sort((a, b) => b.precio - a.precio);
-      case 'newest':
-        return sorted.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
-      case 'featured':
-        return sorted.sort((a, b) => b.destacado - a.destacado);
-      default:
-        return sorted;
+  const loadMore = async () => {
+    if (!nextUrl || loadingMore) return;
+    const id = requestId.current;
+    setLoadingMore(true);
+    try {
+      const data = await ApiService.getArticulosSiguientes(nextUrl);
+      if (id !== requestId.current) return;
+      setProducts((current) => [...current, ...data.results]);
+      setNextUrl(data.next || null);
+    } catch (error) {
+      console.error('Error fetching more products:', error);
+    } finally {
+      setLoadingMore(false);
     }
   };
 
   const handleCategoryChange = (categoryId) => {
     setSelectedCategory(categoryId);
-    setCurrentPage(1);
   };
 
   const handleSortChange = (newSortBy) => {
@@ -131,7 +141,9 @@ const Products = () => {
              selectedCategoryName ? selectedCategoryName : 'Todos los Productos'}
           </h1>
           <p className="text-gray-600">
-            {products.length} producto{products.length !== 1 ? 's' : ''} encontrado{products.length !== 1 ? 's' : ''}
+            {nextUrl
+              ? `Mostrando ${products.length} productos`
+              : `${products.length} producto${products.length !== 1 ? 's' : ''} encontrado${products.length !== 1 ? 's' : ''}`}
           </p>
         </div>
 
@@ -285,6 +297,18 @@ const Products = () => {
                 ))}
               </div>
             )}
+
+            {nextUrl && (
+              <div className="text-center mt-8">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="px-6 py-3 bg-blue-600 text-white rounded-lg hover:bg-blue-700 disabled:opacity-50"
+                >
+                  {loadingMore ? 'Cargando...' : 'Cargar más productos'}
+                </button>
+              </div>
+            )}
           </div>
         </div>
       </div>
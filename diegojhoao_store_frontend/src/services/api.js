@@ -15,7 +15,11 @@ class ApiService {
     try {
       const response = await fetch(url, config);
       if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
+        const error = new Error(`HTTP error! status: ${response.status}`);
+        error.status = response.status;
+        // El cuerpo del error (ej: artículos sin stock en un 409) queda disponible para la UI
+        error.data = await response.json().catch(() => null);
+        throw error;
       }
       return await response.json();
     } catch (error) {
@@ -24,6 +28,19 @@ class ApiService {
     }
   }
 
+  // Bootstrap: categories, navigation, content blocks, carousels and featured
+  // products in a single request. The promise is shared so Header, Home and
+  // the carousels reuse the same response on first paint.
+  getBootstrap() {
+    if (!this.bootstrapPromise) {
+      this.bootstrapPromise = this.request('/bootstrap/').catch((error) => {
+        this.bootstrapPromise = null;
+        throw error;
+      });
+    }
+    return this.bootstrapPromise;
+  }
+
   // Categorías
   async getCategorias() {
     return this.request('/categorias/');
@@ -39,10 +56,44 @@ class ApiService {
     return this.request(`/articulos/${queryString ? `?${queryString}` : ''}`);
   }
 
+  // Siguiente página del listado: `next` es la URL absoluta (con el cursor) que devuelve la API
+  async getArticulosSiguientes(next) {
+    return this.request(`/articulos/${new URL(next).search}`);
+  }
+
   async getArticulo(id) {
     return this.request(`/articulos/${id}/`);
   }
 
+  // Pedidos: reservan el stock en el servidor durante unos minutos
+  async crearPedido(items, cliente = {}) {
+    return this.request('/pedidos/', {
+      method: 'POST',
+      body: JSON.stringify({
+        items: items.map((item) => ({ articulo: item.id, cantidad: item.quantity })),
+        ...cliente,
+      }),
+    });
+  }
+
+  // Precio y stock actuales de todo el carrito en una sola petición
+  async validarCarrito(items) {
+    return this.request('/cart/validate/', {
+      method: 'POST',
+      body: JSON.stringify({
+        items: items.map((item) => ({ articulo: item.id, cantidad: item.quantity, precio: item.precio })),
+      }),
+    });
+  }
+
+  async getPedido(codigo) {
+    return this.request(`/pedidos/${codigo}/`);
+  }
+
+  async cancelarPedido(codigo) {
+    return this.request(`/pedidos/${codigo}/cancelar/`, { method: 'POST' });
+  }
+
   // Carousels
   async getCarousels(nombre = null) {
     const params = nombre ? `?nombre=${nombre}` : '';